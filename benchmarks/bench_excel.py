@@ -0,0 +1,183 @@
+"""
+Compara los motores de export_excel.generate_excel_table ("workbook":
+celda por celda en un libro normal de openpyxl; "streaming":
+build_cuadro_layout y una sola pasada write_only) con cuadros sinteticos de
+N ejes x M niveles.
+
+Mide el tiempo y el pico de memoria de Python (tracemalloc) de cada motor y,
+con --check, verifica que los dos generen la misma hoja (valores, celdas
+combinadas y bordes).
+
+Con --towers, mide ademas generate_partitioned_excel (una hoja por torre)
+con cada numero de procesos de --processes.
+
+Uso (desde la carpeta del proyecto):
+    python -m benchmarks.bench_excel --grids 100 500 --stories 20 40
+    python -m benchmarks.bench_excel --grids 2000 --stories 20 --towers 8 --processes 1 2 4 8
+"""
+import argparse
+import json
+import random
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from openpyxl import load_workbook
+
+from core import export_excel
+from core.log import configure_logging
+
+SECTIONS = [(40, 40), (50, 50), (40, 60), (60, 60), (70, 70)]
+REBARS = ["#6", "#7", "#8"]
+
+
+def build_synthetic_table(n_grids, n_stories, n_types=8, seed=0, n_towers=1):
+    """
+    Cuadro sintetico con el formato de la tabla de ColumnDataScreen: n_grids
+    ejes con columnas en n_stories niveles. Cada eje toma uno de n_types
+    armados por tramo de niveles (para que haya GridLine y niveles iguales
+    que agrupar) y algunos ejes no tienen columna en los niveles altos. Con
+    n_towers > 1 los ejes se reparten en torres (campo "Tower").
+
+    Returns:
+        tuple: (stories_data, grid_lines_data, column_records)
+    """
+    rng = random.Random(seed)
+    stories = [{"Name": "Base", "Elevation": 0.0}] + [
+        {"Name": f"Nivel {i}", "Elevation": 300.0 * i} for i in range(1, n_stories + 1)
+    ]
+    grid_lines = [{"ID": f"G{i}"} for i in range(1, n_grids + 1)]
+    types = [
+        [(rng.choice(SECTIONS), rng.choice(REBARS), rng.choice([8, 12, 16])) for _ in range(4)]
+        for _ in range(n_types)
+    ]
+
+    records = []
+    for index, grid in enumerate(grid_lines):
+        grid_type = types[rng.randrange(n_types)]
+        top = n_stories if rng.random() > 0.2 else rng.randrange(1, n_stories + 1)
+        for i in range(1, top + 1):
+            (b, h), rebar, bars = grid_type[min(3, 4 * (i - 1) // n_stories)]
+            start, end = stories[i - 1], stories[i]
+            records.append({
+                "Story": end["Name"], "GridLine": grid["ID"],
+                "Start Z": str(start["Elevation"]), "End Z": str(end["Elevation"]),
+                "depth": str(h), "width": str(b), "fc": "280",
+                "As": f"{bars} {rebar}", "Rebar": rebar, "Rebar. Est.": "#4",
+                "Detalle No.": f"DC-{types.index(grid_type) + 1}", "bxh": f"{b}x{h}",
+                "nivel start": start["Name"], "nivel end": end["Name"],
+                "start_end_level": f"{start['Name']}@{end['Name']}",
+            })
+            if n_towers > 1:
+                records[-1]["Tower"] = f"T{1 + index * n_towers // n_grids}"
+    return stories, grid_lines, records
+
+
+def time_engine(engine, table, folder, repeat):
+    """
+    Returns:
+        dict: Tiempos (s) y pico de memoria de Python (MB) del motor.
+    """
+    times = []
+    peaks = []
+    for _ in range(repeat):
+        tracemalloc.start()
+        start = time.perf_counter()
+        export_excel.generate_excel_table(folder, *table, engine=engine)
+        times.append(time.perf_counter() - start)
+        peaks.append(tracemalloc.get_traced_memory()[1] / 1e6)
+        tracemalloc.stop()
+    return {"min_s": min(times), "median_s": statistics.median(times), "peak_mb": max(peaks)}
+
+
+def time_partitioned(table, folder, processes, repeat):
+    """Tiempo (s) de generate_partitioned_excel por torre con processes procesos."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        export_excel.generate_partitioned_excel(folder, *table, "Tower", processes=processes)
+        times.append(time.perf_counter() - start)
+    return {"min_s": min(times), "median_s": statistics.median(times)}
+
+
+def sheet_contents(file_name):
+    """Valores, celdas combinadas y bordes de la hoja, para comparar motores."""
+    ws = load_workbook(file_name).active
+    cells = {}
+    for row in ws.iter_rows():
+        for cell in row:
+            border = cell.border
+            styles = tuple(
+                side.style if side is not None else None
+                for side in (border.top, border.bottom, border.diagonal)
+            )
+            if cell.value is not None or any(styles):
+                cells[cell.coordinate] = (cell.value, styles)
+    return cells, sorted(str(cell_range) for cell_range in ws.merged_cells.ranges)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--grids", type=int, nargs="+", default=[100, 500],
+                        help="Numero de ejes (GridLine) de los cuadros sinteticos.")
+    parser.add_argument("--stories", type=int, nargs="+", default=[20, 40],
+                        help="Numero de niveles de los cuadros sinteticos.")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--engines", nargs="+", choices=export_excel.EXCEL_ENGINES,
+                        default=list(export_excel.EXCEL_ENGINES))
+    parser.add_argument("--check", action="store_true",
+                        help="Verifica que los motores generen la misma hoja.")
+    parser.add_argument("--towers", type=int, default=0,
+                        help="Mide tambien la exportacion por torres con este numero de torres.")
+    parser.add_argument("--processes", type=int, nargs="+", default=[1, 2, 4],
+                        help="Numeros de procesos de la exportacion por torres.")
+    parser.add_argument("--json", help="Guarda los resultados en este archivo JSON.")
+    args = parser.parse_args(argv)
+    configure_logging("WARNING")
+
+    results = []
+    ok = True
+    print(f"{'Cuadro':<28}{'Motor':<12}{'Min (s)':>10}{'Mediana (s)':>13}{'Pico (MB)':>11}")
+    for n_grids in args.grids:
+        for n_stories in args.stories:
+            case_name = f"{n_grids} ejes x {n_stories} niveles"
+            table = build_synthetic_table(n_grids, n_stories)
+            contents = {}
+            for engine in args.engines:
+                with tempfile.TemporaryDirectory() as folder:
+                    result = time_engine(engine, table, folder, args.repeat)
+                    if args.check:
+                        contents[engine] = sheet_contents(Path(folder) / "cuadro_columnas.xlsx")
+                result.update({"table": case_name, "engine": engine})
+                results.append(result)
+                print(f"{case_name:<28}{engine:<12}{result['min_s']:>10.3f}"
+                      f"{result['median_s']:>13.3f}{result['peak_mb']:>11.1f}")
+            if args.check and len(set(map(repr, contents.values()))) > 1:
+                ok = False
+                print(f"{case_name}: los motores generan hojas distintas")
+
+    if args.towers > 1:
+        print(f"\n{'Cuadro por torres':<36}{'Procesos':>9}{'Min (s)':>10}{'Mediana (s)':>13}")
+        for n_grids in args.grids:
+            for n_stories in args.stories:
+                case_name = f"{n_grids} ejes x {n_stories} niveles, {args.towers} torres"
+                table = build_synthetic_table(n_grids, n_stories, n_towers=args.towers)
+                for processes in args.processes:
+                    with tempfile.TemporaryDirectory() as folder:
+                        result = time_partitioned(table, folder, processes, args.repeat)
+                    result.update({"table": case_name, "engine": "partitioned", "processes": processes})
+                    results.append(result)
+                    print(f"{case_name:<36}{processes:>9}{result['min_s']:>10.3f}{result['median_s']:>13.3f}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"Resultados guardados en: {args.json}")
+    return ok
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,150 @@
+"""
+Mide el tiempo de la extraccion de columnas sin ETABS, con modelos
+sinteticos (N niveles x M ejes) o con una grabacion de un modelo real hecha
+con la opcion "Grabar llamadas a ETABS" del menu principal.
+
+Cada funcion se ejecuta sobre un ReplaySapModel, por lo que se puede simular
+la latencia de la API de ETABS con --latency (segundos por llamada) o usar la
+latencia grabada con --latency recorded.
+
+Uso (desde la carpeta del proyecto):
+    python -m benchmarks.bench_extraction --stories 5 10 20 --grid 4 8
+    python -m benchmarks.bench_extraction --replay grabacion_etabs.json.gz --latency recorded
+"""
+import argparse
+import contextlib
+import functools
+import io
+import json
+import statistics
+import sys
+import time
+import warnings
+
+from core import etabs
+from core import create_column_table
+from core.com_recorder import ComCallRecorder, ReplayCallError, ReplaySapModel, load_recording
+from core.fake_sap_model import build_synthetic_model
+from core.log import configure_logging
+from core.parallel_extraction import DEFAULT_WORKERS, get_story_lable_col_name_parallel
+from core.pipeline import get_story_lable_col_name_pipeline
+from utils import extractions
+
+
+def _extract_columns_by_level(sap_model):
+    stories = extractions.get_story_data(sap_model)
+    return extractions.extract_columns_by_level(sap_model, stories)
+
+
+def _story_lable_col_name_parallel(sap_model, workers=DEFAULT_WORKERS):
+    # El ReplaySapModel se puede usar desde varios hilos
+    return get_story_lable_col_name_parallel(sap_model, workers, lambda: sap_model)
+
+
+TARGETS = {
+    "get_story_lable_col_name": etabs.get_story_lable_col_name,
+    "get_story_lable_col_name_parallel": _story_lable_col_name_parallel,
+    "get_story_lable_col_name_pipeline": get_story_lable_col_name_pipeline,
+    "get_open_model_data": create_column_table.get_open_model_data,
+    "extract_columns_by_level": _extract_columns_by_level,
+}
+
+
+def record_targets(sap_model, targets):
+    """Ejecuta las funciones sobre el modelo y graba sus llamadas."""
+    recorder = ComCallRecorder()
+    wrapped = recorder.wrap(sap_model)
+    with contextlib.redirect_stdout(io.StringIO()), warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        for target in targets:
+            TARGETS[target](wrapped)
+    return recorder.recording()
+
+
+def time_target(target, recording, latency, repeat, serialize=False):
+    """
+    Returns:
+        dict: Tiempos (s) de cada repeticion y numero de llamadas a la API.
+    """
+    times = []
+    calls = 0
+    for _ in range(repeat):
+        sap_model = ReplaySapModel(recording, latency, serialize)
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()), warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            TARGETS[target](sap_model)
+        times.append(time.perf_counter() - start)
+        calls = sap_model.call_count
+    return {
+        "min_s": min(times),
+        "median_s": statistics.median(times),
+        "api_calls": calls,
+    }
+
+
+def _parse_latency(value):
+    if value == "recorded":
+        return value
+    return float(value)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--stories", type=int, nargs="+", default=[5, 10, 20],
+                        help="Numero de niveles de los modelos sinteticos.")
+    parser.add_argument("--grid", type=int, nargs="+", default=[4, 8],
+                        help="Ejes por direccion de los modelos sinteticos (malla M x M).")
+    parser.add_argument("--replay", help="Grabacion de un modelo real (.json.gz) en lugar de modelos sinteticos.")
+    parser.add_argument("--latency", type=_parse_latency, default=0.0,
+                        help="Segundos agregados a cada llamada a la API, o 'recorded'.")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS,
+                        help="Hilos de get_story_lable_col_name_parallel.")
+    parser.add_argument("--serialize", action="store_true",
+                        help="Atiende las llamadas de a una, como ETABS cuando serializa la API.")
+    parser.add_argument("--targets", nargs="+", choices=list(TARGETS), default=list(TARGETS))
+    parser.add_argument("--json", help="Guarda los resultados en este archivo JSON.")
+    args = parser.parse_args(argv)
+    # Solo advertencias y errores: los mensajes de avance no se miden
+    configure_logging("WARNING")
+    TARGETS["get_story_lable_col_name_parallel"] = functools.partial(
+        _story_lable_col_name_parallel, workers=args.workers
+    )
+
+    if args.replay:
+        cases = [(args.replay, load_recording(args.replay))]
+    else:
+        cases = []
+        for n_stories in args.stories:
+            for n_grid in args.grid:
+                model = build_synthetic_model(n_stories, n_grid, n_grid)
+                cases.append((f"{n_stories} niveles x {n_grid}x{n_grid} ejes", record_targets(model, args.targets)))
+
+    results = []
+    print(f"{'Modelo':<32}{'Funcion':<36}{'Llamadas':>10}{'Min (s)':>10}{'Mediana (s)':>13}")
+    for case_name, recording in cases:
+        for target in args.targets:
+            try:
+                result = time_target(target, recording, args.latency, args.repeat, args.serialize)
+            except ReplayCallError as e:
+                # Una grabacion de "Identificar columnas" no tiene todas las
+                # llamadas de las otras funciones
+                print(f"{case_name:<32}{target:<36}  omitida: {e}")
+                continue
+            result.update({"model": case_name, "target": target})
+            results.append(result)
+            print(
+                f"{case_name:<32}{target:<36}{result['api_calls']:>10}"
+                f"{result['min_s']:>10.3f}{result['median_s']:>13.3f}"
+            )
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"Resultados guardados en: {args.json}")
+    return results
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
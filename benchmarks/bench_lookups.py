@@ -0,0 +1,116 @@
+"""
+Micro-benchmark de las busquedas del ciclo de llenado del cuadro de
+columnas: fila por nivel (get_excel_row), columna por GridLine
+(get_excel_col) y diametro por barra (get_diameter), recorriendo las listas
+en cada registro contra los indices build_row_index / build_col_index /
+REBAR_DIAMETERS_MM armados una vez por exportacion.
+
+Con un registro por nivel y GridLine, el recorrido crece como
+niveles x GridLine x (niveles + GridLine) y los indices como
+niveles x GridLine.
+
+Uso (desde la carpeta del proyecto):
+    python -m benchmarks.bench_lookups --grids 50 200 800 --stories 10 40
+"""
+import argparse
+import json
+import statistics
+import sys
+import time
+
+from core import export_excel
+
+
+def _linear_diameter(rebar):
+    """get_diameter recorriendo REBAR_PROPERTIES_MM (version anterior)."""
+    for bar in export_excel.REBAR_PROPERTIES_MM:
+        if bar['type'] == rebar:
+            return bar['diameter']
+    return 0
+
+
+def build_lookup_case(n_grids, n_stories):
+    """Filas, columnas y registros (uno por nivel y GridLine) como en el escritor de Excel."""
+    col_rows = [{'level': f"N{i}@N{i + 1}", 'row': 9 * i + 2} for i in range(n_stories)]
+    gridline_columns = [{'gridline': f"G{j}", 'excel_col': 3 + j} for j in range(n_grids)]
+    rebars = [bar['type'] for bar in export_excel.REBAR_PROPERTIES_MM]
+    records = [
+        {'start_end_level': row['level'], 'GridLine': column['gridline'], 'Rebar': rebars[(i + j) % len(rebars)]}
+        for i, row in enumerate(col_rows)
+        for j, column in enumerate(gridline_columns)
+    ]
+    return col_rows, gridline_columns, records
+
+
+def fill_linear(col_rows, gridline_columns, records):
+    cells = []
+    for record in records:
+        cells.append((
+            export_excel.get_excel_row(col_rows, record['start_end_level']),
+            export_excel.get_excel_col(gridline_columns, record['GridLine']),
+            _linear_diameter(record['Rebar']),
+        ))
+    return cells
+
+
+def fill_indexed(col_rows, gridline_columns, records):
+    row_index = export_excel.build_row_index(col_rows)
+    col_index = export_excel.build_col_index(gridline_columns)
+    cells = []
+    for record in records:
+        cells.append((
+            row_index.get(record['start_end_level']),
+            col_index.get(record['GridLine']),
+            export_excel.get_diameter(record['Rebar']),
+        ))
+    return cells
+
+
+def time_fill(fill, case, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fill(*case)
+        times.append(time.perf_counter() - start)
+    return min(times), statistics.median(times)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--grids", type=int, nargs="+", default=[50, 200, 800],
+                        help="Numero de GridLine.")
+    parser.add_argument("--stories", type=int, nargs="+", default=[10, 40],
+                        help="Numero de niveles.")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--json", help="Guarda los resultados en este archivo JSON.")
+    args = parser.parse_args(argv)
+
+    results = []
+    ok = True
+    print(f"{'Cuadro':<26}{'Registros':>10}{'Lineal (s)':>12}{'Indices (s)':>13}{'Aceleracion':>13}")
+    for n_grids in args.grids:
+        for n_stories in args.stories:
+            case_name = f"{n_grids} ejes x {n_stories} niveles"
+            case = build_lookup_case(n_grids, n_stories)
+            if fill_linear(*case) != fill_indexed(*case):
+                ok = False
+                print(f"{case_name}: los indices no dan las mismas celdas")
+            linear = time_fill(fill_linear, case, args.repeat)
+            indexed = time_fill(fill_indexed, case, args.repeat)
+            results.append({
+                "table": case_name, "records": len(case[2]),
+                "linear_min_s": linear[0], "linear_median_s": linear[1],
+                "indexed_min_s": indexed[0], "indexed_median_s": indexed[1],
+            })
+            print(f"{case_name:<26}{len(case[2]):>10}{linear[0]:>12.4f}{indexed[0]:>13.4f}"
+                  f"{linear[0] / indexed[0]:>12.1f}x")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"Resultados guardados en: {args.json}")
+    return ok
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,139 @@
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing.util import Finalize
+
+try:
+    import comtypes
+except ImportError:
+    comtypes = None
+
+from core import create_column_table
+from core.log import get_logger
+
+logger = get_logger(__name__)
+
+# Numero de instancias de ETABS abiertas a la vez por defecto
+DEFAULT_PROCESSES = 2
+SUMMARY_FILE = "resumen_lote.json"
+
+# Instancia de ETABS del proceso de trabajo actual
+_worker_state = {}
+
+
+def find_model_files(folder):
+    """Archivos .EDB de la carpeta (sin subcarpetas), ordenados por nombre."""
+    return sorted(
+        os.path.join(folder, file_name)
+        for file_name in os.listdir(folder)
+        if file_name.lower().endswith(".edb") and os.path.isfile(os.path.join(folder, file_name))
+    )
+
+
+def _init_worker(helper_factory):
+    """
+    Inicializa un proceso de trabajo: abre su apartamento COM e inicia su
+    propia instancia de ETABS, que se usa para todos los modelos que procese
+    y se cierra cuando el proceso termina.
+    """
+    if comtypes is not None:
+        comtypes.CoInitialize()
+    helper = helper_factory() if helper_factory is not None else None
+    etabs_object = create_column_table.start_etabs_application(helper)
+    _worker_state["etabs_object"] = etabs_object
+    Finalize(None, _close_worker, exitpriority=10)
+
+
+def _close_worker():
+    etabs_object = _worker_state.pop("etabs_object", None)
+    if etabs_object is not None:
+        try:
+            etabs_object.ApplicationExit(False)
+        except Exception as e:
+            logger.warning(f"No se pudo cerrar ETABS: {e}")
+    if comtypes is not None:
+        comtypes.CoUninitialize()
+
+
+def _extract_model(model_path, output_dir):
+    """Extrae un modelo en la instancia de ETABS del proceso actual."""
+    start = time.perf_counter()
+    model_name = os.path.splitext(os.path.basename(model_path))[0]
+    result = {"model": model_path, "ok": False, "output_dir": os.path.join(output_dir, model_name)}
+    try:
+        sap_model = _worker_state["etabs_object"].SapModel
+        ret = sap_model.File.OpenFile(model_path)
+        if ret != 0:
+            raise RuntimeError(f"No se pudo abrir el modelo. Código: {ret}")
+
+        model_data = create_column_table.get_open_model_data(sap_model)
+        if model_data is None:
+            raise RuntimeError("No se encontraron columnas en el modelo.")
+
+        result["files"] = create_column_table.export_model_outputs(model_data, result["output_dir"])
+        result["columns"] = len(model_data["cols_data"])
+        result["ok"] = True
+    # get_open_model_data llama sys.exit() si el modelo no tiene niveles
+    except (Exception, SystemExit) as e:
+        result["error"] = str(e) or type(e).__name__
+    result["seconds"] = time.perf_counter() - start
+    return result
+
+
+def run_batch(folder, output_dir, processes=DEFAULT_PROCESSES, helper_factory=None, on_result=None):
+    """
+    Extrae todos los modelos .EDB de una carpeta con varios procesos, cada uno
+    con su propia instancia de ETABS (ApplicationStart), y escribe para cada
+    modelo la tabla de columnas, el cuadro de columnas en Excel y los
+    detalles DXF en output_dir/<nombre del modelo>/.
+
+    Args:
+        folder (str): Carpeta con los archivos .EDB.
+        output_dir (str): Carpeta de salida.
+        processes (int): Numero maximo de procesos (instancias de ETABS).
+        helper_factory (callable, opcional): Devuelve el helper de la API
+            (ETABSv1.Helper) en el proceso de trabajo. Debe poder enviarse a
+            otro proceso (funcion o clase de un modulo), por ejemplo
+            core.fake_sap_model.FakeEtabsHelper para probar sin ETABS.
+        on_result (callable, opcional): on_result(resultado, terminados,
+            total), llamada cada vez que termina un modelo.
+
+    Returns:
+        list[dict]: Un resultado por modelo, en el orden de los archivos,
+        con las claves 'model', 'ok', 'output_dir', 'seconds' y 'files' y
+        'columns' o 'error'.
+    """
+    model_files = find_model_files(folder)
+    if not model_files:
+        logger.warning(f"No se encontraron archivos .EDB en: {folder}")
+        return []
+    os.makedirs(output_dir, exist_ok=True)
+
+    processes = max(1, min(int(processes), len(model_files)))
+    logger.info(f"Extraccion por lotes: {len(model_files)} modelos con {processes} instancias de ETABS.")
+
+    results = [None] * len(model_files)
+    with ProcessPoolExecutor(
+        max_workers=processes, initializer=_init_worker, initargs=(helper_factory,)
+    ) as pool:
+        futures = {
+            pool.submit(_extract_model, model_path, output_dir): index
+            for index, model_path in enumerate(model_files)
+        }
+        for finished, future in enumerate(as_completed(futures), start=1):
+            index = futures[future]
+            try:
+                results[index] = future.result()
+            except Exception as e:
+                # Por ejemplo si el proceso de trabajo termino de forma inesperada
+                results[index] = {"model": model_files[index], "ok": False, "error": str(e)}
+            if on_result is not None:
+                on_result(results[index], finished, len(model_files))
+
+    with open(os.path.join(output_dir, SUMMARY_FILE), "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+
+    failed = [result for result in results if not result["ok"]]
+    logger.info(f"Extraccion por lotes terminada: {len(results) - len(failed)} modelos correctos, {len(failed)} con errores.")
+    return results
@@ -0,0 +1,54 @@
+import pandas as pd
+
+from core.column_table import ColumnTable
+from core.details import DETAIL_SIGNATURE, assign_details
+from core.gridlines import assign_gridlines, label_gridlines
+
+
+def build_cols_and_gridlines(column_data, grid_lines=None, units=None):
+    """
+    Convierte los registros crudos de columnas en los datos que consumen las
+    pantallas: asigna el GridLine por posicion (x, y) y el detalle DC-n por
+    armado.
+
+    Args:
+        column_data (list[dict] | pd.DataFrame): Un registro por frame de
+            columna, con las claves que genera etabs.get_story_lable_col_name.
+        grid_lines (list[dict], opcional): Ejes del sistema de grillas de
+            ETABS (etabs_tables.get_grid_lines). Si se dan, cada GridLine
+            recibe en 'GridLabel' el nombre de sus ejes, por ejemplo "A-1".
+        units (dict, opcional): Unidades de las coordenadas (como
+            core.units.MODEL_UNITS, que es el valor por defecto); de ellas
+            depende la tolerancia entre columnas del mismo GridLine.
+
+    Returns:
+        tuple: (cols_data, gridlines_data): cols_data es una ColumnTable y
+        gridlines_data una lista de diccionarios.
+    """
+    if len(column_data) == 0:
+        return ColumnTable(), []
+
+    # Create dataframe
+    df_columns = pd.DataFrame(column_data)
+    df_columns_sorted = df_columns.sort_values(by=["label", "z_start"])
+
+    # 1. GridLine por posicion: las coordenadas se agrupan con tolerancia en
+    # una sola pasada vectorizada (ver core.gridlines.assign_gridlines)
+    gridline_ids, gridline_centers = assign_gridlines(
+        df_columns_sorted["pos_x"].to_numpy(), df_columns_sorted["pos_y"].to_numpy(), units
+    )
+    df_columns_sorted["GridLine"] = gridline_ids
+
+    df_gridlines = df_columns_sorted.drop_duplicates(subset=["GridLine"])
+    if grid_lines:
+        df_gridlines = df_gridlines.assign(GridLabel=label_gridlines(gridline_centers, grid_lines, units))
+    gridlines_data = df_gridlines.to_dict(orient="records")
+
+    # 2. Detalle DC-n por armado
+    df_columns_sorted["detail"], _ = assign_details(df_columns_sorted, DETAIL_SIGNATURE)
+
+    # 3. Sort rows
+    df_sorted = df_columns_sorted.sort_values(by=["GridLine", "z_start"], ascending=True)
+    cols_data = ColumnTable.from_frame(df_sorted)
+
+    return cols_data, gridlines_data
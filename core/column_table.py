@@ -0,0 +1,200 @@
+import numpy as np
+import pandas as pd
+
+from core import units as unit_conversion
+
+# Columnas de texto con pocos valores distintos (niveles, secciones,
+# materiales, barras): se guardan como categorias, un codigo entero por fila.
+CATEGORICAL_COLUMNS = {
+    "label", "story", "section", "material", "shape", "bxh",
+    "nivel_start", "nivel_end", "story_start", "story_end", "start_end_level",
+    "Long. Rebar Mat.", "Mat. Estribo", "Rebar", "Est. Rebar", "As", "detail",
+    "Mat. Rebar", "type",
+}
+
+
+def _to_python(value):
+    # Las filas se entregan con tipos de Python, igual que
+    # DataFrame.to_dict(orient="records"); los textos faltantes como None.
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def _build_column(name, values):
+    if isinstance(values, pd.Categorical):
+        return values
+    values = list(values)
+    if name in CATEGORICAL_COLUMNS:
+        return pd.Categorical(values)
+    array = np.asarray(values, dtype=object)
+    # Columnas numericas: float64/int64 si todos los valores son numeros
+    if all(isinstance(value, (int, float, np.number)) and not isinstance(value, bool) for value in values):
+        return np.asarray(values)
+    if all(isinstance(value, str) for value in values) and len(set(values)) <= len(values) // 2:
+        return pd.Categorical(values)
+    return array
+
+
+class ColumnTable:
+    """
+    Registros de columnas en forma columnar: un arreglo de NumPy por campo y
+    categorias (pandas.Categorical) para los textos repetidos, en lugar de una
+    lista de diccionarios que repite las ~30 claves en cada fila.
+
+    Es la representacion que produce la extraccion
+    (column_processing.build_cols_and_gridlines) y que consumen la
+    exportacion a Excel y DXF y la tabla de ColumnDataScreen.
+
+    Para el codigo que recorre filas se comporta como una secuencia de
+    diccionarios: len(tabla), tabla[i] y "for fila in tabla" entregan
+    diccionarios creados al vuelo. tabla["campo"] devuelve la columna.
+
+    La tabla puede indicar en units las unidades de sus valores (por
+    ejemplo units.MODEL_UNITS); to_units convierte de una vez las columnas de
+    longitud y esfuerzo (units.FIELD_QUANTITIES) para la salida.
+
+    Args:
+        columns (dict): {campo: arreglo de NumPy o pandas.Categorical}, todos
+            del mismo largo.
+        units (dict, opcional): {magnitud: unidad} de los valores, por
+            ejemplo {"length": "cm", "stress": "kgf/cm2"}.
+    """
+    def __init__(self, columns=None, units=None):
+        self._columns = dict(columns) if columns else {}
+        self.units = dict(units) if units else None
+        lengths = {len(values) for values in self._columns.values()}
+        if len(lengths) > 1:
+            raise ValueError(f"Las columnas tienen largos distintos: {sorted(lengths)}")
+        self._length = lengths.pop() if lengths else 0
+
+    @classmethod
+    def from_records(cls, records):
+        """Crea la tabla desde una lista de diccionarios (o la devuelve si ya es ColumnTable)."""
+        if isinstance(records, ColumnTable):
+            return records
+        records = list(records)
+        keys = {}
+        for record in records:
+            for key in record:
+                keys.setdefault(key, None)
+        return cls({
+            key: _build_column(key, [record.get(key) for record in records])
+            for key in keys
+        })
+
+    @classmethod
+    def from_frame(cls, df):
+        columns = {}
+        for key in df.columns:
+            series = df[key]
+            if isinstance(series.dtype, pd.CategoricalDtype):
+                columns[key] = series.array
+            elif series.dtype != object:
+                columns[key] = series.to_numpy()
+            else:
+                columns[key] = _build_column(key, series.tolist())
+        return cls(columns)
+
+    @classmethod
+    def concat(cls, tables):
+        tables = [cls.from_records(table) for table in tables]
+        tables = [table for table in tables if len(table)]
+        if not tables:
+            return cls()
+        return cls.from_frame(pd.concat([table.to_frame() for table in tables], ignore_index=True))
+
+    @property
+    def columns(self):
+        return list(self._columns)
+
+    def __len__(self):
+        return self._length
+
+    def __bool__(self):
+        return self._length > 0
+
+    def __contains__(self, key):
+        return key in self._columns
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            return self._columns[key]
+        if key < 0:
+            key += self._length
+        if not 0 <= key < self._length:
+            raise IndexError(key)
+        return self._row(key)
+
+    def _row(self, index):
+        row = {}
+        for key, values in self._columns.items():
+            value = values[index]
+            if isinstance(values, pd.Categorical) and pd.isna(value):
+                value = None
+            row[key] = _to_python(value)
+        return row
+
+    def __iter__(self):
+        for index in range(self._length):
+            yield self._row(index)
+
+    def __eq__(self, other):
+        if isinstance(other, (ColumnTable, list)):
+            return self.to_records() == ColumnTable.from_records(other).to_records()
+        return NotImplemented
+
+    def get(self, key, default=None):
+        return self._columns.get(key, default)
+
+    def select(self, rows):
+        """Nueva tabla con las filas indicadas (mascara booleana o indices)."""
+        return ColumnTable({key: values[rows] for key, values in self._columns.items()}, self.units)
+
+    def assign(self, columns):
+        """Nueva tabla con las columnas dadas agregadas o reemplazadas."""
+        new_columns = dict(self._columns)
+        new_columns.update({key: _build_column(key, values) for key, values in columns.items()})
+        return ColumnTable(new_columns, self.units)
+
+    def with_units(self, units):
+        """La misma tabla (sin copiar los datos) con las unidades indicadas."""
+        return ColumnTable(self._columns, units)
+
+    def column_in(self, key, unit):
+        """
+        Columna key convertida a unit con una sola operacion de NumPy. Los
+        valores no numericos quedan en NaN.
+        """
+        if self.units is None:
+            raise ValueError("La tabla no indica sus unidades; use with_units primero.")
+        quantity = unit_conversion.FIELD_QUANTITIES[key]
+        return unit_conversion.convert(self._columns[key], quantity, self.units[quantity], unit)
+
+    def to_units(self, units):
+        """
+        Nueva tabla con todas las columnas de las magnitudes de units
+        (units.FIELD_QUANTITIES) convertidas con column_in.
+
+        Args:
+            units (dict): {magnitud: unidad destino}, por ejemplo
+                {"length": "mm"}.
+        """
+        converted = {
+            key: self.column_in(key, units[quantity])
+            for key, quantity in unit_conversion.FIELD_QUANTITIES.items()
+            if key in self._columns and quantity in units
+        }
+        new_units = dict(self.units or {})
+        new_units.update(units)
+        return ColumnTable({**self._columns, **converted}, new_units)
+
+    def to_frame(self):
+        return pd.DataFrame(self._columns, copy=False)
+
+    def to_records(self):
+        return list(self)
+
+    def memory_usage(self):
+        """Bytes ocupados por los datos de la tabla."""
+        return int(self.to_frame().memory_usage(index=False, deep=True).sum())
@@ -0,0 +1,159 @@
+import json
+import time
+from collections import defaultdict
+
+import numpy as np
+
+from core.log import get_logger
+
+logger = get_logger(__name__)
+
+# Tipos que se devuelven tal cual al leer atributos del modelo; cualquier otro
+# atributo (FrameObj, PropFrame, ...) se envuelve para medir sus metodos.
+_PLAIN_TYPES = (int, float, str, bool, bytes, tuple, list, dict, type(None))
+
+
+class ComCallProfiler:
+    """
+    Registra las llamadas a la API de ETABS hechas a traves de un SapModel
+    envuelto con wrap(): numero de llamadas, tiempo acumulado, latencia p95 y
+    llamadas repetidas con los mismos argumentos, por metodo
+    (por ejemplo "FrameObj.GetSection").
+
+    Uso:
+        profiler = ComCallProfiler()
+        sap_model = profiler.wrap(sap_model)
+        ...  # extraccion
+        profiler.print_report()
+        profiler.dump_json("perfil_etabs.json")
+    """
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.redundant = defaultdict(int)
+        self._seen_calls = set()
+        self.started = time.perf_counter()
+
+    def wrap(self, sap_model):
+        if sap_model is None:
+            return sap_model
+        if isinstance(sap_model, ProfiledComObject) and sap_model._profiler is self:
+            return sap_model
+        return ProfiledComObject(sap_model, "", self)
+
+    def record(self, method, args, kwargs, elapsed, result=None):
+        self.latencies[method].append(elapsed)
+        try:
+            call_key = (method, repr(args), repr(sorted(kwargs.items())))
+        except Exception:
+            return
+        if call_key in self._seen_calls:
+            self.redundant[method] += 1
+        else:
+            self._seen_calls.add(call_key)
+
+    def report(self):
+        """
+        Returns:
+            dict: Resumen por metodo, ordenado por tiempo acumulado.
+        """
+        methods = []
+        for method, latencies in self.latencies.items():
+            latencies = np.asarray(latencies)
+            methods.append({
+                "method": method,
+                "calls": int(latencies.size),
+                "total_s": float(latencies.sum()),
+                "mean_ms": float(latencies.mean() * 1000),
+                "p95_ms": float(np.percentile(latencies, 95) * 1000),
+                "redundant_calls": int(self.redundant.get(method, 0)),
+            })
+        methods.sort(key=lambda item: item["total_s"], reverse=True)
+
+        return {
+            "wall_time_s": time.perf_counter() - self.started,
+            "total_calls": sum(item["calls"] for item in methods),
+            "api_time_s": sum(item["total_s"] for item in methods),
+            "redundant_calls": sum(item["redundant_calls"] for item in methods),
+            "methods": methods,
+        }
+
+    def print_report(self):
+        report = self.report()
+        logger.info("===== Perfil de llamadas a la API de ETABS =====")
+        logger.info(f"{'Metodo':<45}{'Llamadas':>10}{'Total (s)':>12}{'Prom (ms)':>12}{'p95 (ms)':>12}{'Repetidas':>11}")
+        for item in report["methods"]:
+            logger.info(
+                f"{item['method']:<45}{item['calls']:>10}{item['total_s']:>12.3f}"
+                f"{item['mean_ms']:>12.2f}{item['p95_ms']:>12.2f}{item['redundant_calls']:>11}"
+            )
+        logger.info(
+            f"Total: {report['total_calls']} llamadas, {report['api_time_s']:.2f} s en la API "
+            f"de {report['wall_time_s']:.2f} s, {report['redundant_calls']} repetidas."
+        )
+        return report
+
+    def dump_json(self, file_path):
+        with open(file_path, "w", encoding="utf-8") as f:
+            json.dump(self.report(), f, indent=2)
+        logger.info(f"Perfil de llamadas guardado en: {file_path}")
+
+
+class ProfiledComObject:
+    """
+    Envoltorio de un objeto COM de ETABS (SapModel, FrameObj, PropFrame, ...)
+    que mide cada llamada a sus metodos. Los sub-objetos tambien se envuelven.
+
+    Cada llamada se entrega a profiler.record(metodo, args, kwargs, segundos,
+    resultado); el resultado es la excepcion si la llamada fallo.
+    """
+    def __init__(self, target, path, profiler):
+        object.__setattr__(self, "_target", target)
+        object.__setattr__(self, "_path", path)
+        object.__setattr__(self, "_profiler", profiler)
+        object.__setattr__(self, "_children", {})
+
+    def __getattr__(self, name):
+        children = self._children
+        if name in children:
+            return children[name]
+
+        value = getattr(self._target, name)
+        path = f"{self._path}.{name}" if self._path else name
+        if isinstance(value, _PLAIN_TYPES):
+            return value
+        if callable(value):
+            wrapped = self._wrap_method(value, path)
+        else:
+            wrapped = ProfiledComObject(value, path, self._profiler)
+        children[name] = wrapped
+        return wrapped
+
+    def __setattr__(self, name, value):
+        setattr(self._target, name, value)
+
+    def __bool__(self):
+        return bool(self._target)
+
+    def _wrap_method(self, method, path):
+        profiler = self._profiler
+
+        def profiled_method(*args, **kwargs):
+            start = time.perf_counter()
+            result = None
+            try:
+                result = method(*args, **kwargs)
+                return result
+            except Exception as e:
+                result = e
+                raise
+            finally:
+                profiler.record(path, args, kwargs, time.perf_counter() - start, result)
+
+        return profiled_method
+
+
+def unwrap(sap_model):
+    """Devuelve el objeto COM original de un SapModel envuelto."""
+    while isinstance(sap_model, ProfiledComObject):
+        sap_model = sap_model._target
+    return sap_model
@@ -0,0 +1,194 @@
+import gzip
+import json
+import threading
+import time
+
+from core.com_profiler import ProfiledComObject
+from core.log import get_logger
+
+logger = get_logger(__name__)
+
+RECORDING_VERSION = 1
+
+
+def _to_json(value):
+    # comtypes devuelve tuplas, listas, numeros y textos; cualquier otro
+    # objeto se guarda como texto.
+    if isinstance(value, (list, tuple)):
+        return [_to_json(item) for item in value]
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    return repr(value)
+
+
+def _args_key(args, kwargs):
+    return json.dumps([_to_json(args), _to_json(sorted(kwargs.items()))])
+
+
+class ComCallRecorder:
+    """
+    Graba las llamadas hechas a un SapModel envuelto con wrap() y sus
+    resultados, para volver a servirlas sin ETABS con ReplaySapModel
+    (por ejemplo para medir la extraccion en Linux).
+
+    Por cada metodo se guarda una respuesta por combinacion de argumentos,
+    junto con el tiempo que tardo ETABS en responder. Si la llamada fallo se
+    guarda el mensaje de la excepcion.
+
+    Uso:
+        recorder = ComCallRecorder()
+        sap_model = recorder.wrap(sap_model)
+        ...  # extraccion
+        recorder.save("grabacion_etabs.json.gz")
+    """
+    def __init__(self):
+        self.model_filename = None
+        # {metodo: {args_key: [resultado, segundos]}}
+        self.calls = {}
+
+    def wrap(self, sap_model):
+        if sap_model is None:
+            return sap_model
+        if isinstance(sap_model, ProfiledComObject) and sap_model._profiler is self:
+            return sap_model
+        return ProfiledComObject(sap_model, "", self)
+
+    def record(self, method, args, kwargs, elapsed, result=None):
+        method_calls = self.calls.setdefault(method, {})
+        key = _args_key(args, kwargs)
+        if key in method_calls:
+            return
+        if isinstance(result, Exception):
+            result = {"__error__": str(result)}
+        else:
+            result = _to_json(result)
+        method_calls[key] = [result, elapsed]
+        if method == "GetModelFilename" and isinstance(result, str):
+            self.model_filename = result
+
+    def recording(self):
+        """
+        Returns:
+            dict: Grabacion con el formato que recibe ReplaySapModel.
+        """
+        return {
+            "version": RECORDING_VERSION,
+            "model_filename": self.model_filename,
+            "calls": self.calls,
+        }
+
+    def save(self, file_path):
+        """Guarda la grabacion en un archivo JSON comprimido con gzip."""
+        with gzip.open(file_path, "wt", encoding="utf-8") as f:
+            json.dump(self.recording(), f, separators=(",", ":"))
+        total_calls = sum(len(method_calls) for method_calls in self.calls.values())
+        logger.info(f"Grabacion de {total_calls} llamadas guardada en: {file_path}")
+
+
+def load_recording(file_path):
+    with gzip.open(file_path, "rt", encoding="utf-8") as f:
+        recording = json.load(f)
+    if recording.get("version") != RECORDING_VERSION:
+        raise ValueError(f"Version de grabacion no soportada: {recording.get('version')}")
+    return recording
+
+
+class ReplayCallError(LookupError):
+    """La llamada no esta en la grabacion."""
+
+
+class ReplaySapModel:
+    """
+    SapModel falso que responde con las llamadas grabadas por
+    ComCallRecorder. Los objetos y metodos que no se grabaron no existen
+    (AttributeError), igual que en una version de ETABS sin esa funcion.
+
+    Args:
+        recording (dict | str): Grabacion (ComCallRecorder.recording()) o
+            ruta del archivo guardado con ComCallRecorder.save().
+        latency (float | dict | str): Espera agregada a cada llamada, en
+            segundos. Puede ser un valor para todas, un diccionario
+            {metodo: segundos} o "recorded" para esperar lo mismo que tardo
+            ETABS al grabar.
+        serialize (bool): Si es True las llamadas de varios hilos se atienden
+            de a una, como cuando ETABS atiende la API en serie.
+
+    Se puede usar desde varios hilos a la vez.
+    """
+    def __init__(self, recording, latency=0.0, serialize=False):
+        if isinstance(recording, str):
+            recording = load_recording(recording)
+        self._calls = recording["calls"]
+        self._latency = latency
+        self._serialize = serialize
+        self._lock = threading.Lock()
+        self._call_lock = threading.Lock()
+        self._objects = {
+            method.rsplit(".", 1)[0]
+            for method in self._calls
+            if "." in method
+        }
+        self._children = {}
+        self.call_count = 0
+
+    def _get_latency(self, method, recorded_elapsed):
+        if self._latency == "recorded":
+            return recorded_elapsed
+        if isinstance(self._latency, dict):
+            return self._latency.get(method, 0.0)
+        return self._latency or 0.0
+
+    def _call(self, method, args, kwargs):
+        if self._serialize:
+            with self._call_lock:
+                return self._answer(method, args, kwargs)
+        return self._answer(method, args, kwargs)
+
+    def _answer(self, method, args, kwargs):
+        with self._lock:
+            self.call_count += 1
+        entry = self._calls[method].get(_args_key(args, kwargs))
+        if entry is None:
+            raise ReplayCallError(f"Llamada no grabada: {method}{tuple(args)}")
+        result, recorded_elapsed = entry
+
+        latency = self._get_latency(method, recorded_elapsed)
+        if latency > 0:
+            time.sleep(latency)
+
+        if isinstance(result, dict) and "__error__" in result:
+            raise RuntimeError(result["__error__"])
+        # comtypes devuelve los valores de salida en una tupla
+        if isinstance(result, list):
+            return tuple(result)
+        return result
+
+    def _resolve(self, path):
+        if path in self._children:
+            return self._children[path]
+        if path in self._calls:
+            def replayed_method(*args, **kwargs):
+                return self._call(path, args, kwargs)
+            child = replayed_method
+        elif path in self._objects or any(obj.startswith(path + ".") for obj in self._objects):
+            child = _ReplayComObject(self, path)
+        else:
+            raise AttributeError(f"'{path}' no esta en la grabacion")
+        self._children[path] = child
+        return child
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return self._resolve(name)
+
+
+class _ReplayComObject:
+    def __init__(self, replay, path):
+        self._replay = replay
+        self._path = path
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return self._replay._resolve(f"{self._path}.{name}")
@@ -1,10 +1,24 @@
-import comtypes.client
+try:
+    import comtypes.client
+except ImportError:
+    # Sin comtypes (por ejemplo en Linux) solo se pueden usar modelos falsos
+    # o grabados (core.fake_sap_model, core.com_recorder).
+    comtypes = None
 import sys
 import os
 import pandas as pd
 from openpyxl import Workbook
 
 from utils import extractions
+from core.column_table import ColumnTable
+from core.details import assign_details, summarize_details
+from core.export_excel import build_col_index, build_row_index
+from core.gridlines import assign_gridlines
+from core.log import PhaseSummary, get_logger
+from core.point_coordinates import PointCoordinateResolver
+from core.property_cache import ModelPropertyCache
+from core.stories import StoryIndex
+from core.units import convert, model_units
 
 
 # from elements.story import Story
@@ -13,6 +27,14 @@ from dxf_drawer.drawing import Drawing
 from dxf_drawer.detail import Detail
 from dxf_drawer.column import RectangularColumn
 
+logger = get_logger(__name__)
+
+# Unidades que se suponen si los registros no las indican: get_open_model_data
+# lee el modelo en sus unidades actuales, normalmente kN-m
+OPEN_MODEL_UNITS = {"length": "m", "force": "kN", "stress": "kN/m2"}
+# Los materiales de concreto se nombran por su f'c en psi, por ejemplo "4000Psi"
+MATERIAL_FC_UNIT = "psi"
+
 
 # -- Constantes para tipos de material
 # MAT_TYPE_STEEL = 1
@@ -30,29 +52,28 @@ def obtener_sapmodel_etabs():
     
     try:
         try:
-            print("Intentando conectar con una instancia activa de ETABS...")
+            logger.info("Intentando conectar con una instancia activa de ETABS...")
             ETABSObject = comtypes.client.GetActiveObject("CSI.ETABS.API.ETABSObject")
-            print("Conexión exitosa con ETABSObject.")
+            logger.info("Conexión exitosa con ETABSObject.")
         except (OSError, comtypes.COMError) as e:
-            print("No se pudo encontrar una instancia activa de ETABS.")
-            print(f"Error: {e}")
-            print("Por favor, asegúrate de que ETABS esté abierto con un modelo.")
+            logger.warning(f"No se pudo encontrar una instancia activa de ETABS: {e}")
+            logger.warning("Por favor, asegúrate de que ETABS esté abierto con un modelo.")
             return None
         
         # Obtener el objecto SapModel
         sap_model = ETABSObject.SapModel
         if sap_model is None:
-            print("No se pudo obtener el SapModel.")
+            logger.warning("No se pudo obtener el SapModel.")
             return sap_model
         
-        print("SapModel obtenido exitosamente.")
+        logger.info("SapModel obtenido exitosamente.")
         
     except comtypes.COMError as e:
-        print(f"Error de COM interactuando con ETABS: {e}")
+        logger.error(f"Error de COM interactuando con ETABS: {e}")
         # Podrías querer registrar el error completo: import traceback; traceback.print_exc()
         return None
     except Exception as e:
-        print(f"Ocurrió un error inesperado: {e}")
+        logger.error(f"Ocurrió un error inesperado: {e}")
         # import traceback; traceback.print_exc()
         return None
     
@@ -62,23 +83,23 @@ def obtener_sapmodel_etabs():
 
 def get_column_labels(sap_model):
     if sap_model is None:
-        print("Error: El objeto SapModel proporcionado no es válido.")
+        logger.error("El objeto SapModel proporcionado no es válido.")
         return []
     
     column_labels = []
-    print("\nObteniendo lista de todos los elementos frame...")
+    logger.info("Obteniendo lista de todos los elementos frame...")
     
     try:
         num_names, names_array_tuple, ret = sap_model.FrameObj.GetNameList()
         if ret != 0:
-            print(f"Error al intentar obtener la lista de frames. Código de error: {ret_val[0]}")
+            logger.error(f"Error al intentar obtener la lista de frames. Código de error: {ret_val[0]}")
             return column_labels
         
         number_of_frames = num_names
         all_frame_names_tuple = names_array_tuple
         
         if number_of_frames == 0:
-            print("No se encontraron objetos de tipo frame en el modelo.")
+            logger.warning("No se encontraron objetos de tipo frame en el modelo.")
             return column_labels
         
         for frame_name in all_frame_names_tuple:
@@ -93,24 +114,24 @@ def get_column_labels(sap_model):
         
         
     except AttributeError:
-        print("Error: El objeto SapModel no parece tener el método 'FrameObj' o sus sub-métodos.")
-        print("Asegúrate de que el modelo esté correctamente cargado e inicializado en ETABS.")
+        logger.error("El objeto SapModel no parece tener el método 'FrameObj' o sus sub-métodos.")
+        logger.warning("Asegúrate de que el modelo esté correctamente cargado e inicializado en ETABS.")
     except Exception as e:
-        print(f"Ocurrió un error inesperado al obtener labels de columnas: {e}")
+        logger.error(f"Ocurrió un error inesperado al obtener labels de columnas: {e}")
 
 def get_stories_with_elevations(sap_model):
     list_stories_elevations = []
     try:
         if sap_model is None:
-            print("No se pudo obtener el SapModel.")
+            logger.warning("No se pudo obtener el SapModel.")
             return list_stories_elevations
         
         num_stories, names_stories, ret = sap_model.Story.GetNameList()
         if num_stories == 0:
-            print("No se encontraron stories en el modelo.")
+            logger.warning("No se encontraron stories en el modelo.")
             return list_stories_elevations
         
-        print(f"Se encontraron {num_stories} niveles en el modelo.")
+        logger.info(f"Se encontraron {num_stories} niveles en el modelo.")
         
         for nombre_story in names_stories:
             elevacion = sap_model.Story.GetElevation(nombre_story)
@@ -120,43 +141,44 @@ def get_stories_with_elevations(sap_model):
                 "elevacion": elevacion
             }
             list_stories_elevations.append(story_info)
-            print(f" - Story: {nombre_story}, Elevacion: {elevacion}")
+            logger.debug(f"Story: {nombre_story}, Elevacion: {elevacion}")
     
     except Exception as e:
-        print(f"Ocurrio un error inesperado: {e}")
+        logger.error(f"Ocurrio un error inesperado: {e}")
         
     return list_stories_elevations
 
 
     
 
-def get_rectangular_concrete_sections(sap_model):
+def get_rectangular_concrete_sections(sap_model, cache=None):
     secciones_rect_concreto = []
     prop_frame = sap_model.PropFrame
     prop_material = sap_model.PropMaterial
+    cache = cache if cache is not None else ModelPropertyCache(sap_model)
 
     if not prop_frame or not prop_material:
-        print("Error: No se pudo acceder a las propiedades de secciones o materiales.")
+        logger.error("No se pudo acceder a las propiedades de secciones o materiales.")
         return secciones_rect_concreto
     
     # 1. Obtener la lista de todos los nombres de las secciones de frame ret, num_nombres,
     # nombres_secciones = prop_frame.GetNameList()
     num_nombres, nombres_secciones, ret = prop_frame.GetNameList()
     if ret != 0 or num_nombres == 0:
-        print("No se encontraron secciones de marco definidas o hubo un error al obtenerlas.")
+        logger.error("No se encontraron secciones de marco definidas o hubo un error al obtenerlas.")
         return secciones_rect_concreto
     
-    print(f"Se encontraron {num_nombres} secciones de marco. Analizando...")
+    logger.info(f"Se encontraron {num_nombres} secciones de marco. Analizando...")
 
     for nombre_seccion in nombres_secciones:
         try:
             # Intentar obtener las propiedades de la seccion como rectangular
             # GetRectangle(Name, FileName, MatProp, T3, T2, Color, Notes, GUID)
-            file_name, mat_prop, t3, t2, color, notes, guid, ret_rect = prop_frame.GetRectangle(nombre_seccion)
+            file_name, mat_prop, t3, t2, color, notes, guid, ret_rect = cache.get_rectangle(nombre_seccion)
             if ret_rect == 0: # Si es 0, la seccion es rectangular
                 # 3. Obtener el tipo de material de la seccion
                 # GetMaterial(Name, MatType, Color, Notes, GUID)
-                tipo_mat_int, _, _, _, ret_mat_details = prop_material.GetMaterial(mat_prop)
+                tipo_mat_int, _, _, _, ret_mat_details = cache.get_material(mat_prop)
 
                 if ret_mat_details == 0:
                     # 4. Verificar si el material es concreto
@@ -172,50 +194,51 @@ def get_rectangular_concrete_sections(sap_model):
                             "Ancho (T2)": t2,
                         }
                         secciones_rect_concreto.append(seccion_info)
-                        print(f" Seccion rectangular de concreto encontrada: {nombre_seccion} (Material: {mat_prop}, T3={t3}, T2={t2})")
+                        logger.debug(f"Seccion rectangular de concreto encontrada: {nombre_seccion} (Material: {mat_prop}, T3={t3}, T2={t2})")
 
         except Exception as e:
-            print(f"Excepcion al procesar la seccion: '{nombre_seccion}': {e}")
+            logger.error(f"Excepcion al procesar la seccion: '{nombre_seccion}': {e}")
             # Esto podria suceder si una seccion tiene un nombre en la lista pero
             # no se puede consultar con GetRectangle (secciones importadas extranas o nulas)
             continue
-        
-        if not secciones_rect_concreto:
-            print("No se encontraron secciones rectangulares de concreto.")
-        else:
-            print(f"\nTotal de secciones rectangulares de concreto encontradas: {len(secciones_rect_concreto)}")
+
+    if not secciones_rect_concreto:
+        logger.warning("No se encontraron secciones rectangulares de concreto.")
+    else:
+        logger.info(f"Total de secciones rectangulares de concreto encontradas: {len(secciones_rect_concreto)}")
 
     return secciones_rect_concreto
 
 
-def obtener_barras_refuerzo_definidas(sap_model):
+def obtener_barras_refuerzo_definidas(sap_model, cache=None):
     barras_refuerzo_definidas = []
     prop_rebar = sap_model.PropRebar
+    cache = cache if cache is not None else ModelPropertyCache(sap_model)
 
     if not prop_rebar:
-        print("Error: No se pudo acceder a las propiedades de las barras de refuerzo.")
+        logger.error("No se pudo acceder a las propiedades de las barras de refuerzo.")
         return barras_refuerzo_definidas
 
     # 1. Obtener la lista de todos los nombres/designaciones de las barras de refuerzo
     # GetNameList() para PropRebar devuelve (ret, NumberNames, MyNameArray)
-    num_nombres, nombres_barras, ret = prop_rebar.GetNameList()
+    num_nombres, nombres_barras, ret = cache.get_rebar_names()
 
     if ret != 0:
-        print(f"Error al obtener la lista de nombres de barras de refuerzo. Código: {ret}")
+        logger.error(f"Error al obtener la lista de nombres de barras de refuerzo. Código: {ret}")
         return barras_refuerzo_definidas
 
     if num_nombres == 0:
-        print("No se encontraron barras de refuerzo definidas en el modelo.")
+        logger.warning("No se encontraron barras de refuerzo definidas en el modelo.")
         return barras_refuerzo_definidas
 
-    print(f"Se encontraron {num_nombres} designaciones de barras de refuerzo. Analizando...")
+    logger.info(f"Se encontraron {num_nombres} designaciones de barras de refuerzo. Analizando...")
 
     for nombre_barra in nombres_barras:
         try:
             # 2. Obtener las propiedades de cada barra de refuerzo (área y diámetro)
             # GetRebarProps(Name, Area, Diameter)
             # Las unidades de Area y Diameter serán las unidades base de la base de datos del modelo.
-            area_barra, diametro_barra, ret_props = prop_rebar.GetRebarProps(nombre_barra)
+            area_barra, diametro_barra, ret_props = cache.get_rebar_props(nombre_barra)
 
             if ret_props == 0:
                 barra_info = {
@@ -224,19 +247,19 @@ def obtener_barras_refuerzo_definidas(sap_model):
                     "Diametro": diametro_barra,
                 }
                 barras_refuerzo_definidas.append(barra_info)
-                print(f"  Barra de refuerzo encontrada: {nombre_barra} (Área: {area_barra:.4f}, Diámetro: {diametro_barra:.4f})")
+                logger.debug(f"Barra de refuerzo encontrada: {nombre_barra} (Área: {area_barra:.4f}, Diámetro: {diametro_barra:.4f})")
             else:
-                print(f"  Error al obtener propiedades para la barra de refuerzo '{nombre_barra}'. Código: {ret_props}")
+                logger.error(f"Error al obtener propiedades para la barra de refuerzo '{nombre_barra}'. Código: {ret_props}")
 
         except Exception as e:
-            print(f"Excepción al procesar la barra de refuerzo '{nombre_barra}': {e}")
+            logger.error(f"Excepción al procesar la barra de refuerzo '{nombre_barra}': {e}")
             continue
 
     if not barras_refuerzo_definidas:
         # Este mensaje podría ser redundante si num_nombres fue 0, pero se mantiene por si hay fallos en GetRebarProps
-        print("No se pudieron extraer detalles de las barras de refuerzo definidas.")
+        logger.warning("No se pudieron extraer detalles de las barras de refuerzo definidas.")
     else:
-        print(f"\nTotal de designaciones de barras de refuerzo procesadas: {len(barras_refuerzo_definidas)}")
+        logger.info(f"Total de designaciones de barras de refuerzo procesadas: {len(barras_refuerzo_definidas)}")
 
     return barras_refuerzo_definidas
 
@@ -267,7 +290,7 @@ def connect_to_active_etabs_instance():
         
         if file_name_1:
             file_name = os.path.basename(file_name_1)
-            print(file_name)
+            logger.debug(f"Modelo abierto: {file_name}")
             return True, f"Conectado a ETABS. Modelo Abierto: {file_name}", sap_model
         else:
             return False, "ETABS está abierto, pero no hay ningún modelo cargado actualmente.", None
@@ -283,26 +306,124 @@ def connect_to_active_etabs_instance():
         return False, f"Error inesperado al conectar con ETABS: {str(e)}", None
 
 
-def get_excel_row(row_data, value):
-    for item in row_data:
-        if item['level'] == value:
-            return item['row']
-        
-    return None
+def create_dxf_file(column_data: list[dict], file_path='detalles_cols_etabs.dxf', details=None):
+    """
+    Dibuja un detalle de seccion por cada detalle (DC-n) de los registros de
+    columnas de get_open_model_data, con los datos de la primera columna de
+    cada detalle.
+
+    Args:
+        details (ColumnTable, opcional): Tabla por detalle de
+            assign_details (model_data['details']). Si no se da, se calcula
+            desde column_data.
+    """
+    details = details if details is not None else summarize_details(column_data)
+    if not details.units:
+        units = getattr(column_data, 'units', None) or OPEN_MODEL_UNITS
+        details = details.with_units(units)
+
+    # Conversiones de toda la tabla de una vez: dimensiones a mm y f'c del
+    # nombre del material a kg/cm2
+    widths = details.column_in('width', 'mm') if details else []
+    depths = details.column_in('depth', 'mm') if details else []
+    covers = details.column_in('cover', 'mm') if details else []
+    fc_names = pd.Series(details['material'] if details else [], dtype=object).astype(str).str[:-3]
+    fcs = convert(fc_names, 'stress', MATERIAL_FC_UNIT, 'kgf/cm2')
 
-def get_excel_col(col_data, value):
-    for item in col_data:
-        if item['gridline'] == value:
-            return  item['excel_col']
+    columns = []
+    for i, record in enumerate(details):
+        section = record['detail']
+        width = float(widths[i])
+        depth = float(depths[i])
+        fc = str(int(fcs[i]))
+        
+        r2_bars = record['number_r2_bars']
+        r3_bars = record['number_r3_bars']
+        rebar_type = record['Rebar']
+        number_bars = record['# Bars']
+        cover = float(covers[i])
+        stirrup_type = "#4"
         
-    return None
+        columns.append(
+            {'detail': section ,'column':RectangularColumn(width=depth, height=width, fc=fc, number_of_bars=number_bars, rebar_type=rebar_type, r2_bars=r2_bars, r3_bars=r3_bars, cover = cover, stirrup_type=stirrup_type),}
+        )
+        
+     # 1. Create list of Detail
+    list_details = []
+    start_point = (100,100)
+    counter = 0
+    width_detail = 3000
+    height_detail = 3000
+        
+    for i in range(1, len(columns)+1): 
+        actual_col = columns[i-1]['column']
+        origin_point = (start_point[0], start_point[1] - (height_detail*counter))
+        detail = Detail(f"{columns[i-1]['detail']}",origin_point, width_detail, height_detail)
+        detail.set_column(actual_col)
+        detail.set_origin_for_col(actual_col.width, actual_col.height)
+        list_details.append( detail)
+        counter += 1
 
-def create_dxf_file(column_data: list[dict]):
-    pass
+    drawing = Drawing(filename=file_path, list_details=list_details)
+    drawing.create_dxf()
 
 
-def generate_excel_table(stories_data, grid_lines, column_records: list[dict]):
-    
+def export_model_outputs(model_data, output_dir=''):
+    """
+    Escribe los archivos de un modelo extraido con get_open_model_data:
+    la tabla de columnas, el cuadro de columnas en Excel y los detalles DXF.
+
+    Returns:
+        dict: Ruta de cada archivo generado.
+    """
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+    files = {
+        'column_table': os.path.join(output_dir, 'column_output.xlsx'),
+        'excel': os.path.join(output_dir, 'cuadro_columnas.xlsx'),
+        'dxf': os.path.join(output_dir, 'detalles_cols_etabs.dxf'),
+    }
+    col_list = ColumnTable.from_records(model_data['cols_data'])
+    col_list.to_frame().to_excel(files['column_table'])
+    # Cuadro de Columnas Excel
+    generate_excel_table(model_data['stories'], model_data['grid_lines'], col_list, files['excel'],
+                         model_data.get('details'))
+    # Detalles de secciones en DXF
+    create_dxf_file(col_list, files['dxf'], model_data.get('details'))
+    return files
+
+
+def create_etabs_helper():
+    # Create API helper object
+    helper = comtypes.client.CreateObject('ETABSv1.Helper')
+    return helper.QueryInterface(comtypes.gen.ETABSv1.cHelper)
+
+
+def start_etabs_application(helper=None):
+    """
+    Inicia una nueva instancia de ETABS con el helper de la API.
+
+    Returns:
+        EtabsObject de la instancia iniciada.
+    """
+    helper = helper if helper is not None else create_etabs_helper()
+    EtabsObject = helper.CreateObjectProgID("CSI.ETABS.API.ETABSObject")
+    # Start ETABS application
+    EtabsObject.ApplicationStart()
+    return EtabsObject
+
+
+def generate_excel_table(stories_data, grid_lines, column_records: list[dict], file_path='cuadro_columnas.xlsx',
+                         details=None):
+    """
+    Escribe el cuadro de columnas y, en la hoja 'Detalles', una fila por
+    detalle DC-n con su seccion, material, armado y numero de columnas.
+
+    Args:
+        details (ColumnTable, opcional): Tabla por detalle de assign_details
+            (model_data['details']). Si no se da, se calcula de los
+            registros con summarize_details.
+    """
     stories_reverse = []
     
     
@@ -345,10 +466,14 @@ def generate_excel_table(stories_data, grid_lines, column_records: list[dict]):
         )
         counter_col += 1
 
+    # Indices de filas y columnas, armados una vez para todos los registros
+    row_index = build_row_index(col_rows)
+    col_index = build_col_index(gridline_columns)
+
     # Column Dataframe
     for record in column_records:
-            excel_column = get_excel_col(gridline_columns,record['GridLine'])
-            excel_row = get_excel_row(col_rows, record['start_end_level'])
+            excel_column = col_index.get(record['GridLine'])
+            excel_row = row_index.get(record['start_end_level'])
             if excel_row:
                 if excel_column:
                     #bxh
@@ -359,12 +484,15 @@ def generate_excel_table(stories_data, grid_lines, column_records: list[dict]):
                     ws.cell(row=excel_row+2, column=excel_column).value = record['As']
                     # Detalle
                     ws.cell(row=excel_row+8, column=excel_column).value = record['detail']
-                    
-
 
+    # Una fila por detalle, sin volver a agrupar los registros
+    details = details if details is not None else summarize_details(column_records)
+    ws_details = wb.create_sheet("Detalles")
+    ws_details.append(["Detalle", "b x h", "f'c", "As", "Columnas"])
+    for detail in details:
+        ws_details.append([detail['detail'], detail['bxh'], detail['material'], detail['As'], detail['count']])
 
-
-    wb.save('cuadro_columnas.xlsx')
+    wb.save(file_path)
 
 def get_story_by_elevation(stories_data, elevation):
     for story in stories_data:
@@ -373,26 +501,33 @@ def get_story_by_elevation(stories_data, elevation):
     return None
 
 
-def get_open_model_data(SapModel):
+def get_open_model_data(SapModel, profiler=None):
     data_output = []
+    # Perfil opcional de las llamadas a la API (ComCallProfiler)
+    SapModel = profiler.wrap(SapModel) if profiler is not None else SapModel
      # Get the model's name to verify the connection
     ModelName = SapModel.GetModelFilename()
     
-    print(f"Model loaded: {ModelName}")
+    logger.info(f"Model loaded: {ModelName}")
 
-    print("\nFetching story information...")
+    logger.info("Fetching story information...")
+    
+    # Cache de secciones, materiales y barras para toda la extraccion
+    cache = ModelPropertyCache(SapModel)
+    # Coordenadas de puntos: cada punto se consulta una sola vez
+    points = PointCoordinateResolver(SapModel)
     
     materials_dict = extractions.get_all_materials(SapModel)
     
-    rebar_info = extractions.get_all_rebars(SapModel)
-    print(rebar_info)
+    rebar_info = cache.get_all_rebars()
+    logger.debug("Barras de refuerzo: %s", rebar_info)
     
     
     stories = extractions.get_story_data(SapModel)
-    print(stories)
+    logger.debug("Niveles: %s", stories)
     
     if not stories:
-        print("Could not retrieve story information. Exiting.")
+        logger.warning("Could not retrieve story information. Exiting.")
                 # Optional: Release COM objects
                 # sap_model = None
                 # if 'etabs_object' in locals() and etabs_object is not None:
@@ -404,42 +539,50 @@ def get_open_model_data(SapModel):
         
     for story in stories:
         counter_stories += 1
-        data_stories.append(Story(id=counter_stories, name=story['name'], elevation=story['elevation']))
+        data_stories.append({'id': counter_stories, 'name': story['name'], 'elevation': story['elevation']})
         # print(f"  Story: {story['name']}, Elevation: {story['elevation']:.2f}")
         
-    columns_at_levels = extractions.extract_columns_by_level(SapModel,stories)
-    print(columns_at_levels)
+    story_index = StoryIndex(stories, "name", "elevation", extractions.COORDINATE_TOLERANCE)
+    columns_at_levels = extractions.extract_columns_by_level(SapModel,stories, cache, points)
+    logger.debug("Columnas por nivel: %s", columns_at_levels)
     
     if columns_at_levels:
-        print("\nExtracting columns for each level...")
+        logger.info("Extracting columns for each level...")
         found_any_columns = False
+        phase = PhaseSummary(logger, "Extraccion de columnas por nivel",
+                             total=sum(len(cols) for cols in columns_at_levels.values()))
         for story_info in stories:
            
             story_name = story_info["name"]
             if story_name in columns_at_levels and columns_at_levels[story_name]:
                 found_any_columns = True
-                print(f"\nLevel: {story_name} (Elevation: {story_info['elevation']:.2f})")
+                logger.debug(f"Level: {story_name} (Elevation: {story_info['elevation']:.2f})")
                 for col_name in sorted(columns_at_levels[story_name]):
                     info = {}
                     col_section = SapModel.FrameObj.GetSection(col_name)[0]
                     col_label, col_story, ret_label = SapModel.FrameObj.GetLabelFromName(col_name)
-                    material_defined = SapModel.PropFrame.GetMaterial(col_section)[0]
+                    material_defined = cache.get_section_material(col_section)[0]
                     col_point1, col_point2,  ret_points = SapModel.FrameObj.GetPoints(col_name)
-                    col_x_pos = SapModel.PointObj.GetCoordCartesian(col_point1)[0]
-                    col_y_pos =SapModel.PointObj.GetCoordCartesian(col_point1)[1]
-                    col_z_start = SapModel.PointObj.GetCoordCartesian(col_point1)[2]
-                    col_z_end = SapModel.PointObj.GetCoordCartesian(col_point2)[2]
-                    col_type_enum = SapModel.PropFrame.GetTypeOAPI(col_section)[0]
+                    coordinates_1 = points.get_xyz(col_point1) if ret_points == 0 else None
+                    coordinates_2 = points.get_xyz(col_point2) if ret_points == 0 else None
+                    if coordinates_1 is None or coordinates_2 is None:
+                        logger.warning(f"Could not get coordinates for points of column '{col_name}'")
+                        phase.count("columnas sin coordenadas")
+                        phase.step()
+                        continue
+                    col_x_pos, col_y_pos, col_z_start = coordinates_1
+                    col_z_end = coordinates_2[2]
+                    col_type_enum = cache.get_section_type(col_section)[0]
                     col_shape = None
                     if col_type_enum == 8:
                         col_shape = "Rectangular"
-                        width, depth = SapModel.PropFrame.GetRectangle(col_section)[2:4]
+                        width, depth = cache.get_rectangle(col_section)[2:4]
                         
-                        rebar_data = extractions.get_rebar_data(SapModel, col_section, col_name)
+                        rebar_data = extractions.get_rebar_data(SapModel, col_section, col_name, cache)
                     elif col_type_enum == 9:
                         col_shape = "Circular"
-                        width = SapModel.PropFrame.GetCircle(col_section)[2]
-                        rebar_data = extractions.get_rebar_data(SapModel, col_section,col_name)
+                        width = cache.get_circle(col_section)[2]
+                        rebar_data = extractions.get_rebar_data(SapModel, col_section,col_name, cache)
                         # print(SapModel.PropFrame.GetRebarType(col))
                         depth =None
                     elif col_type_enum == 28:
@@ -461,8 +604,8 @@ def get_open_model_data(SapModel):
                     info['pos_y'] = round(col_y_pos,2)
                     info['story'] = story_name
                     info['story_elevation'] = round(story_info['elevation'],2)
-                    info['story_start'] = get_story_by_elevation(stories, col_z_start)
-                    info['story_end'] = get_story_by_elevation(stories, col_z_end)
+                    info['story_start'] = story_index.match_one(col_z_start)
+                    info['story_end'] = story_index.match_one(col_z_end)
                     info['z_start'] = round(col_z_start,2)
                     info['z_end'] = round(col_z_end,2)
                     info['start_end_level'] = f"{info['story_start']}@{info['story_end']}"
@@ -486,6 +629,8 @@ def get_open_model_data(SapModel):
                         info['Mat. Estribo'] = ""
                         info['As'] = ""
                     data_output.append(info)
+                    phase.count("columnas")
+                    phase.step()
                     
                     
                     
@@ -495,57 +640,40 @@ def get_open_model_data(SapModel):
                 #    print("  - No columns found with top at this level.")
             
                 if not found_any_columns:
-                    print("\nNo columns were found associated with any story levels based on the criteria.")
+                    logger.debug("No columns were found associated with any story levels based on the criteria.")
             else:
-                print("No column data was extracted or an error occurred.")
+                logger.debug(f"No column data was extracted for level {story_name}.")
+        phase.finish()
                 
         df_columns = pd.DataFrame(data_output)
+        # Los registros quedan en las unidades actuales del modelo
+        units = model_units(SapModel)
 
-        # Unique sections
-        df_section_selected = df_columns[['bxh','As']]
-        df_section_unique = df_section_selected.drop_duplicates()
-
-        section_rows = len(df_section_unique)
-        detail_values = [f"DC-{i+1}" for i in range(section_rows)]
-        df_section_unique['detail'] = detail_values
-
-        
+        # 1. GridLine por posicion, agrupando las coordenadas con una
+        # tolerancia en las unidades del modelo
+        gridline_ids, _ = assign_gridlines(df_columns['pos_x'].to_numpy(), df_columns['pos_y'].to_numpy(),
+                                           units or OPEN_MODEL_UNITS)
+        df_columns['GridLine'] = gridline_ids
 
-        
-        # 1. Create tuple of cols "pos_x" and "pos_y" for each row.
-        # This is useful to have an object that can be used to find unique combinations.
-        df_columns['temp_grid'] = df_columns[['pos_x', 'pos_y']].apply(tuple, axis=1)
-        
-        # 2. Get unique values of these tuples and map to an integer value
-        # Use factorize(), which is efficient for this. Returns
-        # - an array of integers that represents the categories.
-        # - an arrray of unique categories
-        # Add 1 in order that identifiers start in 1 not in 0
-        df_columns['GridLine'] = pd.factorize(df_columns['temp_grid'])[0] + 1
-        
         grid_lines = df_columns['GridLine'].unique()
-       
-        
-        # 3. (Optional) Delete column temp
-        df_columns = df_columns.drop(columns=['temp_grid'])
 
-        # 4. Merge with detail for section
-        df_merged = pd.merge(df_columns, df_section_unique, on=['bxh', 'As'], how='left')
-        # print(df_merged)
-        
-        
-        sections = df_merged['detail'].unique()
-        # print(sections)
-        number_details = len(sections)
-        #5. Sort rows
-        df_sorted =df_merged.sort_values(by=['GridLine', 'z_start'],ascending=True)
+        # 2. Detalle DC-n por seccion y armado, con la primera columna de cada
+        # detalle para los detalles DXF
+        df_columns['detail'], details = assign_details(df_columns, ['bxh', 'As'])
+
+        #3. Sort rows
+        df_sorted =df_columns.sort_values(by=['GridLine', 'z_start'],ascending=True)
         # Sort dataframe by pos_x, pos_y
         # df_sorted.to_excel("column_output.xlsx")
-        cols_data = df_sorted.to_dict(orient='records') # List of dictionaries
+        cols_data = ColumnTable.from_frame(df_sorted).with_units(units)
+        details = details.with_units(units)
         
         # Get Rectangular Sections:
-        rect_sections = get_rectangular_concrete_sections(SapModel)
-        rebars_defined = obtener_barras_refuerzo_definidas(SapModel)
+        rect_sections = get_rectangular_concrete_sections(SapModel, cache)
+        rebars_defined = obtener_barras_refuerzo_definidas(SapModel, cache)
+        cache.print_stats()
+        if profiler is not None:
+            profiler.print_report()
         extracted_sections = []
         for elemento in rect_sections:
             extracted_sections.append(elemento['Nombre'])
@@ -554,7 +682,8 @@ def get_open_model_data(SapModel):
             rebars_in_etabs.append(rebar['Nombre'])
             
         
-        return {'cols_data': cols_data, 'rect_sections': extracted_sections, 'rebars_defined': rebars_in_etabs}
+        return {'cols_data': cols_data, 'rect_sections': extracted_sections, 'rebars_defined': rebars_in_etabs,
+                'stories': stories, 'grid_lines': list(grid_lines), 'details': details}
     
     return None
         
@@ -609,240 +738,24 @@ def get_open_model_data(SapModel):
     # drawing = Drawing(filename='detalles_cols_etabs.dxf', list_details=list_details)
     # drawing.create_dxf()
 
-def get_model_data(model_path):
-    data_output = []
-    
-    # Create API helper object
-    helper = comtypes.client.CreateObject('ETABSv1.Helper')
-    helper = helper.QueryInterface(comtypes.gen.ETABSv1.cHelper)
-    
-    EtabsObject = helper.CreateObjectProgID("CSI.ETABS.API.ETABSObject")
-
-    # Start ETABS application
-    EtabsObject.ApplicationStart()
+def get_model_data(model_path, profiler=None, output_dir=''):
+    EtabsObject = start_etabs_application()
     # Create SnapModel Object
     SapModel =EtabsObject.SapModel
-    print(SapModel)
     SapModel.File.OpenFile(model_path)
     
     # Open and save the model
-    print("ETABS model opened successfully!")
-
-    # Get the model's name to verify the connection
-    ModelName = EtabsObject.SapModel.GetModelFilename()
-    
-    print(f"Model loaded: {ModelName}")
-
-    print("\nFetching story information...")
-    
-    materials_dict = extractions.get_all_materials(SapModel)
-    
-    rebar_info = extractions.get_all_rebars(SapModel)
-    print(rebar_info)
-    
-    
-    stories = extractions.get_story_data(SapModel)
-    print(stories)
-    
-    if not stories:
-        print("Could not retrieve story information. Exiting.")
-                # Optional: Release COM objects
-                # sap_model = None
-                # if 'etabs_object' in locals() and etabs_object is not None:
-                #     etabs_object = None
-        sys.exit()
-        
-    data_stories = []
-    counter_stories = 0
-        
-    for story in stories:
-        counter_stories += 1
-        data_stories.append(Story(id=counter_stories, name=story['name'], elevation=story['elevation']))
-        # print(f"  Story: {story['name']}, Elevation: {story['elevation']:.2f}")
-        
-    columns_at_levels = extractions.extract_columns_by_level(SapModel,stories)
-    print(columns_at_levels)
-    
-    if columns_at_levels:
-        print("\nExtracting columns for each level...")
-        found_any_columns = False
-        for story_info in stories:
-           
-            story_name = story_info["name"]
-            if story_name in columns_at_levels and columns_at_levels[story_name]:
-                found_any_columns = True
-                print(f"\nLevel: {story_name} (Elevation: {story_info['elevation']:.2f})")
-                for col_name in sorted(columns_at_levels[story_name]):
-                    info = {}
-                    col_label, col_story, ret_label = SapModel.FrameObj.GetLabelFromName(col_name)
-                    col_section = SapModel.FrameObj.GetSection(col_name)[0]
-                    material_defined = SapModel.PropFrame.GetMaterial(col_section)[0]
-                    col_point1, col_point2,  ret_points = SapModel.FrameObj.GetPoints(col_name)
-                    col_x_pos = SapModel.PointObj.GetCoordCartesian(col_point1)[0]
-                    col_y_pos =SapModel.PointObj.GetCoordCartesian(col_point1)[1]
-                    col_z_start = SapModel.PointObj.GetCoordCartesian(col_point1)[2]
-                    col_z_end = SapModel.PointObj.GetCoordCartesian(col_point2)[2]
-                    col_type_enum = SapModel.PropFrame.GetTypeOAPI(col_section)[0]
-                    col_shape = None
-                    if col_type_enum == 8:
-                        col_shape = "Rectangular"
-                        width, depth = SapModel.PropFrame.GetRectangle(col_section)[2:4]
-                        
-                        rebar_data = extractions.get_rebar_data(SapModel, col_section, col_name)
-                    elif col_type_enum == 9:
-                        col_shape = "Circular"
-                        width = SapModel.PropFrame.GetCircle(col_section)[2]
-                        rebar_data = extractions.get_rebar_data(SapModel, col_section,col_name)
-                        # print(SapModel.PropFrame.GetRebarType(col))
-                        depth =None
-                    elif col_type_enum == 28:
-                        col_shape = "L"
-                        width = None
-                        depth = None
-                        rebar_data = None
-                    
-                    #print(f"  - {col_name} - {col_section},Material: {material_defined},  Pos X: {col_x_pos}, Pos Y: {col_y_pos}, Elev: {col_z_start} to Elev: {col_z_end}, shape: {col_shape}, Width: {width}, Depth: {depth}")
-                    info['col_id'] = col_name
-                    info['label'] = col_label
-                    info['section'] = col_section
-                    info['type'] = col_shape
-                    info['width'] = width
-                    info['depth'] = depth
-                    info['bxh'] = f"{depth}x{width}"
-                    info['material'] = material_defined
-                    info['pos_x'] = round(col_x_pos,2)
-                    info['pos_y'] = round(col_y_pos,2)
-                    info['story'] = story_name
-                    info['story_elevation'] = round(story_info['elevation'],2)
-                    info['story_start'] = get_story_by_elevation(stories, col_z_start)
-                    info['story_end'] = get_story_by_elevation(stories, col_z_end)
-                    info['z_start'] = round(col_z_start,2)
-                    info['z_end'] = round(col_z_end,2)
-                    info['start_end_level'] = f"{info['story_start']}@{info['story_end']}"
-                    if rebar_data:
-                        info['Mat. Rebar'] = rebar_data['mat_rebar_long']
-                        info['cover'] = rebar_data['cover']
-                        info['number_r2_bars'] = rebar_data['number_r2_bars']
-                        info['number_r3_bars'] = rebar_data['number_r3_bars']
-                        info['# Bars'] = rebar_data['number_bars']
-                        info['Rebar'] = rebar_data['rebar_type']
-                        info['Mat. Estribo'] = rebar_data['mat_rebar_confine']
-                        info['As']  = f"{rebar_data['number_bars']} {rebar_data['rebar_type']}"
-                        
-                    else:
-                        info['Mat. Rebar'] = ""
-                        info['cover'] = ""
-                        info['number_r2_bars'] = ""
-                        info['number_r3_bars'] = ""
-                        info['# Bars'] = ""
-                        info['Rebar'] = ""
-                        info['Mat. Estribo'] = ""
-                        info['As'] = ""
-                    data_output.append(info)
-                    
-                    
-                    
-                # Optionally print levels with no columns found
-                # else:
-                #    print(f"\nLevel: {story_name} (Elevation: {story_info['elevation']:.2f})")
-                #    print("  - No columns found with top at this level.")
-            
-                if not found_any_columns:
-                    print("\nNo columns were found associated with any story levels based on the criteria.")
-            else:
-                print("No column data was extracted or an error occurred.")
-                
-        df_columns = pd.DataFrame(data_output)
-
-        # Unique sections
-        df_section_selected = df_columns[['bxh','As']]
-        df_section_unique = df_section_selected.drop_duplicates()
-
-        section_rows = len(df_section_unique)
-        detail_values = [f"DC-{i+1}" for i in range(section_rows)]
-        df_section_unique['detail'] = detail_values
+    logger.info("ETABS model opened successfully!")
 
-        
-
-        
-        # 1. Create tuple of cols "pos_x" and "pos_y" for each row.
-        # This is useful to have an object that can be used to find unique combinations.
-        df_columns['temp_grid'] = df_columns[['pos_x', 'pos_y']].apply(tuple, axis=1)
-        
-        # 2. Get unique values of these tuples and map to an integer value
-        # Use factorize(), which is efficient for this. Returns
-        # - an array of integers that represents the categories.
-        # - an arrray of unique categories
-        # Add 1 in order that identifiers start in 1 not in 0
-        df_columns['GridLine'] = pd.factorize(df_columns['temp_grid'])[0] + 1
-        
-        grid_lines = df_columns['GridLine'].unique()
-       
-        
-        # 3. (Optional) Delete column temp
-        df_columns = df_columns.drop(columns=['temp_grid'])
-
-        # 4. Merge with detail for section
-        df_merged = pd.merge(df_columns, df_section_unique, on=['bxh', 'As'], how='left')
-        print(df_merged)
-        
-        
-        sections = df_merged['detail'].unique()
-        print(sections)
-        number_details = len(sections)
-        #5. Sort rows
-        df_sorted =df_merged.sort_values(by=['GridLine', 'z_start'],ascending=True)
-        # Sort dataframe by pos_x, pos_y
-        df_sorted.to_excel("column_output.xlsx")
-        
+    model_data = get_open_model_data(SapModel, profiler)
     
     #Close Application
     EtabsObject.ApplicationExit(False)
 
-    # Convert data to list of dicts
-    col_list = df_sorted.to_dict(orient='records')
-    
-    # Generate Cuadro de Columnas Excel
-    generate_excel_table(stories, grid_lines ,col_list)
+    if model_data is None:
+        logger.error("No column data was extracted or an error occurred.")
+        return None
     
-    # Generate dxf section details
-    columns = []
-    for section in sections:
-        width = df_sorted[df_sorted['detail'] == section].iloc[0]['width'] * 1000 # Convert to mm
-        depth = df_sorted[df_sorted['detail'] == section].iloc[0]['depth'] * 1000 # Convert to mm
-        fc = df_sorted[df_sorted['detail'] == section].iloc[0]['material']
-        fc = int(fc[:-3])
-        # Convert fc to kg/cm2
-        fc = int(fc * (12*12)*(3.28*3.28)/(100*100*2.204))
-        fc = str(fc)
-        
-        r2_bars = df_sorted[df_sorted['detail'] == section].iloc[0]['number_r2_bars']
-        r3_bars = df_sorted[df_sorted['detail'] == section].iloc[0]['number_r3_bars']
-        rebar_type = df_sorted[df_sorted['detail'] == section].iloc[0]['Rebar']
-        number_bars = df_sorted[df_sorted['detail'] == section].iloc[0]['# Bars']
-        cover = df_sorted[df_sorted['detail'] == section].iloc[0]['cover'] * 1000 #Convert to mm
-        stirrup_type = "#4"
-        
-        columns.append(
-            {'detail': section ,'column':RectangularColumn(width=depth, height=width, fc=fc, number_of_bars=number_bars, rebar_type=rebar_type, r2_bars=r2_bars, r3_bars=r3_bars, cover = cover, stirrup_type=stirrup_type),}
-        )
-        
-     # 1. Create list of Detail
-    list_details = []
-    start_point = (100,100)
-    counter = 0
-    width_detail = 3000
-    height_detail = 3000
-        
-    for i in range(1, len(columns)+1): 
-        actual_col = columns[i-1]['column']
-        origin_point = (start_point[0], start_point[1] - (height_detail*counter))
-        detail = Detail(f"{columns[i-1]['detail']}",origin_point, width_detail, height_detail)
-        detail.set_column(actual_col)
-        detail.set_origin_for_col(actual_col.width, actual_col.height)
-        list_details.append( detail)
-        counter += 1
-
-    drawing = Drawing(filename='detalles_cols_etabs.dxf', list_details=list_details)
-    drawing.create_dxf()
-        
\ No newline at end of file
+    # Tabla de columnas, Cuadro de Columnas Excel y detalles DXF
+    export_model_outputs(model_data, output_dir)
+    return model_data
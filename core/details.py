@@ -0,0 +1,63 @@
+import numpy as np
+
+from core.column_table import ColumnTable
+
+# Campos que definen un detalle de seccion (DC-n): dos columnas con el mismo
+# armado comparten el detalle
+DETAIL_SIGNATURE = ["r2_bars", "r3_bars", "estribo_r2", "estribo_r3"]
+DETAIL_PREFIX = "DC-"
+
+
+def assign_details(df, signature=DETAIL_SIGNATURE, prefix=DETAIL_PREFIX):
+    """
+    Asigna el detalle DC-n de cada fila agrupando una sola vez por los campos
+    de la firma, en lugar de drop_duplicates + merge o de buscar la primera
+    fila de cada detalle con una mascara por detalle.
+
+    Los detalles se numeran en el orden en que aparece cada armado en df,
+    igual que con drop_duplicates. Los valores faltantes forman su propio
+    grupo.
+
+    Args:
+        df (pd.DataFrame): Registros de columnas.
+        signature (list[str]): Campos que definen un detalle.
+        prefix (str): Prefijo del nombre del detalle.
+
+    Returns:
+        tuple: (details, summary): details es un arreglo con el detalle de
+        cada fila de df y summary una ColumnTable con una fila por detalle
+        (la primera columna de ese detalle), la clave 'detail' y en 'count'
+        el numero de columnas del detalle.
+    """
+    if df.empty:
+        return np.empty(0, dtype=object), ColumnTable()
+
+    codes = df.groupby(signature, sort=False, dropna=False).ngroup().to_numpy()
+    names = np.array([f"{prefix}{i + 1}" for i in range(codes.max() + 1)], dtype=object)
+
+    # Primera fila de cada detalle, en el orden de la numeracion
+    _, first_rows, counts = np.unique(codes, return_index=True, return_counts=True)
+    summary = df.iloc[first_rows].assign(detail=names, count=counts).reset_index(drop=True)
+    return names[codes], ColumnTable.from_frame(summary)
+
+
+def summarize_details(column_data):
+    """
+    Tabla por detalle de registros que ya tienen el detalle asignado (por
+    ejemplo cargados de un archivo): la primera columna de cada detalle, en
+    el orden DC-1, DC-2, ...
+
+    Returns:
+        ColumnTable: Una fila por detalle, con 'count' como en assign_details.
+    """
+    table = ColumnTable.from_records(column_data)
+    if not table or "detail" not in table:
+        return ColumnTable()
+    df = table.to_frame()
+    details = df["detail"].astype(str)
+    _, first_rows, counts = np.unique(details.to_numpy(), return_index=True, return_counts=True)
+    summary = df.iloc[first_rows].assign(count=counts)
+    # DC-1, DC-2, ..., DC-10 por el numero, no por el texto
+    summary = summary.assign(_number=details.iloc[first_rows].str.extract(r"(\d+)$")[0].astype(float))
+    summary = summary.sort_values(by=["_number"], kind="stable").drop(columns=["_number"])
+    return ColumnTable.from_frame(summary.reset_index(drop=True))
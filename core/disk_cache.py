@@ -0,0 +1,250 @@
+import hashlib
+import json
+import os
+import shutil
+import time
+
+import numpy as np
+import pandas as pd
+
+from core.column_table import ColumnTable
+from core.log import get_logger
+
+logger = get_logger(__name__)
+
+# Cambiar cuando cambie el formato de los datos guardados, para no leer
+# entradas de versiones anteriores.
+CACHE_VERSION = 3
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cuadro_columnas_cache")
+# Tamaño maximo del cache en disco para todos los modelos (bytes)
+DEFAULT_MAX_BYTES = 200 * 1024 * 1024
+
+META_FILE = "meta.json"
+
+
+def _is_integer(value):
+    return isinstance(value, (int, np.integer)) and not isinstance(value, (bool, np.bool_))
+
+
+def _is_number(value):
+    return isinstance(value, (int, float, np.number)) and not isinstance(value, (bool, np.bool_))
+
+
+def _frame_from_records(records):
+    """
+    Devuelve (DataFrame, columnas numericas con valores faltantes).
+
+    Parquet guarda esas columnas como numeros con nulos; las de enteros se
+    guardan como Int64 para que no vuelvan como float.
+    """
+    if isinstance(records, ColumnTable):
+        df = records.to_frame()
+    else:
+        # object para que pandas no convierta a float los enteros con None
+        df = pd.DataFrame(list(records), dtype=object)
+    nullable = []
+    for key in df.columns:
+        series = df[key]
+        if series.dtype != object:
+            continue
+        values = series.dropna().tolist()
+        if not values or len(values) == len(series):
+            continue
+        if all(_is_integer(value) for value in values):
+            df[key] = series.astype("Int64")
+            nullable.append(key)
+        elif all(_is_number(value) for value in values):
+            nullable.append(key)
+    return df, nullable
+
+
+def _restore_nullable(df, nullable):
+    # Numeros de Python y None, igual que la extraccion
+    for key in nullable:
+        integer = isinstance(df[key].dtype, pd.Int64Dtype)
+        df[key] = pd.Series(
+            [None if pd.isna(value) else (int(value) if integer else float(value)) for value in df[key]],
+            index=df.index, dtype=object,
+        )
+    return df
+
+
+def _records_from_frame(df):
+    # Parquet guarda los valores faltantes como NaN/None y las tuplas como
+    # arreglos; se devuelven como None y tuplas, igual que la extraccion.
+    df = df.astype(object).where(df.notna(), None)
+    records = df.to_dict(orient="records")
+    for record in records:
+        for key, value in record.items():
+            if isinstance(value, np.ndarray):
+                record[key] = tuple(value.tolist())
+    return records
+
+
+class ExtractionDiskCache:
+    """
+    Cache en disco de los resultados de la extraccion de un modelo.
+
+    La clave de cada entrada combina la ruta del modelo
+    (SapModel.GetModelFilename), el tamaño y la fecha de modificacion del
+    archivo .EDB y el sistema de unidades usado en la extraccion. Si el modelo
+    no cambio desde la ultima sesion, los datos se leen de disco en lugar de
+    consultarlos a ETABS.
+
+    Cada entrada es una carpeta con un archivo Parquet por lista de registros.
+    Cuando el cache supera max_bytes se eliminan las entradas usadas hace mas
+    tiempo (LRU).
+
+    Nota: los cambios hechos en ETABS que aun no se han guardado no cambian el
+    archivo .EDB, por lo que no invalidan el cache. Por eso cada entrada se
+    lee de disco a lo sumo una vez por sesion; las siguientes extracciones
+    del mismo modelo consultan a ETABS.
+
+    Args:
+        cache_dir (str): Carpeta del cache.
+        max_bytes (int): Tamaño maximo del cache en disco.
+    """
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self._model_filenames = {}
+        # Claves ya leidas o guardadas en esta sesion
+        self._session_keys = set()
+
+    def get_key(self, sap_model, units):
+        """
+        Devuelve la clave del modelo abierto, o None si el modelo no esta
+        guardado en disco.
+        """
+        try:
+            model_filename = sap_model.GetModelFilename()
+        except Exception as e:
+            logger.warning(f"No se pudo obtener el archivo del modelo: {e}")
+            return None
+        if not model_filename or not os.path.isfile(model_filename):
+            return None
+
+        stat = os.stat(model_filename)
+        key_data = (
+            CACHE_VERSION,
+            os.path.normcase(os.path.abspath(model_filename)),
+            stat.st_size,
+            stat.st_mtime_ns,
+            tuple(units),
+        )
+        key = hashlib.sha1(repr(key_data).encode("utf-8")).hexdigest()
+        self._model_filenames[key] = model_filename
+        return key
+
+    def _entry_dir(self, key):
+        return os.path.join(self.cache_dir, key)
+
+    def load(self, key):
+        """
+        Lee una entrada del cache.
+
+        Returns:
+            dict: {nombre: lista de registros o ColumnTable}, o None si no
+            existe o ya se uso en esta sesion.
+        """
+        if key is None or key in self._session_keys:
+            return None
+        entry_dir = self._entry_dir(key)
+        meta_path = os.path.join(entry_dir, META_FILE)
+        if not os.path.isfile(meta_path):
+            return None
+
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            data = {}
+            for name in meta["names"]:
+                df = pd.read_parquet(os.path.join(entry_dir, f"{name}.parquet"))
+                df = _restore_nullable(df, meta.get("nullable", {}).get(name, []))
+                if name in meta.get("tables", []):
+                    data[name] = ColumnTable.from_frame(df)
+                else:
+                    data[name] = _records_from_frame(df)
+        except Exception as e:
+            logger.warning(f"No se pudo leer el cache en disco ({e}). Se extraera de nuevo.")
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            return None
+
+        # Marcar la entrada como usada recientemente
+        self._session_keys.add(key)
+        meta["last_access"] = time.time()
+        with open(meta_path, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+
+        logger.info(f"Datos del modelo leidos del cache en disco: {meta['model_filename']}")
+        return data
+
+    def store(self, key, data):
+        """
+        Guarda los resultados de la extraccion.
+
+        Args:
+            key (str): Clave de get_key.
+            data (dict): {nombre: lista de diccionarios o ColumnTable}.
+        """
+        if key is None:
+            return
+        self._session_keys.add(key)
+        entry_dir = self._entry_dir(key)
+        try:
+            os.makedirs(entry_dir, exist_ok=True)
+            nullable = {}
+            for name, records in data.items():
+                df, nullable[name] = _frame_from_records(records)
+                df.to_parquet(os.path.join(entry_dir, f"{name}.parquet"), index=False)
+            meta = {
+                "model_filename": self._model_filenames.get(key, ""),
+                "names": list(data),
+                "tables": [name for name, records in data.items() if isinstance(records, ColumnTable)],
+                "nullable": nullable,
+                "last_access": time.time(),
+            }
+            with open(os.path.join(entry_dir, META_FILE), "w", encoding="utf-8") as f:
+                json.dump(meta, f)
+        except Exception as e:
+            # Por ejemplo ImportError si pyarrow no esta instalado
+            logger.warning(f"No se pudo guardar el cache en disco: {e}")
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            return
+
+        self.evict()
+
+    def _entries(self):
+        entries = []
+        if not os.path.isdir(self.cache_dir):
+            return entries
+        for key in os.listdir(self.cache_dir):
+            entry_dir = self._entry_dir(key)
+            meta_path = os.path.join(entry_dir, META_FILE)
+            if not os.path.isfile(meta_path):
+                continue
+            try:
+                with open(meta_path, "r", encoding="utf-8") as f:
+                    last_access = json.load(f).get("last_access", 0)
+            except (OSError, ValueError):
+                last_access = 0
+            size = sum(
+                os.path.getsize(os.path.join(entry_dir, file_name))
+                for file_name in os.listdir(entry_dir)
+            )
+            entries.append((last_access, size, entry_dir))
+        return entries
+
+    def evict(self):
+        """
+        Elimina las entradas usadas hace mas tiempo hasta que el cache quede
+        por debajo de max_bytes.
+        """
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        for last_access, size, entry_dir in entries:
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            total -= size
@@ -1,6 +1,30 @@
-import comtypes.client
+try:
+    import comtypes.client
+except ImportError:
+    # Sin comtypes (por ejemplo en Linux) solo se pueden usar modelos falsos
+    # o grabados (core.fake_sap_model, core.com_recorder).
+    comtypes = None
 import pandas as pd
 
+from core.column_processing import build_cols_and_gridlines
+from core.lazy_rebar import LazyColumnRecord, RebarLoader, complete_records, rebar_fields
+from core.log import PhaseSummary, get_logger
+from core.point_coordinates import PointCoordinateResolver
+from core.property_cache import ModelPropertyCache
+from core.stories import (
+    clasificar_punto_por_elevacion,
+    get_next_story,
+    get_stories_with_elevations,
+    get_story_by_elevation,
+    StoryIndex,
+)
+from core.units import model_units
+
+logger = get_logger(__name__)
+
+# Frames que se procesan entre cada reporte de avance de la extraccion
+COLUMN_CHUNK_SIZE = 200
+
 # -- Constantes para tipos de material
 # MAT_TYPE_STEEL = 1
 MAT_TYPE_CONCRETE = 2
@@ -35,11 +59,11 @@ def establecer_units_etabs(
     sap_model, unidad_fuerza, unidad_longitud, unidad_temperatura
 ):
     if sap_model is None:
-        print("Error: El objeto SapModel proporcionado no es válido.")
+        logger.error("El objeto SapModel proporcionado no es válido.")
         return False
 
-    print(
-        f"\nIntentando establecer unidades: Fuerza={unidad_fuerza}, Longitud={unidad_longitud}, Temperatura={unidad_temperatura}"
+    logger.info(
+        f"Intentando establecer unidades: Fuerza={unidad_fuerza}, Longitud={unidad_longitud}, Temperatura={unidad_temperatura}"
     )
 
     try:
@@ -50,33 +74,29 @@ def establecer_units_etabs(
         )
 
         if ret == 0:
-            print("Unidades establecidas exitosamente en ETABS.")
+            logger.info("Unidades establecidas exitosamente en ETABS.")
             # Opcional: Verificar las unidades actuales después de establecerlas
             current_units = (
                 sap_model.GetPresentUnits_2()
             )  # Devuelve una tupla (fuerza, longitud, temperatura)
-            print(current_units)
-            print(
+            logger.info(
                 f"Unidades actuales verificadas: Fuerza={current_units[0]}, Longitud={current_units[1]}, Temperatura={current_units[2]}"
             )
             return True
         else:
-            print(
+            logger.error(
                 f"Error al establecer las unidades en ETABS. Código de retorno: {ret}"
             )
-            print(
+            logger.warning(
                 "Verifica que los códigos de unidades sean válidos para tu versión de ETABS."
             )
             return False
 
     except comtypes.COMError as e:
-        print(f"Error de COM interactuando con ETABS al establecer unidades: {e}")
+        logger.error(f"Error de COM interactuando con ETABS al establecer unidades: {e}")
         return False
     except Exception as e:
-        print(f"Ocurrió un error inesperado al establecer unidades: {e}")
-        import traceback
-
-        traceback.print_exc()
+        logger.exception(f"Ocurrió un error inesperado al establecer unidades: {e}")
         return False
 
 
@@ -87,29 +107,28 @@ def obtener_sapmodel_etabs():
     
     try:
         try:
-            print("Intentando conectar con una instancia activa de ETABS...")
+            logger.info("Intentando conectar con una instancia activa de ETABS...")
             ETABSObject = comtypes.client.GetActiveObject("CSI.ETABS.API.ETABSObject")
-            print("Conexión exitosa con ETABSObject.")
+            logger.info("Conexión exitosa con ETABSObject.")
         except (OSError, comtypes.COMError) as e:
-            print("No se pudo encontrar una instancia activa de ETABS.")
-            print(f"Error: {e}")
-            print("Por favor, asegúrate de que ETABS esté abierto con un modelo.")
+            logger.warning(f"No se pudo encontrar una instancia activa de ETABS: {e}")
+            logger.warning("Por favor, asegúrate de que ETABS esté abierto con un modelo.")
             return None
 
         # Obtener el objecto SapModel
         sap_model = ETABSObject.SapModel
         if sap_model is None:
-            print("No se pudo obtener el SapModel.")
+            logger.warning("No se pudo obtener el SapModel.")
             return sap_model
 
-        print("SapModel obtenido exitosamente.")
+        logger.info("SapModel obtenido exitosamente.")
 
     except comtypes.COMError as e:
-        print(f"Error de COM interactuando con ETABS: {e}")
+        logger.error(f"Error de COM interactuando con ETABS: {e}")
         # Podrías querer registrar el error completo: import traceback; traceback.print_exc()
         return None
     except Exception as e:
-        print(f"Ocurrió un error inesperado: {e}")
+        logger.error(f"Ocurrió un error inesperado: {e}")
         # import traceback; traceback.print_exc()
         return None
 
@@ -119,45 +138,38 @@ def close_connection():
     comtypes.CoUninitialize()
 
 
-def get_story_by_elevation(stories_data, elevation):
-    for story in stories_data:
-        if story["elevacion"] == elevation:
-            return story["nombre"]
-
-    return None
-
-
-def get_rect_concrete_sections(sap_model):
+def get_rect_concrete_sections(sap_model, cache=None):
     secciones_rect_concreto = []
     prop_frame = sap_model.PropFrame
     prop_material = sap_model.PropMaterial
+    cache = cache if cache is not None else ModelPropertyCache(sap_model)
 
     if not prop_frame or not prop_material:
-        print("Error: No se pudo acceder a las propiedades de secciones o materiales.")
+        logger.error("No se pudo acceder a las propiedades de secciones o materiales.")
         return secciones_rect_concreto
 
     # 1. Obtener la lista de todos los nombres de las secciones de frame ret, num_nombres,
     # nombres_secciones = prop_frame.GetNameList()
     num_nombres, nombres_secciones, ret = prop_frame.GetNameList()
     if ret != 0 or num_nombres == 0:
-        print(
+        logger.error(
             "No se encontraron secciones de marco definidas o hubo un error al obtenerlas."
         )
         return secciones_rect_concreto
 
-    print(f"Se encontraron {num_nombres} secciones de marco. Analizando...")
+    logger.info(f"Se encontraron {num_nombres} secciones de marco. Analizando...")
 
     for nombre_seccion in nombres_secciones:
         try:
             # Intentar obtener las propiedades de la seccion como rectangular
             # GetRectangle(Name, FileName, MatProp, T3, T2, Color, Notes, GUID)
             file_name, mat_prop, t3, t2, color, notes, guid, ret_rect = (
-                prop_frame.GetRectangle(nombre_seccion)
+                cache.get_rectangle(nombre_seccion)
             )
             if ret_rect == 0:  # Si es 0, la seccion es rectangular
                 # 3. Obtener el tipo de material de la seccion
                 # GetMaterial(Name, MatType, Color, Notes, GUID)
-                tipo_mat_int, _, _, _, ret_mat_details = prop_material.GetMaterial(
+                tipo_mat_int, _, _, _, ret_mat_details = cache.get_material(
                     mat_prop
                 )
 
@@ -175,49 +187,50 @@ def get_rect_concrete_sections(sap_model):
                             "Ancho (T2)": t2,
                         }
                         secciones_rect_concreto.append(seccion_info)
-                        print(
-                            f" Seccion rectangular de concreto encontrada: {nombre_seccion} (Material: {mat_prop}, T3={t3}, T2={t2})"
+                        logger.debug(
+                            f"Seccion rectangular de concreto encontrada: {nombre_seccion} (Material: {mat_prop}, T3={t3}, T2={t2})"
                         )
 
         except Exception as e:
-            print(f"Excepcion al procesar la seccion: '{nombre_seccion}': {e}")
+            logger.error(f"Excepcion al procesar la seccion: '{nombre_seccion}': {e}")
             # Esto podria suceder si una seccion tiene un nombre en la lista pero
             # no se puede consultar con GetRectangle (secciones importadas extranas o nulas)
             continue
 
     if not secciones_rect_concreto:
-        print("No se encontraron secciones rectangulares de concreto.")
+        logger.warning("No se encontraron secciones rectangulares de concreto.")
     else:
-        print(
-            f"\nTotal de secciones rectangulares de concreto encontradas: {len(secciones_rect_concreto)}"
+        logger.info(
+            f"Total de secciones rectangulares de concreto encontradas: {len(secciones_rect_concreto)}"
         )
 
     return secciones_rect_concreto
 
 
-def get_defined_rebars(sap_model):
+def get_defined_rebars(sap_model, cache=None):
     barras_refuerzo_definidas = []
     prop_rebar = sap_model.PropRebar
+    cache = cache if cache is not None else ModelPropertyCache(sap_model)
 
     if not prop_rebar:
-        print("Error: No se pudo acceder a las propiedades de las barras de refuerzo.")
+        logger.error("No se pudo acceder a las propiedades de las barras de refuerzo.")
         return barras_refuerzo_definidas
 
     # 1. Obtener la lista de todos los nombres/designaciones de las barras de refuerzo
     # GetNameList() para PropRebar devuelve (ret, NumberNames, MyNameArray)
-    num_nombres, nombres_barras, ret = prop_rebar.GetNameList()
+    num_nombres, nombres_barras, ret = cache.get_rebar_names()
 
     if ret != 0:
-        print(
+        logger.error(
             f"Error al obtener la lista de nombres de barras de refuerzo. Código: {ret}"
         )
         return barras_refuerzo_definidas
 
     if num_nombres == 0:
-        print("No se encontraron barras de refuerzo definidas en el modelo.")
+        logger.warning("No se encontraron barras de refuerzo definidas en el modelo.")
         return barras_refuerzo_definidas
 
-    print(
+    logger.info(
         f"Se encontraron {num_nombres} designaciones de barras de refuerzo. Analizando..."
     )
 
@@ -226,7 +239,7 @@ def get_defined_rebars(sap_model):
             # 2. Obtener las propiedades de cada barra de refuerzo (área y diámetro)
             # GetRebarProps(Name, Area, Diameter)
             # Las unidades de Area y Diameter serán las unidades base de la base de datos del modelo.
-            area_barra, diametro_barra, ret_props = prop_rebar.GetRebarProps(
+            area_barra, diametro_barra, ret_props = cache.get_rebar_props(
                 nombre_barra
             )
 
@@ -237,24 +250,24 @@ def get_defined_rebars(sap_model):
                     "Diametro": diametro_barra,
                 }
                 barras_refuerzo_definidas.append(barra_info)
-                print(
-                    f"  Barra de refuerzo encontrada: {nombre_barra} (Área: {area_barra:.4f}, Diámetro: {diametro_barra:.4f})"
+                logger.debug(
+                    f"Barra de refuerzo encontrada: {nombre_barra} (Área: {area_barra:.4f}, Diámetro: {diametro_barra:.4f})"
                 )
             else:
-                print(
-                    f"  Error al obtener propiedades para la barra de refuerzo '{nombre_barra}'. Código: {ret_props}"
+                logger.error(
+                    f"Error al obtener propiedades para la barra de refuerzo '{nombre_barra}'. Código: {ret_props}"
                 )
 
         except Exception as e:
-            print(f"Excepción al procesar la barra de refuerzo '{nombre_barra}': {e}")
+            logger.error(f"Excepción al procesar la barra de refuerzo '{nombre_barra}': {e}")
             continue
 
     if not barras_refuerzo_definidas:
         # Este mensaje podría ser redundante si num_nombres fue 0, pero se mantiene por si hay fallos en GetRebarProps
-        print("No se pudieron extraer detalles de las barras de refuerzo definidas.")
+        logger.warning("No se pudieron extraer detalles de las barras de refuerzo definidas.")
     else:
-        print(
-            f"\nTotal de designaciones de barras de refuerzo procesadas: {len(barras_refuerzo_definidas)}"
+        logger.info(
+            f"Total de designaciones de barras de refuerzo procesadas: {len(barras_refuerzo_definidas)}"
         )
 
     return barras_refuerzo_definidas
@@ -262,16 +275,16 @@ def get_defined_rebars(sap_model):
 
 def get_column_labels(sap_model):
     if sap_model is None:
-        print("Error: El objeto SapModel proporcionado no es válido.")
+        logger.error("El objeto SapModel proporcionado no es válido.")
         return []
 
     column_labels = []
-    print("\nObteniendo lista de todos los elementos frame...")
+    logger.info("Obteniendo lista de todos los elementos frame...")
 
     try:
         num_names, names_array_tuple, ret = sap_model.FrameObj.GetNameList()
         if ret != 0:
-            print(
+            logger.error(
                 f"Error al intentar obtener la lista de frames. Código de error: {ret}"
             )
             return column_labels
@@ -280,7 +293,7 @@ def get_column_labels(sap_model):
         all_frame_names_tuple = names_array_tuple
 
         if number_of_frames == 0:
-            print("No se encontraron objetos de tipo frame en el modelo.")
+            logger.warning("No se encontraron objetos de tipo frame en el modelo.")
             return column_labels
 
         for frame_name in all_frame_names_tuple:
@@ -293,34 +306,58 @@ def get_column_labels(sap_model):
                     column_labels.append(frame_name)
             else:
                 # Advertir si no se puede obtener el tipo, pero continuar con otros frames
-                print(
-                    f"Advertencia: No se pudo obtener el tipo para el frame '{frame_name}'. Código: {ret_orientation}"
+                logger.warning(
+                    f"No se pudo obtener el tipo para el frame '{frame_name}'. Código: {ret_orientation}"
                 )
 
         if not column_labels:
-            print("No se encontraron elementos de tipo columna en el modelo.")
+            logger.warning("No se encontraron elementos de tipo columna en el modelo.")
         else:
-            print(f"\nSe encontraron {len(column_labels)} columnas en el modelo.")
+            logger.info(f"Se encontraron {len(column_labels)} columnas en el modelo.")
 
     except AttributeError:
-        print(
-            "Error: El objeto SapModel no parece tener el método 'FrameObj' o sus sub-métodos."
+        logger.error(
+            "El objeto SapModel no parece tener el método 'FrameObj' o sus sub-métodos."
         )
-        print(
+        logger.warning(
             "Asegúrate de que el modelo esté correctamente cargado e inicializado en ETABS."
         )
     except Exception as e:
-        print(f"Ocurrió un error inesperado al obtener labels de columnas: {e}")
+        logger.error(f"Ocurrió un error inesperado al obtener labels de columnas: {e}")
 
     return column_labels
 
 
-def get_story_lable_col_name(sap_model):
+def get_story_lable_col_name(sap_model, cache=None):
     if sap_model is None:
-        print("Error: El objeto SapModel proporcionado no es válido.")
+        logger.error("El objeto SapModel proporcionado no es válido.")
         return [], None
 
+    # Un solo cache para toda la extraccion: cada seccion y material se
+    # consulta a ETABS una vez, no una vez por columna.
+    cache = cache if cache is not None else ModelPropertyCache(sap_model)
     column_data = []
+    with PhaseSummary(logger, "Extraccion de columnas") as phase:
+        for records, processed, total in iter_story_lable_col_name(sap_model, cache=cache):
+            column_data.extend(records)
+            phase.count("columnas", len(records))
+            phase.update(processed, total)
+
+    cache.print_stats()
+    return build_cols_and_gridlines(column_data, units=model_units(sap_model))
+
+
+def iter_story_lable_col_name(sap_model, chunk_size=COLUMN_CHUNK_SIZE, cache=None):
+    """
+    Version por partes de get_story_lable_col_name: genera los registros
+    crudos de las columnas cada chunk_size frames, para poder mostrar avance
+    y resultados parciales mientras se lee el modelo.
+
+    Yields:
+        tuple: (registros, frames procesados, total de frames). Los registros
+        aun no tienen GridLine ni detalle; se asignan con
+        build_cols_and_gridlines cuando termina la extraccion.
+    """
     number_names, mynames, mylabels, mystories, ret = (
         sap_model.FrameObj.GetLabelNameList()
     )
@@ -328,137 +365,235 @@ def get_story_lable_col_name(sap_model):
     # Get Levels
     stories = get_stories_with_elevations(sap_model)
     # print(stories)
-    for item in range(number_names):
+
+    frames = list(zip(mynames, mylabels, mystories))
+    yield from iter_column_records(sap_model, frames, stories, chunk_size, cache)
+
+
+def iter_column_records(sap_model, frames, stories, chunk_size=COLUMN_CHUNK_SIZE, cache=None, points=None):
+    """
+    Aplica extract_column_records por grupos de chunk_size frames.
+
+    Yields:
+        tuple: (registros, frames procesados, total de frames).
+    """
+    cache = cache if cache is not None else ModelPropertyCache(sap_model)
+    points = points if points is not None else PointCoordinateResolver(sap_model)
+    total = len(frames)
+    for start in range(0, total, chunk_size):
+        chunk = frames[start:start + chunk_size]
+        records = extract_column_records(sap_model, chunk, stories, cache, points)
+        yield records, start + len(chunk), total
+
+
+def get_story_lable_col_name_lazy(sap_model, rebar_loader=None, cache=None, on_chunk=None,
+                                  chunk_size=COLUMN_CHUNK_SIZE):
+    """
+    Version de get_story_lable_col_name que separa la geometria del armado:
+    cada parte de frames se entrega a on_chunk en cuanto se leen su geometria
+    y seccion, con los campos de armado en None, mientras rebar_loader carga
+    el armado de las secciones (en segundo plano si tiene model_factory).
+    GridLine y detalle DC-n se asignan al final, con el armado completo.
+
+    Args:
+        rebar_loader (RebarLoader, opcional): Por defecto carga cada seccion
+            en este hilo cuando se completa el registro.
+        on_chunk (callable, opcional): on_chunk(registros, procesados, total).
+
+    Returns:
+        tuple: (cols_data, gridlines_data) con el mismo formato que
+        get_story_lable_col_name.
+    """
+    if sap_model is None:
+        logger.error("El objeto SapModel proporcionado no es válido.")
+        return [], None
+
+    cache = cache if cache is not None else ModelPropertyCache(sap_model)
+    points = PointCoordinateResolver(sap_model)
+    rebar_loader = rebar_loader if rebar_loader is not None else RebarLoader(sap_model)
+    number_names, mynames, mylabels, mystories, ret = sap_model.FrameObj.GetLabelNameList()
+    story_index = StoryIndex(get_stories_with_elevations(sap_model))
+    frames = list(zip(mynames, mylabels, mystories))
+
+    records = []
+    total = len(frames)
+    for start in range(0, total, chunk_size):
+        chunk = frames[start:start + chunk_size]
+        rows = fetch_column_rows(sap_model, chunk, cache, points, rebar_loader)
+        chunk_records = normalize_column_rows(rows, story_index)
+        records.extend(chunk_records)
+        if on_chunk is not None:
+            on_chunk([record.available() for record in chunk_records], start + len(chunk), total)
+
+    column_data = complete_records(records)
+    cache.print_stats()
+    return build_cols_and_gridlines(column_data, units=model_units(sap_model))
+
+
+def extract_column_records(sap_model, frames, stories, cache=None, points=None):
+    """
+    Extrae los registros crudos de las columnas rectangulares de concreto.
+
+    Args:
+        sap_model: El objeto SapModel activo de la API de ETABS.
+        frames (list[tuple]): (nombre, label, story) de cada frame a revisar.
+        stories (list[dict]): Niveles de get_stories_with_elevations.
+        cache (ModelPropertyCache): Cache de propiedades de la extraccion.
+        points (PointCoordinateResolver): Resolver de coordenadas de puntos.
+
+    Returns:
+        list[dict]: Un registro por frame de columna, sin GridLine ni detalle.
+    """
+    rows = fetch_column_rows(sap_model, frames, cache, points)
+    return normalize_column_rows(rows, StoryIndex(stories))
+
+
+def fetch_column_rows(sap_model, frames, cache=None, points=None, rebar_loader=None):
+    """
+    Primera parte de extract_column_records: todas las llamadas a la API.
+    Lee de ETABS los datos de cada columna rectangular de concreto sin
+    clasificarlos por nivel.
+
+    Args:
+        rebar_loader (RebarLoader, opcional): Si se da, el armado no se lee
+            aqui: "rebar_data" es el resultado pendiente de
+            rebar_loader.future(seccion).
+
+    Returns:
+        list[dict]: Una fila por columna con los datos leidos de ETABS
+        (coordenadas en "coordinates" y armado en "rebar_data").
+    """
+    cache = cache if cache is not None else ModelPropertyCache(sap_model)
+
+    # Primero se identifican las columnas y sus puntos; las coordenadas de
+    # todos los puntos se piden despues en lote.
+    columns = []
+    for frame_name, frame_label, frame_story in frames:
         design_orientation, ret_orientation = sap_model.FrameObj.GetDesignOrientation(
-            mynames[item]
+            frame_name
         )
         if ret_orientation == 0:
             if design_orientation == 1:
-                shape, ret = sap_model.PropFrame.GetTypeOAPI(
-                    get_col_section(sap_model, mynames[item])
-                )
+                col_section = get_col_section(sap_model, frame_name)
+                shape, ret = cache.get_section_type(col_section)
                 if shape == 8:
-                    info = {}
-                    info["col_id"] = mynames[item]
-                    info["label"] = mylabels[item]
-                    info["story"] = mystories[item]
-                    info["section"] = get_col_section(sap_model, mynames[item])
-                    info["material"] = get_col_material(sap_model, info["section"])
-                    info["fc"] = get_fc_concrete(sap_model, info["material"])
-                    info["shape"] = get_col_shape(sap_model, info["section"])
-                    if info["shape"] == "rectangular":
-                        dimensions = get_rectangular_col_dimensions(
-                            sap_model, info["section"]
-                        )
-                        info["t3"] = dimensions[0]
-                        info["t2"] = dimensions[1]
-
-                        # Get bxh
-                        b = min(info["t3"], info["t2"])
-                        h = max(info["t3"], info["t2"])
-                        info["depth"] = int(h)
-                        info["width"] = int(b)
-                        info["bxh"] = f"{int(b)}x{int(h)}"
-                    else:
-                        info["t3"] = None
-                        info["t2"] = None
-                        info["depth"] = None
-                        info["width"] = None
-                        info["bxh"] = None
-
-                    coordinates = get_col_coordinates(sap_model, mynames[item])
-                    info["pos_x"] = coordinates[0]
-                    info["pos_y"] = coordinates[1]
-                    info["z_start"] = coordinates[2]
-                    info["z_end"] = coordinates[3]
-                    nivel_start = clasificar_punto_por_elevacion(stories, info['z_start'])
-                    nivel_end = clasificar_punto_por_elevacion(stories, info['z_end'])
-                    info['nivel_start'] = nivel_start
-                    info['nivel_end'] = nivel_end
-                    # Stories
-                    info["story_start"] = get_story_by_elevation(
-                        stories, info["z_start"]
-                    )
-                    info["story_end"] = get_story_by_elevation(stories, info["z_end"])
-                    info["start_end_level"] = (
-                        f"{nivel_start}@{nivel_end}"
-                    )
-                    # Rebar Data
-                    rebar_data = get_rebar_data(sap_model, info["section"])
-                    info["Long. Rebar Mat."] = rebar_data[0]
-                    info["Mat. Estribo"] = rebar_data[1]
-                    info["Rebar"] = rebar_data[8]
-                    info["r2_bars"] = rebar_data[6]
-                    info["r3_bars"] = rebar_data[7]
-                    info["number_bars"] = None
-                    if rebar_data[6]:
-                        if rebar_data[7]:
-                            info["number_bars"] = (2 * rebar_data[6]) + (
-                                2 * (rebar_data[7] - 2)
-                            )
-
-                    info["Est. Rebar"] = rebar_data[9]
-                    info["estribo_r2"] = rebar_data[11]
-                    info["estribo_r3"] = rebar_data[12]
-                    info["cover"] = rebar_data[4]
-                    info["As"] = f"{info['number_bars']} {info['Rebar']}"
-
-                    column_data.append(info)
-
-    # Create dataframe
-    df_columns = pd.DataFrame(column_data)
-    print(df_columns.columns)
-    df_columns_sorted = df_columns.sort_values(by=["label", "z_start"])
-
-    # Unique sections
-    # df_section_selected = df_columns_sorted[["bxh", "As"]]
-    df_section_selected = df_columns_sorted[["r2_bars", "r3_bars", "estribo_r2", "estribo_r3"]]
-    df_section_unique = df_section_selected.drop_duplicates()
-
-    section_rows = len(df_section_unique)
-    detail_values = [f"DC-{i + 1}" for i in range(section_rows)]
-    df_section_unique["detail"] = detail_values
-
-    # 1. Create tuple of cols "pos_x" and "pos_y" for each row.
-    # This is useful to have an object that can be used to find unique combinations.
-    df_columns_sorted["temp_grid"] = df_columns_sorted[["pos_x", "pos_y"]].apply(
-        tuple, axis=1
+                    col_points = sap_model.FrameObj.GetPoints(frame_name)
+                    columns.append((frame_name, frame_label, frame_story, col_section, col_points))
+
+    points = points if points is not None else PointCoordinateResolver(sap_model)
+    points.resolve(
+        point_name
+        for _, _, _, _, (point_1, point_2, ret_points) in columns
+        if ret_points == 0
+        for point_name in (point_1, point_2)
     )
 
-    # 2. Get unique values of these tuples and map to an integer value
-    # Use factorize(), which is efficient for this. Returns
-    # - an array of integers that represents the categories.
-    # - an arrray of unique categories
-    # Add 1 in order that identifiers start in 1 not in 0
-    df_columns_sorted["GridLine"] = pd.factorize(df_columns_sorted["temp_grid"])[0] + 1
-    
-    df_gridlines = df_columns_sorted.drop_duplicates(subset=["GridLine", "pos_x","pos_y"])
-    gridlines_data = df_gridlines.to_dict(orient="records")
-    
+    rows = []
+    for frame_name, frame_label, frame_story, col_section, col_points in columns:
+        coordinates = get_col_coordinates(sap_model, frame_name, points, col_points)
+        if coordinates is None:
+            logger.warning(f"Could not get coordinates for points of column '{frame_name}'")
+            continue
+        row = {}
+        row["col_id"] = frame_name
+        row["label"] = frame_label
+        row["story"] = frame_story
+        row["section"] = col_section
+        row["material"] = get_col_material(sap_model, row["section"], cache)
+        row["fc"] = get_fc_concrete(sap_model, row["material"], cache)
+        row["shape"] = get_col_shape(sap_model, row["section"], cache)
+        if row["shape"] == "rectangular":
+            row["dimensions"] = get_rectangular_col_dimensions(
+                sap_model, row["section"], cache
+            )
+        else:
+            row["dimensions"] = None
+        row["coordinates"] = coordinates
+        if rebar_loader is not None:
+            row["rebar_data"] = rebar_loader.future(row["section"])
+        else:
+            row["rebar_data"] = get_rebar_data(sap_model, row["section"], cache)
+        rows.append(row)
 
-    gridlines = df_columns_sorted["GridLine"].unique()
+    return rows
 
-    # 3. (Optional) Delete column temp
-    df_columns_sorted = df_columns_sorted.drop(columns=["temp_grid"])
 
-    # 4. Merge with detail for section
-    df_merged = pd.merge(
-        # df_columns_sorted, df_section_unique, on=["bxh", "As"], how="left"
-        df_columns_sorted, df_section_unique, on=["r2_bars", "r3_bars", "estribo_r2", "estribo_r3"], how="left"
-    )
+def normalize_column_rows(rows, story_index):
+    """
+    Segunda parte de extract_column_records, sin llamadas a la API: clasifica
+    los extremos de cada columna por nivel en una sola pasada vectorizada y
+    arma los registros.
+
+    Args:
+        rows (list[dict]): Filas de fetch_column_rows.
+        story_index (StoryIndex): Indice de los niveles del modelo.
 
-    sections = df_merged["detail"].unique()
-    # print(sections)
-    number_details = len(sections)
-    # 5. Sort rows
-    df_sorted = df_merged.sort_values(by=["GridLine", "z_start"], ascending=True)
-    # Sort dataframe by pos_x, pos_y
-    # df_sorted.to_excel("column_output.xlsx")
-    cols_data = df_sorted.to_dict(orient="records")  # List of dictionaries
+    Returns:
+        list[dict]: Un registro por columna, sin GridLine ni detalle. Si el
+        armado aun no se cargo (RebarLoader) el registro es un
+        LazyColumnRecord.
+    """
+    coordinates_list = [row["coordinates"] for row in rows]
+    z_starts = [coordinates[2] for coordinates in coordinates_list]
+    z_ends = [coordinates[3] for coordinates in coordinates_list]
+    niveles_start = story_index.classify(z_starts)
+    niveles_end = story_index.classify(z_ends)
+    stories_start = story_index.match(z_starts)
+    stories_end = story_index.match(z_ends)
 
-    labels = df_columns_sorted["label"].unique()
+    column_data = []
+    for i, row in enumerate(rows):
+        info = {}
+        info["col_id"] = row["col_id"]
+        info["label"] = row["label"]
+        info["story"] = row["story"]
+        info["section"] = row["section"]
+        info["material"] = row["material"]
+        info["fc"] = row["fc"]
+        info["shape"] = row["shape"]
+        if info["shape"] == "rectangular":
+            dimensions = row["dimensions"]
+            info["t3"] = dimensions[0]
+            info["t2"] = dimensions[1]
+
+            # Get bxh
+            b = min(info["t3"], info["t2"])
+            h = max(info["t3"], info["t2"])
+            info["depth"] = int(h)
+            info["width"] = int(b)
+            info["bxh"] = f"{int(b)}x{int(h)}"
+        else:
+            info["t3"] = None
+            info["t2"] = None
+            info["depth"] = None
+            info["width"] = None
+            info["bxh"] = None
+
+        coordinates = coordinates_list[i]
+        info["pos_x"] = coordinates[0]
+        info["pos_y"] = coordinates[1]
+        info["z_start"] = coordinates[2]
+        info["z_end"] = coordinates[3]
+        nivel_start = niveles_start[i]
+        nivel_end = niveles_end[i]
+        info['nivel_start'] = nivel_start
+        info['nivel_end'] = nivel_end
+        # Stories
+        info["story_start"] = stories_start[i]
+        info["story_end"] = stories_end[i]
+        info["start_end_level"] = (
+            f"{nivel_start}@{nivel_end}"
+        )
+        # Rebar Data
+        rebar_data = row["rebar_data"]
+        if hasattr(rebar_data, "result"):
+            column_data.append(LazyColumnRecord(info, rebar_data))
+            continue
+        info.update(rebar_fields(rebar_data))
+
+        column_data.append(info)
 
-    return cols_data, gridlines_data
+    return column_data
 
 
 def get_col_section(sap_model, frame_name):
@@ -468,9 +603,10 @@ def get_col_section(sap_model, frame_name):
     return None
 
 
-def get_col_shape(sap_model, section):
+def get_col_shape(sap_model, section, cache=None):
+    cache = cache if cache is not None else ModelPropertyCache(sap_model)
     # 8 for rectangular ,9 for circle, 28 concrete L
-    section_type_oapi, ret_type = sap_model.PropFrame.GetTypeOAPI(section)
+    section_type_oapi, ret_type = cache.get_section_type(section)
     if ret_type == 0:
         if section_type_oapi == 8:
             shape = "rectangular"
@@ -487,13 +623,14 @@ def get_col_shape(sap_model, section):
     return None
 
 
-def get_rectangular_col_dimensions(sap_model, section):
-    section_type_oapi, ret_type = sap_model.PropFrame.GetTypeOAPI(section)
+def get_rectangular_col_dimensions(sap_model, section, cache=None):
+    cache = cache if cache is not None else ModelPropertyCache(sap_model)
+    section_type_oapi, ret_type = cache.get_section_type(section)
     if ret_type == 0:
         if section_type_oapi == 8:
             shape = "rectangular"
             # Get dimensions
-            ret = sap_model.PropFrame.GetRectangle(section)
+            ret = cache.get_rectangle(section)
             if ret[7] == 0:
                 t3 = round(ret[2], 2)
                 t2 = round(ret[3], 2)
@@ -501,13 +638,14 @@ def get_rectangular_col_dimensions(sap_model, section):
             return t3, t2
     return None, None
 
-def get_fy_steel(sap_model, material_name):
+def get_fy_steel(sap_model, material_name, cache=None):
     """
     Obtiene la resistencia a la fluencia (Fy) de un material de refuerzo (rebar).
 
     Args:
         sap_model: El objeto SapModel activo de la API de ETABS.
         material_name (str): El nombre del material de refuerzo.
+        cache (ModelPropertyCache, opcional): Cache de la sesion de extraccion.
 
     Returns:
         float: El valor de Fy, o None si ocurre un error.
@@ -515,10 +653,11 @@ def get_fy_steel(sap_model, material_name):
     if not material_name:
         return None
 
+    cache = cache if cache is not None else ModelPropertyCache(sap_model)
     try:
         # La API devuelve una tupla de propiedades del acero. Fy es el primer valor.
         # Firma: GetOSteel_1(Name, Fy, Fu, EFy, EFu, ...)
-        props = sap_model.PropMaterial.GetOSteel_1(material_name)
+        props = cache.get_steel(material_name)
         
         # El último valor de la tupla es el código de retorno (0 si es exitoso)
         if props[-1] == 0:
@@ -527,22 +666,37 @@ def get_fy_steel(sap_model, material_name):
         else:
             return None
     except Exception as e:
-        print(f"Error al obtener Fy para el material '{material_name}': {e}")
+        logger.error(f"Error al obtener Fy para el material '{material_name}': {e}")
         return None
 
 
-def get_col_material(sap_model, col_section):
-    material_defined = sap_model.PropFrame.GetMaterial(col_section)[0]
+def get_col_material(sap_model, col_section, cache=None):
+    cache = cache if cache is not None else ModelPropertyCache(sap_model)
+    material_defined = cache.get_section_material(col_section)[0]
     return material_defined
 
 
-def get_col_coordinates(sap_model, col_name):
-    col_point1, col_point2, ret_points = sap_model.FrameObj.GetPoints(col_name)
+def get_col_coordinates(sap_model, col_name, points=None, col_points=None):
+    """
+    Devuelve (x, y, z_start, z_end) de la columna. Las coordenadas se leen del
+    PointCoordinateResolver, que consulta cada punto distinto una sola vez.
+
+    Returns:
+        tuple: (x, y, z_start, z_end), o None si no se pudieron obtener los
+        puntos de la columna o las coordenadas de alguno de ellos.
+    """
+    if col_points is None:
+        col_points = sap_model.FrameObj.GetPoints(col_name)
+    col_point1, col_point2, ret_points = col_points
     if ret_points == 0:
-        col_x_pos = sap_model.PointObj.GetCoordCartesian(col_point1)[0]
-        col_y_pos = sap_model.PointObj.GetCoordCartesian(col_point1)[1]
-        col_z_start = sap_model.PointObj.GetCoordCartesian(col_point1)[2]
-        col_z_end = sap_model.PointObj.GetCoordCartesian(col_point2)[2]
+        points = points if points is not None else PointCoordinateResolver(sap_model)
+        points.resolve([col_point1, col_point2])
+        coordinates_1 = points.get_xyz(col_point1)
+        coordinates_2 = points.get_xyz(col_point2)
+        if coordinates_1 is None or coordinates_2 is None:
+            return None
+        col_x_pos, col_y_pos, col_z_start = coordinates_1
+        col_z_end = coordinates_2[2]
         return (
             round(col_x_pos, 2),
             round(col_y_pos, 2),
@@ -552,80 +706,24 @@ def get_col_coordinates(sap_model, col_name):
     return None
 
 
-def get_fc_concrete(sap_model, material):
-    mat_type, color, notes, guid, ret = sap_model.PropMaterial.GetMaterial(material)
+def get_fc_concrete(sap_model, material, cache=None):
+    cache = cache if cache is not None else ModelPropertyCache(sap_model)
+    mat_type, color, notes, guid, ret = cache.get_material(material)
     fc = None
     if ret == 0:
         if mat_type == MAT_TYPE_CONCRETE:
-            ret = sap_model.PropMaterial.GetOConcrete_1(material)
+            ret = cache.get_concrete(material)
             fc = round(ret[0])
     return fc
 
 
-def get_rebar_data(sap_model, section):
-    rebar_data_results = sap_model.PropFrame.GetRebarColumn(section)
+def get_rebar_data(sap_model, section, cache=None):
+    cache = cache if cache is not None else ModelPropertyCache(sap_model)
+    rebar_data_results = cache.get_rebar_column(section)
     # print(rebar_data_results)
     return rebar_data_results
 
 
-def get_next_story(stories, story):
-    for item in range(0, len(stories)):
-        if stories[item]["nombre"] == story:
-            return stories[item + 1]["nombre"]
-    return None
-
-
-def get_stories_with_elevations(sap_model):
-    list_stories_elevations = []
-    try:
-        if sap_model is None:
-            print("No se pudo obtener el SapModel.")
-            return list_stories_elevations
-
-        num_stories, names_stories, ret = sap_model.Story.GetNameList()
-        if num_stories == 0:
-            print("No se encontraron stories en el modelo.")
-            return list_stories_elevations
-
-        print(f"Se encontraron {num_stories} niveles en el modelo.")
-
-        for nombre_story in names_stories:
-            elevacion = sap_model.Story.GetElevation(nombre_story)
-
-            story_info = {"nombre": nombre_story, "elevacion": elevacion[0]}
-            list_stories_elevations.append(story_info)
-            # print(f" - Story: {nombre_story}, Elevacion: {elevacion[0]}")
-
-    except Exception as e:
-        print(f"Ocurrio un error inesperado: {e}")
-
-    return list_stories_elevations
-
-def clasificar_punto_por_elevacion(lista_niveles, elevacion_punto):
-    # -- 1.Manejar la lista vacia
-    if not lista_niveles:
-        print('Advertencia: La lista de niveles esta vacia')
-        return None
-    
-    # -- 2.Ordenar los niveles por de forma ascendente --
-    # Esto es crucial para que la logica funcione correctamente
-    nivels_ordenados = sorted(lista_niveles, key=lambda item: item['elevacion'])
-    
-    # -- 3. Iterar de forma inversa (del nivel mas alto al nivel mas bajo)
-    for nivel_actual in reversed(nivels_ordenados):
-        # -- 4. Comprobar la condicion
-        # Si la elevacion del punto del punto es mayor o igual a la del nivel actual....
-        if elevacion_punto >= nivel_actual['elevacion']:
-            # ... hemos encontrado el nivel correcto.
-            # Como vamos de arriba hacia abajo, este es el primer (y por tanto, el correcto)
-            # nivel que cumple la condicion
-            return nivel_actual['nombre']
-        
-    # -- 5. Manejar caso en donde el punto esta por debajo de todos los niveles --
-    print(f"INFO: El punto con elevacion {elevacion_punto} esta por debajo del nivel mas bajo.")
-    return None
-
-
 # def get_rectangular_concrete_sections(SapModel):
 #     print("--Inicio Metodo get_rectangular_concrete_sections--")
 #     """
@@ -730,19 +828,21 @@ def clasificar_punto_por_elevacion(lista_niveles, elevacion_punto):
 #     print(f"\nSe encontraron y procesaron {len(sections_list)} secciones de columna de concreto rectangulares.")
 #     return sections_list
 
-def get_rectangular_concrete_sections(sapModel):
+def get_rectangular_concrete_sections(sapModel, cache=None):
     """
     Extrae las propiedades de las secciones de concreto rectangulares que se 
     UTILIZAN COMO COLUMNAS en el modelo de ETABS.
 
     Args:
         sapModel: El objeto COM de ETABS.
+        cache (ModelPropertyCache, opcional): Cache de la sesion de extraccion.
 
     Returns:
         list: Una lista de diccionarios, donde cada diccionario representa una
               sección de columna rectangular única.
     """
-    print("Iniciando la extracción de secciones de COLUMNAS rectangulares...")
+    logger.info("Iniciando la extracción de secciones de COLUMNAS rectangulares...")
+    cache = cache if cache is not None else ModelPropertyCache(sapModel)
 
     # --- 1. Identificar todas las secciones que se usan en elementos de columna ---
     column_section_names = set()  # Usar un 'set' para evitar duplicados
@@ -750,10 +850,10 @@ def get_rectangular_concrete_sections(sapModel):
     # Obtener la lista de todos los elementos frame en el modelo
     num_frames, frame_names, ret = sapModel.FrameObj.GetNameList()
     if ret != 0:
-        print("Error al obtener la lista de elementos frame.")
+        logger.error("Error al obtener la lista de elementos frame.")
         return []
 
-    print(f"Analizando {num_frames} elementos frame para identificar cuáles son columnas...")
+    logger.info(f"Analizando {num_frames} elementos frame para identificar cuáles son columnas...")
     for frame_name in frame_names:
         # Verificar la orientación de diseño del elemento
         design_orientation, ret_orient = sapModel.FrameObj.GetDesignOrientation(frame_name)
@@ -766,34 +866,34 @@ def get_rectangular_concrete_sections(sapModel):
                 column_section_names.add(section_name)
 
     if not column_section_names:
-        print("No se encontraron secciones asignadas a elementos de tipo columna en el modelo.")
+        logger.warning("No se encontraron secciones asignadas a elementos de tipo columna en el modelo.")
         return []
 
-    print(f"\nSe identificaron {len(column_section_names)} secciones únicas de columna: {list(column_section_names)}")
+    logger.info(f"Se identificaron {len(column_section_names)} secciones únicas de columna: {list(column_section_names)}")
 
     # --- 2. Extraer las propiedades para las secciones de columna identificadas ---
     all_sections = []
-    print("\nExtrayendo detalles de las secciones de columna...")
+    logger.info("Extrayendo detalles de las secciones de columna...")
 
     for section_name in sorted(list(column_section_names)): # Iterar sobre la lista única y ordenada
         
         # Obtener dimensiones (esto también nos confirma que es rectangular)
-        _, mat_prop_conc, t3, t2, _, _, _, ret_rect = sapModel.PropFrame.GetRectangle(section_name)
+        _, mat_prop_conc, t3, t2, _, _, _, ret_rect = cache.get_rectangle(section_name)
         if ret_rect != 0:
             # Si la sección de columna no es rectangular, la omitimos
-            print(f"  - Adv: La sección de columna '{section_name}' no es rectangular. Omitiendo.")
+            logger.warning(f"La sección de columna '{section_name}' no es rectangular. Omitiendo.")
             continue
 
         # Obtener datos de refuerzo (esto nos confirma que tiene refuerzo de columna)
-        mat_prop_rebar, _, _, _, cover, _, num_r3, num_r2, rebar_size, tie_size, _, num_2d_tie, num_3d_tie, _, ret_rebar = sapModel.PropFrame.GetRebarColumn(section_name)
+        mat_prop_rebar, _, _, _, cover, _, num_r3, num_r2, rebar_size, tie_size, _, num_2d_tie, num_3d_tie, _, ret_rebar = cache.get_rebar_column(section_name)
         if ret_rebar != 0:
             # Si no tiene refuerzo de columna definido, la omitimos
-            print(f"  - Adv: La sección de columna '{section_name}' no tiene refuerzo de columna definido. Omitiendo.")
+            logger.warning(f"La sección de columna '{section_name}' no tiene refuerzo de columna definido. Omitiendo.")
             continue
 
         # Obtener propiedades de materiales
-        fc_value = get_fc_concrete(sapModel, mat_prop_conc)
-        fy_value = get_fy_steel(sapModel, mat_prop_rebar)
+        fc_value = get_fc_concrete(sapModel, mat_prop_conc, cache)
+        fy_value = get_fy_steel(sapModel, mat_prop_rebar, cache)
         
         section_dict = {
             "section": section_name,
@@ -810,9 +910,9 @@ def get_rectangular_concrete_sections(sapModel):
             "num_crossties_3": num_3d_tie
         }
         all_sections.append(section_dict)
-        print(f"  + Procesada sección de columna: '{section_name}'")
+        logger.debug(f"Procesada sección de columna: '{section_name}'")
         
-    print("\nProceso finalizado.")
+    logger.info("Proceso finalizado.")
     return all_sections
 
 # def get_rectangular_concrete_sections(sapModel):
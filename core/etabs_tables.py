@@ -0,0 +1,293 @@
+import numpy as np
+import pandas as pd
+
+from core.column_processing import build_cols_and_gridlines
+from core.log import get_logger
+from core.stories import StoryIndex
+from core.units import model_units
+
+logger = get_logger(__name__)
+
+# -- Tablas de la base de datos de ETABS usadas por la extraccion masiva
+TABLE_FRAME_SECTIONS = "Frame Assignments - Sections"
+TABLE_COLUMN_CONNECTIVITY = "Column Object Connectivity"
+TABLE_POINT_CONNECTIVITY = "Point Object Connectivity"
+TABLE_RECT_SECTIONS = "Frame Section Property Definitions - Concrete Rectangular"
+TABLE_COLUMN_REBAR = "Frame Section Property Definitions - Concrete Column Reinforcing"
+TABLE_CONCRETE_DATA = "Material Properties - Concrete Data"
+TABLE_GRID_LINES = "Grid Definitions - Grid Lines"
+
+# -- Campos que se leen de cada tabla: {campo en ETABS: clave interna}
+# Las claves internas son las mismas que usa etabs.get_story_lable_col_name
+FRAME_SECTION_FIELDS = {
+    "UniqueName": "col_id",
+    "Label": "label",
+    "Story": "story",
+    "Section": "section",
+}
+COLUMN_CONNECTIVITY_FIELDS = {
+    "UniqueName": "col_id",
+    "UniquePtI": "point_i",
+    "UniquePtJ": "point_j",
+}
+POINT_FIELDS = {
+    "UniqueName": "point",
+    "X": "x",
+    "Y": "y",
+    "Z": "z",
+}
+RECT_SECTION_FIELDS = {
+    "Name": "section",
+    "Material": "material",
+    "Depth": "t3",
+    "Width": "t2",
+}
+# Igual que en get_story_lable_col_name, "r2_bars" guarda las barras en la
+# direccion 3 (NumberR3Bars) y "r3_bars" las de la direccion 2.
+COLUMN_REBAR_FIELDS = {
+    "Name": "section",
+    "MatLong": "Long. Rebar Mat.",
+    "MatConfine": "Mat. Estribo",
+    "Cover": "cover",
+    "NumBars3Dir": "r2_bars",
+    "NumBars2Dir": "r3_bars",
+    "BarSizeLong": "Rebar",
+    "BarSizeConfine": "Est. Rebar",
+    "NumTies2Dir": "estribo_r2",
+    "NumTies3Dir": "estribo_r3",
+}
+CONCRETE_FIELDS = {
+    "Material": "material",
+    "Fc": "fc",
+}
+GRID_LINE_FIELDS = {
+    "LineType": "direction",
+    "ID": "label",
+    "Ordinate": "coordinate",
+}
+
+TABLES_FOR_COLUMNS = {
+    TABLE_FRAME_SECTIONS: FRAME_SECTION_FIELDS,
+    TABLE_COLUMN_CONNECTIVITY: COLUMN_CONNECTIVITY_FIELDS,
+    TABLE_POINT_CONNECTIVITY: POINT_FIELDS,
+    TABLE_RECT_SECTIONS: RECT_SECTION_FIELDS,
+    TABLE_COLUMN_REBAR: COLUMN_REBAR_FIELDS,
+    TABLE_CONCRETE_DATA: CONCRETE_FIELDS,
+}
+
+
+def get_table(sap_model, table_key):
+    """
+    Lee una tabla completa de la base de datos de ETABS con una sola llamada
+    a DatabaseTables.GetTableForDisplayArray.
+
+    Args:
+        sap_model: El objeto SapModel activo de la API de ETABS.
+        table_key (str): El nombre de la tabla, por ejemplo "Point Object Connectivity".
+
+    Returns:
+        pd.DataFrame: Una fila por registro y una columna por campo (todos los
+        valores como texto), o None si la tabla no se pudo leer.
+    """
+    # Firma: GetTableForDisplayArray(TableKey, FieldKeyList, GroupName, TableVersion,
+    #                                FieldsKeysIncluded, NumberRecords, TableData)
+    # Un GroupName vacio devuelve los registros de todos los objetos.
+    field_key_list, table_version, fields_included, number_records, table_data, ret = (
+        sap_model.DatabaseTables.GetTableForDisplayArray(table_key, [], "", 0, [], 0, [])
+    )
+    if ret != 0:
+        logger.warning(f"No se pudo leer la tabla '{table_key}'. Código: {ret}")
+        return None
+
+    fields = list(fields_included)
+    if number_records == 0:
+        return pd.DataFrame(columns=fields)
+
+    # TableData es un arreglo plano, registro por registro
+    values = np.asarray(table_data, dtype=object).reshape(number_records, len(fields))
+    return pd.DataFrame(values, columns=fields)
+
+
+def _select_fields(df, table_key, fields):
+    missing = [field for field in fields if field not in df.columns]
+    if missing:
+        logger.warning(f"La tabla '{table_key}' no contiene los campos: {missing}")
+        return None
+    return df[list(fields)].rename(columns=fields)
+
+
+def read_column_tables(sap_model):
+    """
+    Lee todas las tablas necesarias para la extraccion de columnas.
+
+    Returns:
+        dict: {table_key: DataFrame con las claves internas}, o None si alguna
+        tabla o campo no esta disponible en esta version de ETABS.
+    """
+    tables = {}
+    for table_key, fields in TABLES_FOR_COLUMNS.items():
+        df = get_table(sap_model, table_key)
+        if df is None:
+            return None
+        df = _select_fields(df, table_key, fields)
+        if df is None:
+            return None
+        tables[table_key] = df
+    return tables
+
+
+def get_grid_lines(sap_model):
+    """
+    Lee los ejes de los sistemas de grillas cartesianos del modelo.
+
+    Returns:
+        list[dict]: Un eje por registro con las claves 'direction' ("X" o
+        "Y"), 'label' y 'coordinate', o [] si la tabla no esta disponible.
+    """
+    df = get_table(sap_model, TABLE_GRID_LINES)
+    if df is None:
+        return []
+    df = _select_fields(df, TABLE_GRID_LINES, GRID_LINE_FIELDS)
+    if df is None:
+        return []
+
+    # LineType es "X (Cartesian)" o "Y (Cartesian)"; los ejes de grillas
+    # cilindricas no tienen una coordenada x o y fija y se omiten
+    df["direction"] = df["direction"].astype(str).str.split(" ").str[0]
+    df["coordinate"] = _to_number(df["coordinate"])
+    df = df[df["direction"].isin(["X", "Y"]) & df["coordinate"].notna()]
+    return df.to_dict(orient="records")
+
+
+def _to_number(series):
+    return pd.to_numeric(series, errors="coerce")
+
+
+def _none_if_nan(value):
+    if value is None or (isinstance(value, float) and np.isnan(value)):
+        return None
+    return value
+
+
+def join_column_tables(tables):
+    """
+    Une las tablas de ETABS en un DataFrame con una fila por columna
+    rectangular de concreto.
+    """
+    frames = tables[TABLE_FRAME_SECTIONS]
+    connectivity = tables[TABLE_COLUMN_CONNECTIVITY]
+    points = tables[TABLE_POINT_CONNECTIVITY].drop_duplicates(subset=["point"])
+    rect_sections = tables[TABLE_RECT_SECTIONS].drop_duplicates(subset=["section"])
+    rebars = tables[TABLE_COLUMN_REBAR].drop_duplicates(subset=["section"])
+    concrete = tables[TABLE_CONCRETE_DATA].drop_duplicates(subset=["material"])
+
+    # Solo los frames con conectividad de columna (orientacion de diseño = columna)
+    df = frames.merge(connectivity, on="col_id", how="inner")
+    # Solo secciones rectangulares de concreto (GetTypeOAPI == 8)
+    df = df.merge(rect_sections, on="section", how="inner")
+    df = df.merge(concrete, on="material", how="left")
+    df = df.merge(rebars, on="section", how="left")
+
+    points_i = points.rename(columns={"point": "point_i", "x": "pos_x", "y": "pos_y", "z": "z_start"})
+    points_j = points[["point", "z"]].rename(columns={"point": "point_j", "z": "z_end"})
+    df = df.merge(points_i, on="point_i", how="left")
+    df = df.merge(points_j, on="point_j", how="left")
+
+    for column in ["t3", "t2", "pos_x", "pos_y", "z_start", "z_end"]:
+        df[column] = _to_number(df[column]).astype(float).round(2)
+    for column in ["fc", "cover", "r2_bars", "r3_bars", "estribo_r2", "estribo_r3"]:
+        df[column] = _to_number(df[column])
+    df["fc"] = df["fc"].round()
+
+    return df
+
+
+def get_story_lable_col_name_from_tables(sap_model):
+    """
+    Version masiva de etabs.get_story_lable_col_name: obtiene las columnas con
+    unas pocas lecturas de tablas de la base de datos en lugar de 15-20
+    llamadas COM por frame.
+
+    Args:
+        sap_model: El objeto SapModel activo de la API de ETABS.
+
+    Returns:
+        tuple: (cols_data, gridlines_data) con el mismo formato que
+        etabs.get_story_lable_col_name, o (None, None) si las tablas no estan
+        disponibles y hay que usar la extraccion frame por frame.
+    """
+    if sap_model is None:
+        logger.error("El objeto SapModel proporcionado no es válido.")
+        return [], None
+
+    tables = read_column_tables(sap_model)
+    if tables is None:
+        return None, None
+
+    story_index = StoryIndex.from_sap_model(sap_model)
+    df = join_column_tables(tables)
+
+    # Clasificacion por nivel de todos los extremos en una sola pasada
+    niveles_start = story_index.classify(df["z_start"])
+    niveles_end = story_index.classify(df["z_end"])
+    stories_start = story_index.match(df["z_start"])
+    stories_end = story_index.match(df["z_end"])
+
+    column_data = []
+    for i, row in enumerate(df.to_dict(orient="records")):
+        info = {}
+        info["col_id"] = row["col_id"]
+        info["label"] = row["label"]
+        info["story"] = row["story"]
+        info["section"] = row["section"]
+        info["material"] = row["material"]
+        fc = _none_if_nan(row["fc"])
+        info["fc"] = int(fc) if fc is not None else None
+        info["shape"] = "rectangular"
+        info["t3"] = row["t3"]
+        info["t2"] = row["t2"]
+
+        # Get bxh
+        b = min(info["t3"], info["t2"])
+        h = max(info["t3"], info["t2"])
+        info["depth"] = int(h)
+        info["width"] = int(b)
+        info["bxh"] = f"{int(b)}x{int(h)}"
+
+        info["pos_x"] = row["pos_x"]
+        info["pos_y"] = row["pos_y"]
+        info["z_start"] = row["z_start"]
+        info["z_end"] = row["z_end"]
+        nivel_start = niveles_start[i]
+        nivel_end = niveles_end[i]
+        info['nivel_start'] = nivel_start
+        info['nivel_end'] = nivel_end
+        # Stories
+        info["story_start"] = stories_start[i]
+        info["story_end"] = stories_end[i]
+        info["start_end_level"] = f"{nivel_start}@{nivel_end}"
+        # Rebar Data
+        info["Long. Rebar Mat."] = _none_if_nan(row["Long. Rebar Mat."])
+        info["Mat. Estribo"] = _none_if_nan(row["Mat. Estribo"])
+        info["Rebar"] = _none_if_nan(row["Rebar"])
+        r2_bars = _none_if_nan(row["r2_bars"])
+        r3_bars = _none_if_nan(row["r3_bars"])
+        info["r2_bars"] = int(r2_bars) if r2_bars is not None else None
+        info["r3_bars"] = int(r3_bars) if r3_bars is not None else None
+        info["number_bars"] = None
+        if info["r2_bars"]:
+            if info["r3_bars"]:
+                info["number_bars"] = (2 * info["r2_bars"]) + (2 * (info["r3_bars"] - 2))
+
+        info["Est. Rebar"] = _none_if_nan(row["Est. Rebar"])
+        estribo_r2 = _none_if_nan(row["estribo_r2"])
+        estribo_r3 = _none_if_nan(row["estribo_r3"])
+        info["estribo_r2"] = int(estribo_r2) if estribo_r2 is not None else None
+        info["estribo_r3"] = int(estribo_r3) if estribo_r3 is not None else None
+        info["cover"] = _none_if_nan(row["cover"])
+        info["As"] = f"{info['number_bars']} {info['Rebar']}"
+
+        column_data.append(info)
+
+    logger.info(f"Extraccion por tablas: {len(column_data)} columnas encontradas.")
+    return build_cols_and_gridlines(column_data, get_grid_lines(sap_model), model_units(sap_model))
@@ -1,12 +1,23 @@
 from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.styles import Alignment, Font, Border, Side
+from openpyxl.worksheet.cell_range import CellRange
 import math
 from pathlib import Path
 import os
 import json
+import re
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
 import pandas as pd
 from collections import defaultdict
 
+from core.column_table import ColumnTable
+from core.log import get_logger
+from core.units import MODEL_UNITS
+
+logger = get_logger(__name__)
+
 # --- Constantes y Estilos de Borde (sin cambios) ---
 REBAR_PROPERTIES_MM = [
     {'type': '#3', 'diameter': 9.525}, {'type': '#4', 'diameter': 12.7},
@@ -15,11 +26,32 @@ REBAR_PROPERTIES_MM = [
     {'type': '#9', 'diameter': 28.65}, {'type': '#10', 'diameter': 32.26},
     {'type': '#11', 'diameter': 35.81}, {'type': '#14', 'diameter': 43.00},
 ]
+# Diametro (mm) por barra, para no recorrer REBAR_PROPERTIES_MM en cada celda
+REBAR_DIAMETERS_MM = {bar['type']: bar['diameter'] for bar in REBAR_PROPERTIES_MM}
 HEADER_BORDER = Border(top=Side(style='thin'), bottom=Side(style='thin'))
 TOP_BORDER = Border(top=Side(style='thin'))
 BOTTOM_BORDER = Border(bottom=Side(style='thin'))
 thin_side = Side(border_style="thin", color="000000")
 DIAGONAL_BORDER = Border(top=Side(style='thin'), bottom=Side(style='thin'), diagonalUp=True, diagonalDown=True, diagonal=thin_side)
+# Textos de las 9 filas de cada nivel del cuadro
+LEVEL_ROW_LABELS = ("b x h", "f'c", "As", "Est. en Lo", "Est. en Resto", "Estribo Externo",
+                    "Estribos Interno", "Lo", "Detalle")
+# Motores de generate_excel_table
+EXCEL_ENGINES = ("streaming", "workbook")
+DEFAULT_EXCEL_ENGINE = "streaming"
+# Modos de generate_partitioned_excel: una hoja por particion en un solo
+# libro, o un libro por particion
+PARTITION_MODES = ("sheets", "workbooks")
+# Registros de columnas por proceso de generate_partitioned_excel: abrir el
+# pool y enviar los registros cuesta mas que armar en serie los cuadros de
+# pocas columnas
+MIN_RECORDS_PER_PROCESS = 10000
+# Nombre de la particion de los registros sin valor en la clave
+SIN_GRUPO = "Sin grupo"
+# fy de las barras longitudinales (MPa) y hx (mm) del espaciamiento de
+# estribos en la zona de confinamiento
+FY_LONGITUDINAL_MPA = 420
+HX_MM = 300
 MAX_DISTANCIA_LIBRE_A_BARRA_APOYADA_MM = 150
 MAX_DISTANCIA_LIBRE_A_BARRA_APOYADA_PULGADAS = 6.0
 
@@ -51,10 +83,7 @@ def agrupar_gridlines_por_contenido(datos):
     return resultado_final
 
 def get_diameter(rebar):
-    for bar in REBAR_PROPERTIES_MM:
-        if bar['type'] == rebar:
-            return bar['diameter']
-    return 0
+    return REBAR_DIAMETERS_MM.get(rebar, 0)
 
 def calcular_max_espaciamiento_apoyo_lateral_cols(diametro_barra_longitudinal, unidades="mm"):
     if unidades.lower() not in ["mm", "pulgadas"]: return None
@@ -100,6 +129,154 @@ def calcular_lo_aci_318_19(mayor_dimension_section_col, luz_col, unidades="mm"):
     criterio_3 = 450.0 if unidades.lower() == "mm" else 18.0
     return max(criterio_1, criterio_2, criterio_3)
 
+def _agregar_dimensiones_mm(column_records, units=MODEL_UNITS):
+    """
+    Agrega a la tabla depth_mm, width_mm y h_floor_mm (altura entre
+    'Start Z' y 'End Z'), convertidas a mm una vez por columna completa
+    desde las unidades de la tabla (o units si no las indica).
+    """
+    table = column_records if column_records.units else column_records.with_units(units)
+    dimensions = {}
+    if 'depth' in table and 'width' in table:
+        dimensions['depth_mm'] = table.column_in('depth', 'mm')
+        dimensions['width_mm'] = table.column_in('width', 'mm')
+    if 'Start Z' in table and 'End Z' in table:
+        dimensions['h_floor_mm'] = table.column_in('End Z', 'mm') - table.column_in('Start Z', 'mm')
+    return table.assign(dimensions) if dimensions else table
+
+def _dimensiones_mm(record):
+    dimensions = (record['depth_mm'], record['width_mm'], record['h_floor_mm'])
+    if not all(math.isfinite(value) for value in dimensions):
+        raise ValueError("Dimensiones no numericas")
+    return dimensions
+
+def confinamiento_vectorizado(depth_mm, width_mm, h_floor_mm, rebar_diameter_mm,
+                              fy_mpa=FY_LONGITUDINAL_MPA, hx_mm=HX_MM):
+    """
+    Version de NumPy de calcular_lo_aci_318_19 y
+    calcular_espaciamiento_estribos_confinamiento_columnas_aci_318_19 (en mm
+    y MPa) para arreglos completos de columnas.
+
+    Returns:
+        tuple: (lo_mm, espaciamiento_mm), arreglos con el mismo largo que
+        las entradas.
+    """
+    depth_mm = np.asarray(depth_mm, dtype=float)
+    width_mm = np.asarray(width_mm, dtype=float)
+    h_floor_mm = np.asarray(h_floor_mm, dtype=float)
+    rebar_diameter_mm = np.asarray(rebar_diameter_mm, dtype=float)
+
+    lo_mm = np.maximum(np.maximum(np.maximum(depth_mm, width_mm), h_floor_mm / 6), 450.0)
+
+    s_a = np.minimum(depth_mm, width_mm) / 4.0
+    s_b = (5.0 if fy_mpa >= 550.0 else 6.0) * rebar_diameter_mm
+    s_c = min(max(100.0 + (350.0 - hx_mm) / 3.0, 100.0), 150.0)
+    espaciamiento_mm = np.minimum(np.minimum(s_a, s_b), s_c)
+    return lo_mm, espaciamiento_mm
+
+class ConfinementCache:
+    """
+    Lo y espaciamiento de estribos de la zona de confinamiento (ACI 318-19)
+    calculados una sola vez por combinacion de seccion (bxh), barra
+    longitudinal, altura de piso y fy, y compartidos por el agrupamiento de
+    niveles y la escritura de las celdas.
+
+    precompute() calcula de una vez todas las combinaciones de una tabla con
+    confinamiento_vectorizado; get() calcula con las funciones escalares las
+    que falten.
+    """
+    def __init__(self, fy_mpa=FY_LONGITUDINAL_MPA, hx_mm=HX_MM):
+        self.fy_mpa = fy_mpa
+        self.hx_mm = hx_mm
+        self._results = {}
+        self.hits = 0
+        self.misses = 0
+
+    def _key(self, depth_mm, width_mm, h_floor_mm, rebar):
+        # Lo depende de la mayor dimension y el espaciamiento de la menor
+        return (min(depth_mm, width_mm), max(depth_mm, width_mm), h_floor_mm, rebar, self.fy_mpa)
+
+    def get(self, record):
+        """
+        Returns:
+            tuple: (lo_mm, espaciamiento_mm) de la columna del registro.
+        """
+        rebar = record['Rebar']
+        depth_mm, width_mm, h_floor_mm = _dimensiones_mm(record)
+        key = self._key(depth_mm, width_mm, h_floor_mm, rebar)
+        result = self._results.get(key)
+        if result is not None:
+            self.hits += 1
+            return result
+        self.misses += 1
+        lo_mm = calcular_lo_aci_318_19(max(depth_mm, width_mm), h_floor_mm, "mm")
+        espaciamiento_mm = calcular_espaciamiento_estribos_confinamiento_columnas_aci_318_19(
+            min(depth_mm, width_mm), get_diameter(rebar), self.fy_mpa, self.hx_mm, unidades="mm", fy_units="MPa")[0]
+        result = (lo_mm, espaciamiento_mm)
+        self._results[key] = result
+        return result
+
+    def precompute(self, column_records):
+        """
+        Calcula con confinamiento_vectorizado las combinaciones distintas de
+        una tabla con depth_mm, width_mm, h_floor_mm y Rebar (ver
+        _agregar_dimensiones_mm).
+        """
+        if not column_records or any(key not in column_records for key in ('depth_mm', 'width_mm', 'h_floor_mm', 'Rebar')):
+            return
+        df = pd.DataFrame({
+            'a': np.minimum(column_records['depth_mm'], column_records['width_mm']),
+            'b': np.maximum(column_records['depth_mm'], column_records['width_mm']),
+            'h': column_records['h_floor_mm'],
+            'rebar': np.asarray(column_records['Rebar'], dtype=object),
+        })
+        df = df[np.isfinite(df[['a', 'b', 'h']]).all(axis=1)].drop_duplicates()
+        if df.empty:
+            return
+        diameters = df['rebar'].map(REBAR_DIAMETERS_MM).fillna(0).to_numpy(dtype=float)
+        lo_mm, espaciamiento_mm = confinamiento_vectorizado(
+            df['b'].to_numpy(), df['a'].to_numpy(), df['h'].to_numpy(), diameters, self.fy_mpa, self.hx_mm
+        )
+        for a, b, h, rebar, lo, espaciamiento in zip(df['a'], df['b'], df['h'], df['rebar'], lo_mm, espaciamiento_mm):
+            self._results.setdefault((a, b, h, rebar, self.fy_mpa), (float(lo), float(espaciamiento)))
+
+    def report(self):
+        """Escribe en el log las combinaciones calculadas y las consultas reutilizadas."""
+        total = self.hits + self.misses
+        rate = self.hits / total if total else 0.0
+        logger.info(
+            f"Confinamiento ACI 318-19: {len(self._results)} combinaciones distintas, "
+            f"{self.hits}/{total} consultas resueltas desde el cache ({rate:.0%})."
+        )
+        return {'combinations': len(self._results), 'hits': self.hits, 'misses': self.misses, 'hit_rate': rate}
+
+def _valores_columna(record, confinamiento=None):
+    """
+    Valores de las 9 filas de un nivel para la columna de un GridLine,
+    {desplazamiento de fila: valor}. Lo y el espaciamiento de estribos en
+    cm, o "Error" si no se pueden calcular.
+    """
+    confinamiento = confinamiento if confinamiento is not None else ConfinementCache()
+    valores = {
+        0: record['bxh'],
+        1: record['fc'],
+        2: record['As'],
+        5: record['Rebar. Est.'],
+        6: record['Rebar. Est.'],
+        8: record['Detalle No.'],
+    }
+    try:
+        lo_mm, espaciamiento_mm = confinamiento.get(record)
+        valores[7] = round(lo_mm / 10)
+        valores[3] = round(espaciamiento_mm/10)
+    except (ValueError, TypeError, KeyError):
+        valores[7] = "Error"
+        valores[3] = "Error"
+    return valores
+
+def _encabezado_grupo(grid_names):
+    return ", ".join(str(name) for name in sorted(grid_names))
+
 def get_excel_row(row_data, value):
     for item in row_data:
         if item['level'] == value: return item['row']
@@ -110,6 +287,23 @@ def get_excel_col(col_data, value):
         if item['gridline'] == value: return item['excel_col']
     return None
 
+def build_row_index(row_data):
+    """
+    Indice {nivel: fila de Excel} de row_data, para reemplazar
+    get_excel_row (que recorre la lista) en los ciclos por registro.
+    """
+    index = {}
+    for item in row_data:
+        index.setdefault(item['level'], item['row'])
+    return index
+
+def build_col_index(col_data):
+    """Indice {GridLine: columna de Excel} de col_data (ver get_excel_col)."""
+    index = {}
+    for item in col_data:
+        index.setdefault(item['gridline'], item['excel_col'])
+    return index
+
 def detectar_bxh_empty(work_sheet, stories_reverse, grid_lines):
     for group in stories_reverse:
         row = group['row']
@@ -122,15 +316,16 @@ def detectar_bxh_empty(work_sheet, stories_reverse, grid_lines):
             counter_col += 1
 
 # --- NUEVA FUNCIÓN DE AGRUPAMIENTO DE NIVELES (sin cambios) ---
-def _agrupar_niveles_consecutivos_iguales(stories_data, column_records, grid_lines_data):
+def _agrupar_niveles_consecutivos_iguales(stories_data, column_records, grid_lines_data, confinamiento=None):
     if not stories_data or not column_records:
         return []
+    confinamiento = confinamiento if confinamiento is not None else ConfinementCache()
 
     data_matrix = defaultdict(dict)
     for record in column_records:
         data_matrix[record['start_end_level']][record['GridLine']] = record
     
-    grid_lines = [g['ID'] for g in grid_lines_data]
+    grid_lines = sorted(g['ID'] for g in grid_lines_data)
     memoized_signatures = {}
 
     def create_level_signature(level_name):
@@ -138,18 +333,14 @@ def _agrupar_niveles_consecutivos_iguales(stories_data, column_records, grid_lin
             return memoized_signatures[level_name]
 
         signature = []
-        for grid in sorted(grid_lines):
-            record = data_matrix.get(level_name, {}).get(grid)
+        level_records = data_matrix.get(level_name, {})
+        for grid in grid_lines:
+            record = level_records.get(grid)
             if record:
                 try:
-                    rebar_diameter_mm = get_diameter(record['Rebar'])
-                    depth_mm = float(record['depth']) * 10
-                    width_mm = float(record['width']) * 10
-                    h_floor_mm = (float(record['End Z']) - float(record['Start Z'])) * 1000
-
-                    lo_val = round(calcular_lo_aci_318_19(max(depth_mm, width_mm), h_floor_mm, "mm") / 10,0)
-                    espaciamiento_val = round(calcular_espaciamiento_estribos_confinamiento_columnas_aci_318_19(
-                        min(depth_mm, width_mm), rebar_diameter_mm, 420, 300, unidades="mm", fy_units="MPa")[0])
+                    lo_mm, espaciamiento_mm = confinamiento.get(record)
+                    lo_val = round(lo_mm / 10,0)
+                    espaciamiento_val = round(espaciamiento_mm)
 
                     signature.append((
                         grid, record.get('bxh'), record.get('fc'), record.get('As'),
@@ -206,78 +397,73 @@ def _agrupar_niveles_consecutivos_iguales(stories_data, column_records, grid_lin
     
     return grouped_level_info
 
-# --- INICIO: NUEVA FUNCIÓN PARA AGRUPAR GRIDLINES IDÉNTICOS ---
-def _group_identical_gridlines(ws, gridline_columns, col_rows):
+def _agrupar_gridlines_por_datos(grid_lines, levels, data_matrix, confinamiento=None):
     """
-    Agrupa columnas de GridLine idénticas en la hoja de cálculo de Excel.
-
-    Compara el contenido de cada columna de GridLine. Si dos o más columnas son
-    idénticas, las fusiona en una, actualiza el encabezado para incluir todos
-    los nombres de GridLine agrupados y elimina las columnas duplicadas.
+    Agrupa los GridLine con el mismo contenido en todos los niveles a partir
+    de los registros (data_matrix), antes de escribir la hoja: la firma de
+    cada GridLine son los valores de sus celdas en cada nivel
+    (_valores_columna), que se calculan una sola vez y se reutilizan al
+    escribir. Sin niveles no se agrupa.
 
     Args:
-        ws: El objeto de la hoja de trabajo de openpyxl.
-        gridline_columns (list): Lista de diccionarios que mapean GridLine a su columna en Excel.
-        col_rows (list): Lista de diccionarios que definen las filas para cada nivel.
+        grid_lines (list): GridLine en el orden de las columnas.
+        levels (list[dict]): Niveles de _agrupar_niveles_consecutivos_iguales.
+        data_matrix (dict): {start_end_level: {GridLine: registro}}.
+        confinamiento (ConfinementCache, opcional): Cache de Lo y
+            espaciamiento de estribos compartido con el agrupamiento de
+            niveles.
 
     Returns:
-        list: Una nueva lista de los nombres de GridLine (encabezados) que
-              permanecen en la hoja de cálculo después del agrupamiento, para
-              ser usada por funciones posteriores.
+        list[dict]: Una entrada por columna de la hoja, en el orden del
+        primer GridLine de cada grupo: 'header' (el GridLine, o los del
+        grupo separados por coma), 'gridlines' y 'values' (por nivel, el
+        diccionario de _valores_columna o None si no hay columna).
     """
-    if not gridline_columns or not col_rows:
-        return []
-
-    # Determinar el rango de filas a comparar para cada columna
-    start_row = col_rows[0]['row']
-    # Cada grupo de nivel tiene 9 filas
-    last_level_rows = 9
-    end_row = col_rows[-1]['row'] + last_level_rows - 1
-
-    # Recopilar la "firma" (contenido) de cada columna
-    column_signatures = defaultdict(list)
-    for grid_info in gridline_columns:
-        col_idx = grid_info['excel_col']
-        # Extraer todos los valores de la columna en el rango de datos
-        values = [ws.cell(row=row_idx, column=col_idx).value for row_idx in range(start_row, end_row + 1)]
-        signature = tuple(values)
-        column_signatures[signature].append(grid_info)
-
-    cols_to_delete = []
-    # Identificar grupos de columnas idénticas y planificar la fusión
-    for signature, group in column_signatures.items():
-        if len(group) > 1:
-            # Ordenar el grupo por el número de columna original para mantener la primera
-            group.sort(key=lambda x: x['excel_col'])
-            
-            # La primera columna del grupo se conserva y su encabezado se actualiza
-            col_to_keep = group[0]
-            grouped_names = sorted([item['gridline'] for item in group])
-            new_header = ", ".join(grouped_names)
-            ws.cell(row=1, column=col_to_keep['excel_col']).value = new_header
-            
-            # Las otras columnas del grupo se marcan para eliminación
-            for col_info in group[1:]:
-                cols_to_delete.append(col_info['excel_col'])
-
-    # Eliminar las columnas duplicadas, de derecha a izquierda para evitar errores de índice
-    for col_idx in sorted(cols_to_delete, reverse=True):
-        ws.delete_cols(col_idx, 1)
-
-    # Crear una nueva lista de gridlines actualizada para la siguiente función
-    final_grid_lines = []
-    # El número de columnas de GridLine se ha reducido
-    num_final_cols = len(gridline_columns) - len(cols_to_delete)
-    for i in range(num_final_cols):
-        # Leer el encabezado de la columna que ahora está en la posición 3 + i
-        header_val = ws.cell(row=1, column=3 + i).value
-        final_grid_lines.append(header_val)
-        
-    return final_grid_lines
-# --- FIN: NUEVA FUNCIÓN ---
+    groups = {}
+    for grid_id in grid_lines:
+        values = []
+        for level in levels:
+            record = data_matrix.get(level['data_source_level'], {}).get(grid_id)
+            values.append(_valores_columna(record, confinamiento) if record else None)
+        signature = tuple(
+            tuple(sorted(level_values.items())) if level_values is not None else None
+            for level_values in values
+        ) if levels else (grid_id,)
+        group = groups.get(signature)
+        if group is None:
+            groups[signature] = {'gridlines': [grid_id], 'values': values}
+        else:
+            group['gridlines'].append(grid_id)
+
+    columns = []
+    for group in groups.values():
+        grids = group['gridlines']
+        header = f"{grids[0]}" if len(grids) == 1 else _encabezado_grupo(grids)
+        columns.append({'header': header, 'gridlines': grids, 'values': group['values']})
+    return columns
+
+
+def _preparar_registros(column_records, units=MODEL_UNITS):
+    """
+    Registros que van al cuadro: las columnas que cambian de nivel, con sus
+    dimensiones en mm.
+    """
+    # column_records: ColumnTable o lista de diccionarios
+    column_records = ColumnTable.from_records(column_records)
+    if column_records:
+        niveles_distintos = np.asarray(column_records['nivel start'], dtype=object) != np.asarray(column_records['nivel end'], dtype=object)
+        columns_records_reduced = column_records.select(niveles_distintos)
+    else:
+        columns_records_reduced = column_records
+    # Longitudes de la tabla (units, kgf-cm por defecto) a mm para Lo y
+    # el espaciamiento de estribos
+    return _agregar_dimensiones_mm(columns_records_reduced, units)
 
-# --- FUNCIÓN PRINCIPAL MODIFICADA ---
-def generate_excel_table(folder_path, stories_data, grid_lines_data, column_records: list[dict]):
+def _crear_libro_celda_por_celda(stories_data, grid_lines_data, columns_records_reduced, confinamiento=None):
+    """
+    Motor "workbook": arma la hoja celda por celda en un libro normal de
+    openpyxl.
+    """
     grid_lines = [x['ID'] for x in grid_lines_data]
     wb = Workbook()
     ws = wb.active
@@ -288,10 +474,8 @@ def generate_excel_table(folder_path, stories_data, grid_lines_data, column_reco
     ws.column_dimensions['A'].width = 25
     ws.column_dimensions['B'].width = 25
 
-    columns_records_reduced = [rec for rec in column_records if rec['nivel start'] != rec['nivel end']]
-    
     # 1. Agrupar niveles antes de generar las filas de Excel
-    grouped_levels = _agrupar_niveles_consecutivos_iguales(stories_data, columns_records_reduced, grid_lines_data)
+    grouped_levels = _agrupar_niveles_consecutivos_iguales(stories_data, columns_records_reduced, grid_lines_data, confinamiento)
 
     col_rows = []
     current_excel_row = 2
@@ -315,71 +499,302 @@ def generate_excel_table(folder_path, stories_data, grid_lines_data, column_reco
         if i == len(grouped_levels) - 1:
             ws.cell(row=current_excel_row + 8, column=1).border = BOTTOM_BORDER
             ws.cell(row=current_excel_row + 8, column=2).border = BOTTOM_BORDER
-            for k in range(len(grid_lines)):
-                ws.cell(row=current_excel_row + 8, column=3 + k).border = BOTTOM_BORDER
         
         current_excel_row += 9
 
-    gridline_columns = []
-    counter_col = 0
-    for x in grid_lines:
-        ws.cell(row=1, column=3 + counter_col).value = f"{x}"
-        ws.cell(row=1, column=3 + counter_col).border = TOP_BORDER
-        for group in col_rows:
-            ws.cell(row=group['row'], column=3 + counter_col).border = TOP_BORDER
-        gridline_columns.append({'gridline': x, 'excel_col': 3 + counter_col})
-        counter_col += 1
-    
-    # 2. Modificar el bucle de llenado de datos
+    # 2. GridLine iguales agrupados desde los datos: solo se escribe una
+    # columna por grupo
     data_matrix = defaultdict(dict)
     for rec in columns_records_reduced:
         data_matrix[rec['start_end_level']][rec['GridLine']] = rec
+    columns = _agrupar_gridlines_por_datos(grid_lines, grouped_levels, data_matrix, confinamiento)
+
+    for j, column in enumerate(columns):
+        excel_column = 3 + j
+        ws.cell(row=1, column=excel_column).value = column['header']
+        ws.cell(row=1, column=excel_column).border = TOP_BORDER
+        for group_info, level_values in zip(col_rows, column['values']):
+            excel_row_start = group_info['row']
+            ws.cell(row=excel_row_start, column=excel_column).border = TOP_BORDER
+            if level_values:
+                for offset, value in level_values.items():
+                    ws.cell(row=excel_row_start + offset, column=excel_column).value = value
+        if col_rows:
+            ws.cell(row=col_rows[-1]['row'] + 8, column=excel_column).border = BOTTOM_BORDER
+
+    detectar_bxh_empty(ws, col_rows, [column['header'] for column in columns])
+    return wb
+
+def build_cuadro_layout(stories_data, grid_lines_data, column_records, units=MODEL_UNITS, confinamiento=None):
+    """
+    Fase 1 del motor "streaming": resuelve en memoria la hoja final, con los
+    niveles agrupados, los GridLine iguales agrupados en una sola columna y
+    las celdas vacias que se combinan, sin tocar openpyxl.
+
+    Returns:
+        dict: 'levels' (lista de {'level', 'data_source_level'}), 'columns'
+        (lista de {'header', 'values'}, con 9 valores por nivel) y 'empty'
+        (conjunto de (indice de nivel, indice de columna) sin columna, que
+        se combinan y se tachan).
+    """
+    return _layout_registros_preparados(
+        stories_data, grid_lines_data, _preparar_registros(column_records, units), confinamiento
+    )
+
+def _layout_registros_preparados(stories_data, grid_lines_data, columns_records_reduced, confinamiento=None):
+    """build_cuadro_layout con registros que ya pasaron por _preparar_registros."""
+    grid_lines = [x['ID'] for x in grid_lines_data]
+    levels = _agrupar_niveles_consecutivos_iguales(stories_data, columns_records_reduced, grid_lines_data, confinamiento)
+
+    data_matrix = defaultdict(dict)
+    for rec in columns_records_reduced:
+        data_matrix[rec['start_end_level']][rec['GridLine']] = rec
+
+    columns = []
+    for column in _agrupar_gridlines_por_datos(grid_lines, levels, data_matrix, confinamiento):
+        # Los 9 valores de cada nivel seguidos
+        values = [None] * (9 * len(levels))
+        for i, level_values in enumerate(column['values']):
+            for offset, value in (level_values or {}).items():
+                values[9 * i + offset] = value
+        columns.append({'header': column['header'], 'values': values})
+
+    empty = {
+        (i, j)
+        for j, column in enumerate(columns)
+        for i in range(len(levels))
+        if column['values'][9 * i] is None
+    }
+    return {'levels': levels, 'columns': columns, 'empty': empty}
+
+def _crear_libro_streaming(layout):
+    """
+    Fase 2 del motor "streaming": escribe la hoja de build_cuadro_layout en
+    una sola pasada, fila por fila, en un libro write_only de openpyxl (sin
+    guardar las celdas en memoria ni releerlas).
+    """
+    wb = Workbook(write_only=True)
+    _escribir_hoja_streaming(wb.create_sheet(), layout)
+    return wb
+
+def _escribir_hoja_streaming(ws, layout):
+    """Escribe el layout en una hoja write_only vacia (ver _crear_libro_streaming)."""
+    ws.column_dimensions['A'].width = 25
+    ws.column_dimensions['B'].width = 25
+
+    def celda(value, border, alignment=None):
+        cell = WriteOnlyCell(ws, value=value)
+        cell.border = border
+        if alignment is not None:
+            cell.alignment = alignment
+        return cell
+
+    alinea_centrada = Alignment(horizontal='center')
+    columns = layout['columns']
+    levels = layout['levels']
+    empty = layout['empty']
+    ws.append(
+        [celda("NIVEL", HEADER_BORDER, alinea_centrada), celda("DESCRIPCION", HEADER_BORDER, alinea_centrada)]
+        + [celda(column['header'], TOP_BORDER) for column in columns]
+    )
+
+    for i, level in enumerate(levels):
+        last = i == len(levels) - 1
+        for offset in range(9):
+            if offset == 0:
+                border = TOP_BORDER
+            elif offset == 8 and last:
+                border = BOTTOM_BORDER
+            else:
+                border = None
+            level_name = level['level'] if offset == 0 else None
+            row = [
+                celda(level_name, border) if border else level_name,
+                celda(LEVEL_ROW_LABELS[offset], border) if border else LEVEL_ROW_LABELS[offset],
+            ]
+            for j, column in enumerate(columns):
+                if (i, j) in empty:
+                    # Celdas combinadas: solo la primera, tachada
+                    row.append(celda(None, DIAGONAL_BORDER) if offset == 0 else None)
+                    continue
+                value = column['values'][9 * i + offset]
+                row.append(celda(value, border) if border else value)
+            ws.append(row)
+
+    for i, j in sorted(empty):
+        start_row = 2 + 9 * i
+        ws.merged_cells.add(CellRange(min_col=3 + j, min_row=start_row, max_col=3 + j, max_row=start_row + 8))
+
+# --- FUNCIÓN PRINCIPAL MODIFICADA ---
+def generate_excel_table(folder_path, stories_data, grid_lines_data, column_records, units=MODEL_UNITS,
+                         engine=DEFAULT_EXCEL_ENGINE):
+    """
+    Escribe el cuadro de columnas en folder_path/cuadro_columnas.xlsx.
+
+    Args:
+        engine (str): "streaming" (build_cuadro_layout y una sola pasada
+            write_only) o "workbook" (celda por celda en un libro normal).
+            Los dos generan la misma hoja.
+    """
+    if engine not in EXCEL_ENGINES:
+        raise ValueError(f"Motor de Excel desconocido: {engine}. Opciones: {EXCEL_ENGINES}")
+    columns_records_reduced = _preparar_registros(column_records, units)
+    # Lo y espaciamiento de estribos de todas las secciones distintas en una
+    # sola pasada vectorizada
+    confinamiento = ConfinementCache()
+    confinamiento.precompute(columns_records_reduced)
+    if engine == "streaming":
+        wb = _crear_libro_streaming(
+            _layout_registros_preparados(stories_data, grid_lines_data, columns_records_reduced, confinamiento)
+        )
+    else:
+        wb = _crear_libro_celda_por_celda(stories_data, grid_lines_data, columns_records_reduced, confinamiento)
+    confinamiento.report()
 
-    for group_info in col_rows:
-        excel_row_start = group_info['row']
-        data_source_level = group_info['data_source_level']
-        
-        for grid_id in grid_lines:
-            record = data_matrix.get(data_source_level, {}).get(grid_id)
-            excel_column = get_excel_col(gridline_columns, grid_id)
-            
-            if record and excel_column:
-                ws.cell(row=excel_row_start, column=excel_column).value = record['bxh']
-                ws.cell(row=excel_row_start + 1, column=excel_column).value = record['fc']
-                ws.cell(row=excel_row_start + 2, column=excel_column).value = record['As']
-                ws.cell(row=excel_row_start + 5, column=excel_column).value = record['Rebar. Est.']
-                ws.cell(row=excel_row_start + 6, column=excel_column).value = record['Rebar. Est.']
-                ws.cell(row=excel_row_start + 8, column=excel_column).value = record['Detalle No.']
-                
-                try:
-                    rebar_diameter_mm = get_diameter(record['Rebar'])
-                    depth_mm = float(record['depth']) * 10
-                    width_mm = float(record['width']) * 10
-                    h_floor_mm = (float(record['End Z']) - float(record['Start Z'])) * 1000
-                    
-                    lo_cm = round(calcular_lo_aci_318_19(max(depth_mm, width_mm), h_floor_mm, "mm") / 10)
-                    ws.cell(row=excel_row_start + 7, column=excel_column).value = lo_cm
-
-                    espaciamiento_mm = calcular_espaciamiento_estribos_confinamiento_columnas_aci_318_19(
-                        min(depth_mm, width_mm), rebar_diameter_mm, 420, 300, unidades="mm", fy_units="MPa")[0]
-                    ws.cell(row=excel_row_start + 3, column=excel_column).value = round(espaciamiento_mm/10)
-                except (ValueError, TypeError, KeyError):
-                    ws.cell(row=excel_row_start + 7, column=excel_column).value = "Error"
-                    ws.cell(row=excel_row_start + 3, column=excel_column).value = "Error"
-                    
-    # --- INICIO DE LA MODIFICACIÓN: AGRUPAMIENTO DE GRIDLINES IDÉNTICOS ---
-    # Agrupa las columnas de GridLine que son idénticas, actualiza los encabezados y
-    # devuelve la nueva lista de gridlines para que la utilicen las funciones posteriores.
-    final_grid_lines = _group_identical_gridlines(ws, gridline_columns, col_rows)
-    # --- FIN DE LA MODIFICACIÓN ---
-
-    # La función detectar_bxh_empty ahora usa la lista actualizada de gridlines.
-    # Esto asegura que opera sobre la estructura de columnas correcta después del agrupamiento.
-    detectar_bxh_empty(ws, col_rows, final_grid_lines)
-                
     full_filename = str(Path(folder_path) / 'cuadro_columnas.xlsx')
     try:
         wb.save(full_filename)
-        print(f"ARCHIVO EXCEL CREADO EN: {full_filename}")
+        logger.info(f"ARCHIVO EXCEL CREADO EN: {full_filename}")
+    except PermissionError:
+        logger.error(f"Permiso denegado. Asegúrate de que el archivo '{full_filename}' no esté abierto.")
+
+def particionar_registros(column_records, partition_by):
+    """
+    Separa los registros de columnas por torre, grupo u otra clave.
+
+    Args:
+        column_records (ColumnTable o list[dict]): Registros de columnas.
+        partition_by (str o callable): Campo de los registros (por ejemplo
+            "Tower") o funcion partition_by(registro) que devuelve el nombre
+            de la particion (por ejemplo el prefijo del GridLine).
+
+    Returns:
+        dict: {nombre de la particion: ColumnTable}, en el orden en que
+        aparece cada particion. Los registros sin valor quedan en SIN_GRUPO.
+    """
+    column_records = ColumnTable.from_records(column_records)
+    if not column_records:
+        return {}
+    if callable(partition_by):
+        keys = [partition_by(record) for record in column_records]
+    elif partition_by in column_records:
+        keys = list(column_records[partition_by])
+    else:
+        raise KeyError(f"Los registros no tienen el campo '{partition_by}'.")
+    names = np.array([
+        SIN_GRUPO if key is None or (isinstance(key, float) and math.isnan(key)) or str(key).strip() == "" else str(key)
+        for key in keys
+    ], dtype=object)
+    return {name: column_records.select(names == name) for name in dict.fromkeys(names)}
+
+def _nombre_hoja(name, used):
+    """Nombre valido y unico de hoja de Excel (31 caracteres, sin []:*?/\\)."""
+    base = re.sub(r'[\[\]:*?/\\]', '_', name).strip("'")[:31] or SIN_GRUPO
+    title, n = base, 1
+    while title.lower() in used:
+        n += 1
+        suffix = f" ({n})"
+        title = base[:31 - len(suffix)] + suffix
+    used.add(title.lower())
+    return title
+
+def _nombre_archivo(name):
+    return re.sub(r'[<>:"/\\|?*]', '_', name).strip() or SIN_GRUPO
+
+def _layout_particion(stories_data, grid_lines_data, column_records, units):
+    """
+    Trabajo de un proceso de generate_partitioned_excel: el layout del
+    cuadro de una particion, solo con los GridLine que tienen columnas en
+    ella.
+    """
+    columns_records_reduced = _preparar_registros(column_records, units)
+    grid_ids = set(columns_records_reduced['GridLine']) if columns_records_reduced else set()
+    grid_lines = [grid for grid in grid_lines_data if grid['ID'] in grid_ids]
+    confinamiento = ConfinementCache()
+    confinamiento.precompute(columns_records_reduced)
+    layout = _layout_registros_preparados(stories_data, grid_lines, columns_records_reduced, confinamiento)
+    confinamiento.report()
+    return layout
+
+def _exportar_particion(stories_data, grid_lines_data, column_records, units, file_name):
+    """Trabajo de un proceso en el modo "workbooks": layout y archivo de una particion."""
+    wb = _crear_libro_streaming(_layout_particion(stories_data, grid_lines_data, column_records, units))
+    wb.save(file_name)
+    return file_name
+
+def generate_partitioned_excel(folder_path, stories_data, grid_lines_data, column_records, partition_by,
+                               units=MODEL_UNITS, mode="sheets", processes=None):
+    """
+    Cuadro de columnas separado por torre, grupo u otra clave (ver
+    particionar_registros), con las particiones calculadas en paralelo en
+    un ProcessPoolExecutor.
+
+    Args:
+        partition_by (str o callable): Clave de las particiones; se evalua
+            en este proceso, antes de repartir el trabajo.
+        mode (str): "sheets" escribe folder_path/cuadro_columnas.xlsx con
+            una hoja por particion (los procesos arman los layouts y el
+            libro se ensambla al final en una sola pasada write_only);
+            "workbooks" escribe un cuadro_columnas_<particion>.xlsx por
+            particion, cada uno en su proceso.
+        processes (int, opcional): Procesos de trabajo. Por defecto uno por
+            nucleo y a lo sumo uno por MIN_RECORDS_PER_PROCESS registros; un
+            valor dado se respeta (hasta uno por particion). Con 1 (o una
+            sola particion) no se abre el pool.
+
+    Returns:
+        list[str]: Archivos escritos.
+    """
+    if mode not in PARTITION_MODES:
+        raise ValueError(f"Modo de particion desconocido: {mode}. Opciones: {PARTITION_MODES}")
+    partitions = particionar_registros(column_records, partition_by)
+    if not partitions:
+        logger.warning("No hay registros de columnas para exportar.")
+        return []
+    if processes is None:
+        total_records = sum(len(records) for records in partitions.values())
+        processes = min(os.cpu_count() or 1, total_records // MIN_RECORDS_PER_PROCESS)
+    processes = max(1, min(int(processes), len(partitions)))
+    logger.info(f"Cuadro de columnas por particiones: {len(partitions)} particiones con {processes} procesos.")
+
+    folder = Path(folder_path)
+    names = list(partitions)
+    if mode == "workbooks":
+        work = _exportar_particion
+        tasks = [
+            (stories_data, grid_lines_data, partitions[name], units,
+             str(folder / f"cuadro_columnas_{_nombre_archivo(name)}.xlsx"))
+            for name in names
+        ]
+    else:
+        work = _layout_particion
+        tasks = [(stories_data, grid_lines_data, partitions[name], units) for name in names]
+
+    try:
+        if processes == 1:
+            results = [work(*task) for task in tasks]
+        else:
+            with ProcessPoolExecutor(max_workers=processes) as pool:
+                futures = [pool.submit(work, *task) for task in tasks]
+                results = [future.result() for future in futures]
+    except PermissionError as e:
+        logger.error(f"Permiso denegado. Asegúrate de que el archivo '{e.filename}' no esté abierto.")
+        return []
+
+    if mode == "workbooks":
+        for file_name in results:
+            logger.info(f"ARCHIVO EXCEL CREADO EN: {file_name}")
+        return results
+
+    wb = Workbook(write_only=True)
+    used = set()
+    for name, layout in zip(names, results):
+        _escribir_hoja_streaming(wb.create_sheet(_nombre_hoja(name, used)), layout)
+    full_filename = str(folder / 'cuadro_columnas.xlsx')
+    try:
+        wb.save(full_filename)
+        logger.info(f"ARCHIVO EXCEL CREADO EN: {full_filename}")
     except PermissionError:
-        print(f"Error: Permiso denegado. Asegúrate de que el archivo '{full_filename}' no esté abierto.")
\ No newline at end of file
+        logger.error(f"Permiso denegado. Asegúrate de que el archivo '{full_filename}' no esté abierto.")
+        return []
+    return [full_filename]
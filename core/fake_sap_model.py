@@ -0,0 +1,454 @@
+import json
+
+
+class FakeDatabaseTables:
+    def __init__(self, tables=None):
+        # {table_key: (fields, rows)}
+        self.tables = tables if tables is not None else {}
+
+    def GetTableForDisplayArray(
+        self, table_key, field_key_list, group_name, table_version,
+        fields_keys_included, number_records, table_data
+    ):
+        if table_key not in self.tables:
+            return [field_key_list, table_version, [], 0, [], 1]
+
+        fields, rows = self.tables[table_key]
+        # ETABS devuelve todos los valores como texto en un arreglo plano
+        flat_data = [str(value) for row in rows for value in row]
+        return [field_key_list, 1, list(fields), len(rows), flat_data, 0]
+
+
+class FakeStory:
+    def __init__(self, stories=None):
+        # [{'nombre': ..., 'elevacion': ...}]
+        self.stories = stories if stories is not None else []
+
+    def GetNameList(self):
+        names = tuple(story["nombre"] for story in self.stories)
+        return len(names), names, 0
+
+    def GetElevation(self, name):
+        for story in self.stories:
+            if story["nombre"] == name:
+                return story["elevacion"], 0
+        return 0.0, 1
+
+
+class FakeSapModel:
+    """
+    Imita el objeto SapModel de ETABS sirviendo tablas en memoria, para
+    ejecutar la extraccion por tablas sin ETABS (por ejemplo en Linux).
+    Los valores devueltos tienen el mismo formato que devuelve comtypes.
+
+    Args:
+        tables (dict): {table_key: (fields, rows)}, donde fields es la lista de
+            campos y rows una lista de filas con un valor por campo.
+        stories (list[dict]): Niveles con las claves 'nombre' y 'elevacion'.
+    """
+    def __init__(self, tables=None, stories=None):
+        self.DatabaseTables = FakeDatabaseTables(tables)
+        self.Story = FakeStory(stories)
+
+    def add_table(self, table_key, fields, rows):
+        self.DatabaseTables.tables[table_key] = (list(fields), [list(row) for row in rows])
+
+
+# (fuerza, longitud, temperatura) = (kgf, cm, C), con los codigos de core.etabs
+UNITS_KGF_CM_C = (5, 5, 2)
+
+
+class FakeFrameObj:
+    def __init__(self, frames=None):
+        # {nombre: {'label', 'story', 'orientation', 'section', 'points': (p1, p2)}}
+        self.frames = frames if frames is not None else {}
+
+    def Count(self):
+        return len(self.frames)
+
+    def GetNameList(self):
+        names = tuple(self.frames)
+        return len(names), names, 0
+
+    def GetLabelNameList(self):
+        names = tuple(self.frames)
+        labels = tuple(self.frames[name]["label"] for name in names)
+        stories = tuple(self.frames[name]["story"] for name in names)
+        return len(names), names, labels, stories, 0
+
+    def GetLabelFromName(self, name):
+        if name not in self.frames:
+            return "", "", 1
+        return self.frames[name]["label"], self.frames[name]["story"], 0
+
+    def GetDesignOrientation(self, name):
+        if name not in self.frames:
+            return 0, 1
+        return self.frames[name]["orientation"], 0
+
+    def GetSection(self, name):
+        if name not in self.frames:
+            return "", "", 1
+        return self.frames[name]["section"], "", 0
+
+    def GetPoints(self, name):
+        if name not in self.frames:
+            return "", "", 1
+        point_1, point_2 = self.frames[name]["points"]
+        return point_1, point_2, 0
+
+
+class FakePointObj:
+    def __init__(self, points=None):
+        # {nombre: (x, y, z)}
+        self.points = points if points is not None else {}
+
+    def GetAllPoints(self, *args):
+        names = tuple(self.points)
+        x = tuple(self.points[name][0] for name in names)
+        y = tuple(self.points[name][1] for name in names)
+        z = tuple(self.points[name][2] for name in names)
+        return len(names), names, x, y, z, 0
+
+    def GetCoordCartesian(self, name, *args):
+        if name not in self.points:
+            return 0.0, 0.0, 0.0, 1
+        return (*self.points[name], 0)
+
+
+class FakePropFrame:
+    def __init__(self, sections=None, rebars=None):
+        # {nombre: {'type', 'material', 't3', 't2', 'rebar'}}, 'rebar' es
+        # None para secciones sin armado de columna (vigas).
+        self.sections = sections if sections is not None else {}
+        # {nombre: (area, diametro)}, para el area de GetRebarColumn_1
+        self.rebars = rebars if rebars is not None else {}
+
+    def GetNameList(self):
+        names = tuple(self.sections)
+        return len(names), names, 0
+
+    def GetTypeOAPI(self, name):
+        if name not in self.sections:
+            return 0, 1
+        return self.sections[name]["type"], 0
+
+    def GetMaterial(self, name):
+        if name not in self.sections:
+            return "", 1
+        return self.sections[name]["material"], 0
+
+    def GetRectangle(self, name):
+        section = self.sections.get(name)
+        if section is None or section["type"] != 8:
+            return "", "", 0.0, 0.0, 0, "", "", 1
+        return "", section["material"], section["t3"], section["t2"], -1, "", "", 0
+
+    def GetCircle(self, name):
+        section = self.sections.get(name)
+        if section is None or section["type"] != 9:
+            return "", "", 0.0, 0, "", "", 1
+        return "", section["material"], section["t3"], -1, "", "", 0
+
+    def GetRebarColumn(self, name):
+        section = self.sections.get(name)
+        if section is None or section["rebar"] is None:
+            return ("", "", 0, 0, 0.0, 0, 0, 0, "", "", 0.0, 0, 0, False, 1)
+        rebar = section["rebar"]
+        # (MatPropLong, MatPropConfine, Pattern, ConfineType, Cover,
+        #  NumberCBars, NumberR3Bars, NumberR2Bars, RebarSize, TieSize,
+        #  TieSpacingLongit, Number2DirTieBars, Number3DirTieBars,
+        #  ToBeDesigned, ret)
+        return (
+            rebar["mat_long"], rebar["mat_confine"], 1, 1, rebar["cover"],
+            0, rebar["num_r3"], rebar["num_r2"], rebar["rebar_size"], rebar["tie_size"],
+            rebar["tie_spacing"], rebar["num_2d_tie"], rebar["num_3d_tie"], False, 0,
+        )
+
+    def GetRebarColumn_1(self, name):
+        result = self.GetRebarColumn(name)
+        # utils.extractions lee el area de la barra longitudinal en la posicion 15
+        rebar_area = 0.0
+        if result[-1] == 0:
+            rebar_area = self.rebars.get(result[8], (0.0, 0.0))[0]
+        return result[:-1] + ("", rebar_area, result[-1])
+
+    def GetRebarBeam(self, name):
+        # Las secciones de columna no tienen armado de viga
+        return "", "", 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 1
+
+
+class FakePropMaterial:
+    def __init__(self, materials=None):
+        # {nombre: {'type': 2 (concreto) o 6 (refuerzo), 'fc' o 'fy'}}
+        self.materials = materials if materials is not None else {}
+
+    def GetNameList(self):
+        names = tuple(self.materials)
+        return len(names), names, 0
+
+    def GetMaterial(self, name):
+        if name not in self.materials:
+            return 0, 0, "", "", 1
+        return self.materials[name]["type"], -1, "", "", 0
+
+    def GetOConcrete_1(self, name):
+        material = self.materials.get(name)
+        if material is None or "fc" not in material:
+            return (0.0, False, 0.0, 0, 0, 0.0, 0.0, 0.0, 0.0, 0.0, 1)
+        return (material["fc"], False, 1.0, 2, 4, 0.002, 0.005, -0.1, 0.0, 0.0, 0)
+
+    def GetOSteel_1(self, name):
+        material = self.materials.get(name)
+        if material is None or "fy" not in material:
+            return (0.0, 0.0, 0.0, 0.0, 0, 0, 0.0, 0.0, 0.0, False, 1)
+        fy = material["fy"]
+        return (fy, fy * 1.5, fy * 1.1, fy * 1.65, 1, 1, 0.01, 0.09, -0.1, False, 0)
+
+
+class FakePropRebar:
+    def __init__(self, rebars=None):
+        # {nombre: (area, diametro)}
+        self.rebars = rebars if rebars is not None else {}
+
+    def GetNameList(self):
+        names = tuple(self.rebars)
+        return len(names), names, 0
+
+    def GetRebarProps(self, name):
+        if name not in self.rebars:
+            return 0.0, 0.0, 1
+        area, diameter = self.rebars[name]
+        return area, diameter, 0
+
+
+class FakeFile:
+    def __init__(self, sap_model):
+        self.sap_model = sap_model
+
+    def OpenFile(self, file_name):
+        return self.sap_model.open_file(file_name)
+
+
+class FakeFrameSapModel(FakeSapModel):
+    """
+    SapModel falso con objetos frame, puntos, secciones, materiales y barras,
+    para ejecutar la extraccion frame por frame
+    (etabs.get_story_lable_col_name, create_column_table.get_open_model_data,
+    extractions.extract_columns_by_level) sin ETABS.
+
+    Las tablas de la base de datos quedan vacias, por lo que la extraccion
+    por tablas no encuentra datos y se usa la extraccion frame por frame.
+    """
+    def __init__(self, stories=None, model_filename="modelo_sintetico.EDB"):
+        super().__init__(stories=stories)
+        self.model_filename = model_filename
+        self.units = UNITS_KGF_CM_C
+        self.FrameObj = FakeFrameObj()
+        self.PointObj = FakePointObj()
+        self.PropRebar = FakePropRebar()
+        self.PropFrame = FakePropFrame(rebars=self.PropRebar.rebars)
+        self.PropMaterial = FakePropMaterial()
+        self.File = FakeFile(self)
+
+    def open_file(self, file_name):
+        """
+        "Abre" un modelo: el archivo es un JSON con los argumentos de
+        build_synthetic_model, por ejemplo {"n_stories": 10, "n_grid_x": 4}.
+        """
+        try:
+            with open(file_name, "r", encoding="utf-8") as f:
+                spec = json.load(f)
+        except (OSError, ValueError):
+            return 1
+        model = build_synthetic_model(**spec)
+        for name in ("Story", "FrameObj", "PointObj", "PropRebar", "PropFrame", "PropMaterial"):
+            setattr(self, name, getattr(model, name))
+        self.model_filename = file_name
+        return 0
+
+    def GetModelFilename(self, include_path=True):
+        return self.model_filename
+
+    def SetPresentUnits_2(self, force, length, temperature):
+        self.units = (force, length, temperature)
+        return 0
+
+    def GetPresentUnits_2(self):
+        return (*self.units, 0)
+
+SYNTHETIC_REBARS = {
+    "#3": (0.71, 0.95),
+    "#4": (1.29, 1.27),
+    "#5": (1.99, 1.59),
+    "#6": (2.84, 1.91),
+    "#8": (5.10, 2.54),
+}
+
+
+def build_synthetic_model(n_stories=10, n_grid_x=5, n_grid_y=5,
+                          story_height=300.0, spacing=600.0, with_beams=True):
+    """
+    Genera un modelo sintetico de N niveles con una malla de M ejes
+    (n_grid_x x n_grid_y), con una columna por eje y nivel y, opcionalmente,
+    vigas en direccion X. Las unidades son kgf-cm.
+
+    Las secciones de columna se reducen con la altura (tres grupos de
+    niveles), para que la extraccion encuentre varios detalles.
+
+    Returns:
+        FakeFrameSapModel
+    """
+    stories = [
+        {"nombre": f"Piso {level}", "elevacion": level * story_height}
+        for level in range(n_stories, 0, -1)
+    ]
+    stories.append({"nombre": "Base", "elevacion": 0.0})
+    model = FakeFrameSapModel(stories=stories)
+
+    model.PropRebar.rebars.update(SYNTHETIC_REBARS)
+    model.PropMaterial.materials.update({
+        "4000Psi": {"type": 2, "fc": 281.0},
+        "5000Psi": {"type": 2, "fc": 351.0},
+        "A615Gr60": {"type": 6, "fy": 4200.0},
+    })
+
+    column_sections = [
+        ("C70x70", 70.0, "5000Psi", 5, "#8"),
+        ("C60x60", 60.0, "4000Psi", 4, "#6"),
+        ("C50x50", 50.0, "4000Psi", 3, "#5"),
+    ]
+    for name, size, material, bars, rebar_size in column_sections:
+        model.PropFrame.sections[name] = {
+            "type": 8,
+            "material": material,
+            "t3": size,
+            "t2": size,
+            "rebar": {
+                "mat_long": "A615Gr60",
+                "mat_confine": "A615Gr60",
+                "cover": 4.0,
+                "num_r3": bars,
+                "num_r2": bars,
+                "rebar_size": rebar_size,
+                "tie_size": "#3",
+                "tie_spacing": 10.0,
+                "num_2d_tie": bars - 2,
+                "num_3d_tie": bars - 2,
+            },
+        }
+    model.PropFrame.sections["V30x60"] = {
+        "type": 8, "material": "4000Psi", "t3": 60.0, "t2": 30.0, "rebar": None,
+    }
+
+    points = model.PointObj.points
+    frames = model.FrameObj.frames
+
+    def point_name(i, j, level):
+        return f"{level * n_grid_x * n_grid_y + j * n_grid_x + i + 1}"
+
+    for level in range(n_stories + 1):
+        for j in range(n_grid_y):
+            for i in range(n_grid_x):
+                points[point_name(i, j, level)] = (i * spacing, j * spacing, level * story_height)
+
+    section_group = max(1, -(-n_stories // len(column_sections)))
+    for level in range(1, n_stories + 1):
+        story_name = f"Piso {level}"
+        column_section = column_sections[min((level - 1) // section_group, len(column_sections) - 1)][0]
+        for j in range(n_grid_y):
+            for i in range(n_grid_x):
+                frames[f"C{len(frames) + 1}"] = {
+                    "label": f"C{j * n_grid_x + i + 1}",
+                    "story": story_name,
+                    "orientation": 1,
+                    "section": column_section,
+                    "points": (point_name(i, j, level - 1), point_name(i, j, level)),
+                }
+        if not with_beams:
+            continue
+        for j in range(n_grid_y):
+            for i in range(n_grid_x - 1):
+                frames[f"B{len(frames) + 1}"] = {
+                    "label": f"B{j * (n_grid_x - 1) + i + 1}",
+                    "story": story_name,
+                    "orientation": 2,
+                    "section": "V30x60",
+                    "points": (point_name(i, j, level), point_name(i + 1, j, level)),
+                }
+
+    return model
+
+
+def populate_database_tables(model):
+    """
+    Llena las tablas de la base de datos de un modelo de
+    build_synthetic_model con sus frames, puntos, secciones y materiales,
+    para ejecutar sobre el mismo modelo la extraccion por tablas
+    (etabs_tables.get_story_lable_col_name_from_tables) y la frame por frame.
+
+    Returns:
+        FakeFrameSapModel: El mismo modelo.
+    """
+    # Import aqui para no depender de core.etabs_tables al importar los fakes
+    from core import etabs_tables
+
+    frames = model.FrameObj.frames
+    sections = model.PropFrame.sections
+    model.add_table(
+        etabs_tables.TABLE_FRAME_SECTIONS, etabs_tables.FRAME_SECTION_FIELDS,
+        [(name, frame["label"], frame["story"], frame["section"]) for name, frame in frames.items()],
+    )
+    model.add_table(
+        etabs_tables.TABLE_COLUMN_CONNECTIVITY, etabs_tables.COLUMN_CONNECTIVITY_FIELDS,
+        [(name, *frame["points"]) for name, frame in frames.items() if frame["orientation"] == 1],
+    )
+    model.add_table(
+        etabs_tables.TABLE_POINT_CONNECTIVITY, etabs_tables.POINT_FIELDS,
+        [(name, *coordinates) for name, coordinates in model.PointObj.points.items()],
+    )
+    model.add_table(
+        etabs_tables.TABLE_RECT_SECTIONS, etabs_tables.RECT_SECTION_FIELDS,
+        [(name, section["material"], section["t3"], section["t2"])
+         for name, section in sections.items() if section["type"] == 8],
+    )
+    model.add_table(
+        etabs_tables.TABLE_COLUMN_REBAR, etabs_tables.COLUMN_REBAR_FIELDS,
+        [
+            (name, rebar["mat_long"], rebar["mat_confine"], rebar["cover"], rebar["num_r3"],
+             rebar["num_r2"], rebar["rebar_size"], rebar["tie_size"], rebar["num_2d_tie"],
+             rebar["num_3d_tie"])
+            for name, section in sections.items()
+            for rebar in [section["rebar"]] if rebar is not None
+        ],
+    )
+    model.add_table(
+        etabs_tables.TABLE_CONCRETE_DATA, etabs_tables.CONCRETE_FIELDS,
+        [(name, material["fc"]) for name, material in model.PropMaterial.materials.items() if "fc" in material],
+    )
+    return model
+
+
+class FakeEtabsObject:
+    def __init__(self):
+        self.started = False
+        self.SapModel = FakeFrameSapModel(model_filename="")
+
+    def ApplicationStart(self):
+        self.started = True
+        return 0
+
+    def ApplicationExit(self, file_save):
+        self.started = False
+        return 0
+
+
+class FakeEtabsHelper:
+    """
+    Imita ETABSv1.Helper: CreateObjectProgID devuelve una instancia de ETABS
+    falsa cuyo SapModel abre los modelos sinteticos descritos en archivos
+    JSON (ver FakeFrameSapModel.open_file). Sirve para probar la extraccion
+    por lotes sin ETABS.
+    """
+    def CreateObjectProgID(self, prog_id):
+        return FakeEtabsObject()
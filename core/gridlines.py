@@ -0,0 +1,129 @@
+import numpy as np
+import pandas as pd
+
+from core.units import MODEL_UNITS, factor
+
+# Distancia maxima entre columnas del mismo eje, en mm; se convierte a las
+# unidades de las coordenadas con gridline_tolerance
+GRIDLINE_TOLERANCE_MM = 5.0
+
+
+def gridline_tolerance(units=None):
+    """
+    GRIDLINE_TOLERANCE_MM en la unidad de longitud de units (por defecto
+    MODEL_UNITS, kgf-cm: 0.5 cm).
+    """
+    units = units or MODEL_UNITS
+    return GRIDLINE_TOLERANCE_MM * factor("length", "mm", units["length"])
+
+
+def cluster_axis(values, tolerance):
+    """
+    Agrupa coordenadas de un eje: recorriendo los valores ordenados, cada
+    grupo empieza en un valor y toma los que estan a lo sumo a tolerance de
+    ese primer valor, para que valores separados poco a poco no se
+    encadenen en un solo grupo.
+
+    Args:
+        tolerance (float): En las mismas unidades que values.
+
+    Returns:
+        tuple: (ids, centros): el grupo de cada valor y la coordenada media de
+        cada grupo, en orden creciente.
+    """
+    values = np.asarray(values, dtype=float)
+    if values.size == 0:
+        return np.empty(0, dtype=np.int64), np.empty(0)
+    order = np.argsort(values, kind="stable")
+    sorted_values = values[order]
+    # Una busqueda binaria por grupo para encontrar donde termina
+    sorted_ids = np.empty(values.size, dtype=np.int64)
+    start = group = 0
+    while start < values.size:
+        end = np.searchsorted(sorted_values, sorted_values[start] + tolerance, side="right")
+        sorted_ids[start:end] = group
+        start, group = end, group + 1
+
+    ids = np.empty(values.size, dtype=np.int64)
+    ids[order] = sorted_ids
+    centers = np.bincount(sorted_ids, weights=sorted_values) / np.bincount(sorted_ids)
+    return ids, centers
+
+
+def assign_gridlines(pos_x, pos_y, units=None):
+    """
+    Asigna el GridLine de cada columna por su posicion (x, y) en una sola
+    pasada vectorizada, sin comparar tuplas de flotantes exactos: cada eje se
+    agrupa con cluster_axis y la pareja (grupo x, grupo y) se numera en el
+    orden en que aparece, empezando en 1 (igual que pd.factorize + 1).
+
+    Args:
+        pos_x, pos_y (array): Coordenadas de cada columna.
+        units (dict, opcional): Unidades de las coordenadas (como
+            MODEL_UNITS); la tolerancia es GRIDLINE_TOLERANCE_MM en ellas.
+
+    Returns:
+        tuple: (gridline_ids, centers): el GridLine de cada columna y un
+        arreglo (n_gridlines, 2) con la posicion media de cada GridLine.
+    """
+    tolerance = gridline_tolerance(units)
+    x_ids, x_centers = cluster_axis(pos_x, tolerance)
+    y_ids, y_centers = cluster_axis(pos_y, tolerance)
+    if x_ids.size == 0:
+        return np.empty(0, dtype=np.int64), np.empty((0, 2))
+
+    # "Hash" de la celda de la malla: un entero por pareja de grupos
+    cell_keys = x_ids * len(y_centers) + y_ids
+    codes, unique_cells = pd.factorize(cell_keys)
+    centers = np.column_stack((
+        x_centers[unique_cells // len(y_centers)],
+        y_centers[unique_cells % len(y_centers)],
+    ))
+    return codes + 1, centers
+
+
+def label_gridlines(centers, grid_lines, units=None):
+    """
+    Nombra cada GridLine con los ejes del sistema de grillas de ETABS que
+    pasan por su posicion, por ejemplo "A-1".
+
+    Args:
+        centers (array): (n_gridlines, 2) de assign_gridlines.
+        grid_lines (list[dict]): Ejes con las claves 'direction' ("X" o "Y"),
+            'label' y 'coordinate' (ver etabs_tables.get_grid_lines).
+        units (dict, opcional): Unidades de las coordenadas, como en
+            assign_gridlines.
+
+    Returns:
+        list: El nombre de cada GridLine, o None si no coincide con un eje en
+        X y uno en Y.
+    """
+    centers = np.asarray(centers, dtype=float).reshape(-1, 2)
+    tolerance = gridline_tolerance(units)
+    matches = []
+    for axis, direction in ((0, "X"), (1, "Y")):
+        axis_lines = [line for line in grid_lines if line["direction"] == direction]
+        if not axis_lines:
+            return [None] * len(centers)
+        coordinates = np.array([line["coordinate"] for line in axis_lines], dtype=float)
+        labels = np.array([line["label"] for line in axis_lines], dtype=object)
+        order = np.argsort(coordinates)
+        coordinates, labels = coordinates[order], labels[order]
+
+        # Eje mas cercano por busqueda binaria
+        right = np.clip(np.searchsorted(coordinates, centers[:, axis]), 1, len(coordinates) - 1)
+        left = right - 1
+        if len(coordinates) == 1:
+            nearest = np.zeros(len(centers), dtype=np.int64)
+        else:
+            nearest = np.where(
+                np.abs(centers[:, axis] - coordinates[left]) <= np.abs(coordinates[right] - centers[:, axis]),
+                left, right,
+            )
+        found = np.abs(coordinates[nearest] - centers[:, axis]) <= tolerance
+        matches.append(np.where(found, labels[nearest], None))
+
+    return [
+        f"{x_label}-{y_label}" if x_label is not None and y_label is not None else None
+        for x_label, y_label in zip(*matches)
+    ]
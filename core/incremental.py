@@ -0,0 +1,281 @@
+import hashlib
+import json
+
+from core import etabs
+from core.column_processing import build_cols_and_gridlines
+from core.log import get_logger
+from core.pipeline import ExtractionPipeline
+from core.point_coordinates import PointCoordinateResolver
+from core.property_cache import ModelPropertyCache
+from core.stories import get_stories_with_elevations
+from core.units import model_units
+
+logger = get_logger(__name__)
+
+
+def _definition_hash(*values):
+    return hashlib.md5(repr(values).encode("utf-8")).hexdigest()
+
+
+class ExtractionSnapshot:
+    """
+    Resultado de la ultima extraccion de columnas, guardado para que la
+    siguiente ejecucion de "Identificar columnas" solo vuelva a leer los
+    frames que cambiaron.
+
+    Cada frame se guarda con una huella barata: label, story, seccion, hash
+    de la definicion de la seccion (dimensiones, material y armado) y nombres
+    y coordenadas de sus puntos. Los frames que no son columnas tambien se
+    guardan (con registro None) para no volver a revisarlos.
+    """
+    def __init__(self):
+        self.model_filename = None
+        self.stories = None
+        # {frame_name: huella}
+        self.fingerprints = {}
+        # {frame_name: registro crudo de la columna o None}
+        self.records = {}
+
+    def is_empty(self):
+        return self.model_filename is None
+
+    def can_update(self, model_filename):
+        """
+        True si el snapshot tiene las huellas de una extraccion de
+        model_filename, es decir si extract_incremental puede re-leer solo
+        los frames que cambiaron.
+        """
+        return bool(self.fingerprints) and self.model_filename == model_filename
+
+    def column_data(self):
+        return [record for record in self.records.values() if record is not None]
+
+
+def get_frame_fingerprints(sap_model, frames, cache, points):
+    """
+    Calcula la huella de cada frame con GetSection y GetPoints; las
+    definiciones de seccion y las coordenadas salen del cache y del resolver
+    de puntos (una consulta por seccion distinta y una para todos los puntos).
+
+    Args:
+        frames (list[tuple]): (nombre, label, story) de cada frame.
+
+    Returns:
+        dict: {frame_name: huella}
+    """
+    frame_sections = {}
+    frame_points = {}
+    for frame_name, _, _ in frames:
+        frame_sections[frame_name] = etabs.get_col_section(sap_model, frame_name)
+        frame_points[frame_name] = sap_model.FrameObj.GetPoints(frame_name)
+
+    points.resolve(
+        point_name
+        for point_1, point_2, ret_points in frame_points.values()
+        if ret_points == 0
+        for point_name in (point_1, point_2)
+    )
+
+    section_hashes = {}
+    fingerprints = {}
+    for frame_name, frame_label, frame_story in frames:
+        section = frame_sections[frame_name]
+        if section not in section_hashes:
+            section_type = cache.get_section_type(section)
+            if section_type[0] == 8:
+                rectangle = cache.get_rectangle(section)
+                section_hashes[section] = _definition_hash(
+                    section_type,
+                    rectangle,
+                    cache.get_concrete(rectangle[1]),
+                    cache.get_rebar_column(section),
+                )
+            else:
+                section_hashes[section] = _definition_hash(section_type)
+
+        point_1, point_2, ret_points = frame_points[frame_name]
+        coordinates = None
+        if ret_points == 0:
+            coordinates = (points.get_xyz(point_1), points.get_xyz(point_2))
+
+        fingerprints[frame_name] = (
+            frame_label,
+            frame_story,
+            section,
+            section_hashes[section],
+            point_1,
+            point_2,
+            coordinates,
+        )
+    return fingerprints
+
+
+def fingerprints_to_records(fingerprints):
+    """
+    Huellas del snapshot como registros {frame, fingerprint} para guardarlas
+    en el cache en disco junto con la extraccion.
+    """
+    return [
+        {"frame": frame_name, "fingerprint": json.dumps(fingerprint)}
+        for frame_name, fingerprint in fingerprints.items()
+    ]
+
+
+def _as_tuple(value):
+    if isinstance(value, list):
+        return tuple(_as_tuple(item) for item in value)
+    return value
+
+
+def fingerprints_from_records(records):
+    """Inverso de fingerprints_to_records (las listas de JSON vuelven a tuplas)."""
+    return {
+        record["frame"]: _as_tuple(json.loads(record["fingerprint"]))
+        for record in records
+    }
+
+
+def seed_snapshot(sap_model, snapshot, column_data, fingerprints=None, cache=None):
+    """
+    Llena el snapshot con el resultado de otra extraccion (por tablas,
+    paralela o diferida), para que la siguiente ejecucion de
+    extract_incremental solo re-lea los frames que cambiaron desde ella.
+
+    Args:
+        column_data: Registros de columnas de esa extraccion (lista o
+            ColumnTable), uno por frame de columna.
+        fingerprints (dict, opcional): Huellas ya calculadas del mismo
+            estado del modelo. Si no se dan se calculan con
+            get_frame_fingerprints (GetSection y GetPoints por frame, sin
+            leer el armado).
+    """
+    cache = cache if cache is not None else ModelPropertyCache(sap_model)
+    if fingerprints is None:
+        number_names, mynames, mylabels, mystories, ret = sap_model.FrameObj.GetLabelNameList()
+        frames = list(zip(mynames, mylabels, mystories))
+        fingerprints = get_frame_fingerprints(sap_model, frames, cache, PointCoordinateResolver(sap_model))
+
+    snapshot.model_filename = sap_model.GetModelFilename()
+    snapshot.stories = get_stories_with_elevations(sap_model)
+    snapshot.fingerprints = dict(fingerprints)
+    # Los frames que no son columnas quedan en las huellas sin registro
+    snapshot.records = {record["col_id"]: record for record in column_data}
+    logger.info(f"Snapshot de la extraccion: {len(snapshot.records)} columnas, {len(snapshot.fingerprints)} frames.")
+
+
+def extract_incremental(sap_model, snapshot, cache=None, on_chunk=None):
+    """
+    Version incremental de etabs.get_story_lable_col_name.
+
+    Compara las huellas actuales con las del snapshot y vuelve a extraer solo
+    los frames nuevos o modificados; los eliminados se quitan. Si el modelo o
+    los niveles cambiaron, o el snapshot esta vacio, se extrae todo.
+    El snapshot se actualiza con el resultado.
+
+    Args:
+        sap_model: El objeto SapModel activo de la API de ETABS.
+        snapshot (ExtractionSnapshot): Resultado de la ejecucion anterior.
+        on_chunk (callable, opcional): on_chunk(registros, procesados, total),
+            llamada cada etabs.COLUMN_CHUNK_SIZE frames re-extraidos, desde
+            un hilo de ExtractionPipeline.
+
+    Returns:
+        tuple: (cols_data, gridlines_data) con el mismo formato que
+        etabs.get_story_lable_col_name.
+    """
+    if sap_model is None:
+        logger.error("El objeto SapModel proporcionado no es válido.")
+        return [], None
+
+    cache = cache if cache is not None else ModelPropertyCache(sap_model)
+    points = PointCoordinateResolver(sap_model)
+
+    model_filename = sap_model.GetModelFilename()
+    stories = get_stories_with_elevations(sap_model)
+    number_names, mynames, mylabels, mystories, ret = (
+        sap_model.FrameObj.GetLabelNameList()
+    )
+    frames = list(zip(mynames, mylabels, mystories))
+
+    # La clasificacion por nivel depende de todos los niveles: si cambian,
+    # o si es otro modelo, no se puede reutilizar nada.
+    if snapshot.is_empty() or snapshot.model_filename != model_filename or snapshot.stories != stories:
+        logger.info("Extraccion incremental: no hay datos previos validos, se extrae todo el modelo.")
+        snapshot.fingerprints = {}
+        snapshot.records = {}
+
+    fingerprints = get_frame_fingerprints(sap_model, frames, cache, points)
+
+    changed_frames = [
+        frame for frame in frames
+        if snapshot.fingerprints.get(frame[0]) != fingerprints[frame[0]]
+    ]
+    deleted_frames = [name for name in snapshot.records if name not in fingerprints]
+
+    for frame_name in deleted_frames:
+        del snapshot.records[frame_name]
+
+    for frame_name, _, _ in changed_frames:
+        snapshot.records[frame_name] = None
+
+    def store_chunk(records, processed, total):
+        for record in records:
+            snapshot.records[record["col_id"]] = record
+        if on_chunk is not None:
+            on_chunk(records, processed, total)
+
+    # Si se re-extraen todos los frames, el pipeline asigna GridLine y
+    # detalles mientras se leen las ultimas partes
+    full_extraction = len(changed_frames) == len(frames) and not deleted_frames
+    pipeline = ExtractionPipeline(sap_model, cache=cache, points=points)
+    full_result = pipeline.run(changed_frames, stories, store_chunk, build=full_extraction)
+
+    snapshot.model_filename = model_filename
+    snapshot.stories = stories
+    snapshot.fingerprints = fingerprints
+
+    logger.info(
+        f"Extraccion incremental: {len(changed_frames)} frames nuevos o modificados, "
+        f"{len(deleted_frames)} eliminados, "
+        f"{len(frames) - len(changed_frames)} sin cambios."
+    )
+    cache.print_stats()
+
+    if full_extraction:
+        return full_result
+    # GridLine y detalle DC-n se renumeran en memoria para que coincidan con
+    # los de una extraccion completa.
+    return build_cols_and_gridlines(snapshot.column_data(), units=model_units(sap_model))
+
+
+def _same_value(a, b):
+    # NaN es igual a NaN para no marcar como cambiadas filas iguales
+    return a == b or (a != a and b != b)
+
+
+def diff_column_records(previous, current, key="col_id"):
+    """
+    Compara dos extracciones de columnas por col_id, para actualizar solo
+    las filas que cambiaron (por ejemplo en ColumnDataScreen).
+
+    Args:
+        previous, current: Listas de registros o ColumnTable.
+
+    Returns:
+        dict: 'updated' (registros de current con algun campo distinto,
+        incluido GridLine o detalle renumerados), 'added' (registros nuevos,
+        en el orden de current) y 'removed' (col_id que ya no estan).
+    """
+    previous_by_id = {record[key]: record for record in previous}
+    updated = []
+    added = []
+    current_ids = set()
+    for record in current:
+        current_ids.add(record[key])
+        old = previous_by_id.get(record[key])
+        if old is None:
+            added.append(record)
+        elif old.keys() != record.keys() or not all(_same_value(old[k], record[k]) for k in record):
+            updated.append(record)
+    removed = [col_id for col_id in previous_by_id if col_id not in current_ids]
+    return {"updated": updated, "added": added, "removed": removed}
@@ -0,0 +1,226 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from core.log import get_logger
+from core.property_cache import ModelPropertyCache
+
+logger = get_logger(__name__)
+
+# Claves del registro de columna que salen del armado de la seccion
+# (PropFrame.GetRebarColumn)
+REBAR_FIELDS = (
+    "Long. Rebar Mat.", "Mat. Estribo", "Rebar", "r2_bars", "r3_bars", "number_bars",
+    "Est. Rebar", "estribo_r2", "estribo_r3", "cover", "As",
+)
+
+
+def rebar_fields(rebar_data):
+    """
+    Campos de armado del registro de columna a partir del resultado de
+    GetRebarColumn de su seccion.
+    """
+    info = {}
+    info["Long. Rebar Mat."] = rebar_data[0]
+    info["Mat. Estribo"] = rebar_data[1]
+    info["Rebar"] = rebar_data[8]
+    info["r2_bars"] = rebar_data[6]
+    info["r3_bars"] = rebar_data[7]
+    info["number_bars"] = None
+    if rebar_data[6]:
+        if rebar_data[7]:
+            info["number_bars"] = (2 * rebar_data[6]) + (
+                2 * (rebar_data[7] - 2)
+            )
+
+    info["Est. Rebar"] = rebar_data[9]
+    info["estribo_r2"] = rebar_data[11]
+    info["estribo_r3"] = rebar_data[12]
+    info["cover"] = rebar_data[4]
+    info["As"] = f"{info['number_bars']} {info['Rebar']}"
+    return info
+
+
+class _DeferredFuture:
+    """Resultado que se calcula en el hilo que lo pide por primera vez."""
+    def __init__(self, load):
+        self._load = load
+        self._lock = threading.Lock()
+        self._done = False
+        self._result = None
+
+    def done(self):
+        return self._done
+
+    def result(self):
+        with self._lock:
+            if not self._done:
+                self._result = self._load()
+                self._done = True
+        return self._result
+
+
+class _FallbackFuture:
+    """
+    Resultado del hilo de armado; si alli no se pudo cargar, se calcula en
+    el hilo que lo pide (ver _DeferredFuture).
+    """
+    def __init__(self, future, load):
+        self._future = future
+        self._fallback = _DeferredFuture(load)
+
+    def done(self):
+        return self._future.done()
+
+    def result(self):
+        try:
+            return self._future.result()
+        except Exception:
+            return self._fallback.result()
+
+
+class RebarLoader:
+    """
+    Armado de las secciones de columna (GetRebarColumn) cargado aparte de la
+    geometria, para poder mostrar la tabla de columnas antes de tenerlo.
+
+    future(seccion) devuelve un objeto con result() por seccion; cada seccion
+    se pide a ETABS una sola vez.
+
+    Args:
+        sap_model: El objeto SapModel activo de la API de ETABS.
+        model_factory (callable, opcional): Si se da, el armado se carga en
+            segundo plano en un hilo propio, que inicializa su apartamento COM
+            y obtiene su SapModel con model_factory (por ejemplo
+            etabs.obtener_sapmodel_etabs). Si no, o si model_factory no
+            devuelve un SapModel, cada seccion se carga en el hilo que pide
+            el resultado por primera vez, con sap_model.
+    """
+    def __init__(self, sap_model, model_factory=None):
+        self.sap_model = sap_model
+        self.model_factory = model_factory
+        self._futures = {}
+        self._lock = threading.Lock()
+        self._executor = None
+        self._thread_state = threading.local()
+        # True si el hilo de armado no pudo obtener su SapModel
+        self._background_failed = False
+        if model_factory is not None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="armado", initializer=self._init_thread
+            )
+        self._cache = ModelPropertyCache(sap_model)
+
+    def _init_thread(self):
+        # El apartamento COM queda abierto mientras viva el hilo
+        from core.parallel_extraction import com_apartment
+        self._thread_state.apartment = com_apartment()
+        self._thread_state.apartment.__enter__()
+        # Si el initializer lanza una excepcion el ThreadPoolExecutor queda
+        # roto: se registra el error y el armado se carga en el hilo que lo pide
+        self._thread_state.cache = None
+        try:
+            sap_model = self.model_factory()
+        except Exception as e:
+            logger.warning(f"No se pudo obtener el SapModel en el hilo de armado ({e}).")
+            sap_model = None
+        if sap_model is None:
+            logger.warning("El armado se cargara en el hilo de la extraccion.")
+            self._background_failed = True
+            return
+        self._thread_state.cache = ModelPropertyCache(sap_model)
+
+    def _load_background(self, section):
+        if self._thread_state.cache is None:
+            raise RuntimeError("El hilo de armado no tiene SapModel.")
+        return self._thread_state.cache.get_rebar_column(section)
+
+    def _load_here(self, section):
+        return self._cache.get_rebar_column(section)
+
+    def future(self, section):
+        with self._lock:
+            future = self._futures.get(section)
+            if future is None:
+                load = lambda: self._load_here(section)
+                if self._executor is not None and not self._background_failed:
+                    try:
+                        future = _FallbackFuture(self._executor.submit(self._load_background, section), load)
+                    except RuntimeError:
+                        # BrokenThreadPool o executor ya cerrado
+                        pass
+                if future is None:
+                    future = _DeferredFuture(load)
+                self._futures[section] = future
+            return future
+
+    def shutdown(self):
+        if self._executor is not None:
+            try:
+                self._executor.submit(self._close_thread)
+            except RuntimeError:
+                pass
+            self._executor.shutdown(wait=True)
+
+    def _close_thread(self):
+        apartment = getattr(self._thread_state, "apartment", None)
+        if apartment is not None:
+            apartment.__exit__(None, None, None)
+
+
+class LazyColumnRecord(dict):
+    """
+    Registro de columna con la geometria y la seccion, cuyo armado se
+    completa la primera vez que se pide una clave de REBAR_FIELDS (o con
+    load()).
+
+    Args:
+        info (dict): Campos del registro sin el armado.
+        rebar_future: Resultado de RebarLoader.future(seccion).
+    """
+    def __init__(self, info, rebar_future):
+        super().__init__(info)
+        self._rebar_future = rebar_future
+        self._loaded = False
+
+    @property
+    def loaded(self):
+        return self._loaded
+
+    def load(self):
+        if not self._loaded:
+            self.update(rebar_fields(self._rebar_future.result()))
+            self._loaded = True
+        return self
+
+    def __missing__(self, key):
+        if key in REBAR_FIELDS and not self._loaded:
+            self.load()
+            return dict.__getitem__(self, key)
+        raise KeyError(key)
+
+    def get(self, key, default=None):
+        if key in REBAR_FIELDS and not self._loaded:
+            self.load()
+        return dict.get(self, key, default)
+
+    def available(self):
+        """
+        Copia del registro sin esperar el armado: los campos de armado que
+        aun no se cargaron quedan en None.
+        """
+        if self._loaded or self._rebar_future.done():
+            return dict(self.load())
+        record = dict(self)
+        for key in REBAR_FIELDS:
+            record.setdefault(key, None)
+        return record
+
+
+def complete_records(records):
+    """
+    Espera el armado de todos los registros.
+
+    Returns:
+        list[dict]: Registros completos (diccionarios normales).
+    """
+    return [dict(record.load()) if isinstance(record, LazyColumnRecord) else record for record in records]
@@ -0,0 +1,115 @@
+import logging
+import os
+import time
+from collections import Counter
+
+# Logger raiz de la aplicacion; los modulos usan get_logger(__name__)
+LOGGER_NAME = "cuadro_columnas"
+# Nivel por defecto; se puede cambiar con la variable de entorno
+# CUADRO_COLUMNAS_LOG (DEBUG, INFO, WARNING, ERROR)
+DEFAULT_LEVEL = os.environ.get("CUADRO_COLUMNAS_LOG", "INFO").upper()
+LOG_FORMAT = "%(message)s"
+DEBUG_FORMAT = "%(asctime)s %(levelname)s [%(name)s] %(message)s"
+# Segundos minimos entre dos resumenes de avance de una misma fase
+SUMMARY_INTERVAL = 5.0
+
+
+def configure_logging(level=DEFAULT_LEVEL):
+    """
+    Configura el logger de la aplicacion: mensajes en la consola con el nivel
+    dado. En DEBUG cada mensaje incluye la hora, el nivel y el modulo.
+    """
+    logger = logging.getLogger(LOGGER_NAME)
+    if isinstance(level, str):
+        level = logging.getLevelName(level)
+        if not isinstance(level, int):
+            level = logging.INFO
+    logger.setLevel(level)
+    logger.propagate = False
+
+    handler = next((h for h in logger.handlers if getattr(h, "_cuadro_columnas", False)), None)
+    if handler is None:
+        handler = logging.StreamHandler()
+        handler._cuadro_columnas = True
+        logger.addHandler(handler)
+    handler.setFormatter(logging.Formatter(DEBUG_FORMAT if level <= logging.DEBUG else LOG_FORMAT))
+    return logger
+
+
+def get_logger(name):
+    """
+    Logger de un modulo, hijo del logger de la aplicacion.
+
+    Uso:
+        logger = get_logger(__name__)
+        logger.info("Mensaje")
+    """
+    root = logging.getLogger(LOGGER_NAME)
+    if not root.handlers:
+        configure_logging()
+    return root.getChild(name)
+
+
+class PhaseSummary:
+    """
+    Cuenta los eventos de una fase de la extraccion (columnas procesadas,
+    secciones omitidas, ...) en lugar de escribir un mensaje por elemento.
+
+    Mientras la fase avanza se escribe como maximo un resumen cada
+    interval segundos y al terminar (fin de "with" o finish()) un resumen
+    final. Los mensajes de cada elemento solo se escriben en DEBUG.
+
+    Uso:
+        with PhaseSummary(logger, "Extraccion de columnas", total=n) as phase:
+            for frame in frames:
+                ...
+                phase.count("columnas")
+    """
+    def __init__(self, logger, phase, total=None, interval=SUMMARY_INTERVAL):
+        self.logger = logger
+        self.phase = phase
+        self.total = total
+        self.interval = interval
+        self.counts = Counter()
+        self.processed = 0
+        self._start = time.perf_counter()
+        self._last_summary = self._start
+        self._finished = False
+
+    def count(self, event, amount=1):
+        self.counts[event] += amount
+
+    def step(self, amount=1):
+        """Marca elementos procesados y escribe el avance si ya paso el intervalo."""
+        self.update(self.processed + amount)
+
+    def update(self, processed, total=None):
+        self.processed = processed
+        if total is not None:
+            self.total = total
+        now = time.perf_counter()
+        if now - self._last_summary >= self.interval:
+            self._last_summary = now
+            self.logger.info(f"{self.phase}: {self._progress()} ({self._counts_text()})")
+
+    def _progress(self):
+        if self.total:
+            return f"{self.processed}/{self.total}"
+        return f"{self.processed}"
+
+    def _counts_text(self):
+        return ", ".join(f"{event}: {count}" for event, count in self.counts.items()) or "sin eventos"
+
+    def finish(self):
+        if self._finished:
+            return
+        self._finished = True
+        elapsed = time.perf_counter() - self._start
+        self.logger.info(f"{self.phase} terminada en {elapsed:.2f} s: {self._counts_text()}.")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.finish()
+        return False
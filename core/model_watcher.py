@@ -0,0 +1,129 @@
+import os
+import threading
+import time
+
+from core.log import get_logger
+
+logger = get_logger(__name__)
+
+# Segundos entre dos consultas del estado del modelo
+POLL_INTERVAL = 3.0
+# Segundos que el estado debe quedar sin cambios antes de avisar; ETABS
+# escribe el archivo en varias etapas al guardar
+DEBOUNCE = 2.0
+
+
+def read_model_state(sap_model):
+    """
+    Estado barato del modelo abierto para detectar cambios: archivo, fecha
+    de modificacion y tamano del archivo en disco (cambian al guardar) y
+    numero de frames (FrameObj.Count).
+
+    Returns:
+        tuple: (archivo, mtime_ns, tamano, frames); mtime_ns y tamano son
+        None si el modelo no esta guardado.
+    """
+    model_filename = sap_model.GetModelFilename()
+    mtime_ns = size = None
+    if model_filename:
+        try:
+            stat = os.stat(model_filename)
+            mtime_ns, size = stat.st_mtime_ns, stat.st_size
+        except OSError:
+            pass
+    return model_filename, mtime_ns, size, sap_model.FrameObj.Count()
+
+
+class ModelWatcher:
+    """
+    Vigila el modelo de ETABS en un hilo propio y llama a on_change cuando
+    cambia (por ejemplo al guardarlo), para re-extraer sin que el usuario
+    vuelva a pulsar "Identificar columnas".
+
+    Cada interval segundos se lee read_model_state. Un cambio se avisa una
+    sola vez, cuando el estado lleva debounce segundos sin volver a cambiar.
+    Los errores al consultar (ETABS ocupado guardando) se ignoran hasta la
+    consulta siguiente.
+
+    Args:
+        on_change (callable): on_change(estado), llamada desde el hilo del
+            vigilante.
+        sap_model: SapModel para consultar el estado. Solo se puede usar si
+            es valido en el hilo del vigilante (por ejemplo un modelo falso).
+        model_factory (callable, opcional): Si se da, el hilo inicializa su
+            apartamento COM y obtiene su SapModel con model_factory (por
+            ejemplo etabs.obtener_sapmodel_etabs), igual que RebarLoader.
+        interval (float): Segundos entre consultas.
+        debounce (float): Segundos sin cambios antes de llamar a on_change.
+    """
+    def __init__(self, on_change, sap_model=None, model_factory=None, interval=POLL_INTERVAL, debounce=DEBOUNCE):
+        if sap_model is None and model_factory is None:
+            raise ValueError("Se necesita sap_model o model_factory.")
+        self.on_change = on_change
+        self.sap_model = sap_model
+        self.model_factory = model_factory
+        self.interval = interval
+        self.debounce = debounce
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="vigilante-modelo", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def _run(self):
+        if self.model_factory is None:
+            self._watch(self.sap_model)
+            return
+        # El apartamento COM queda abierto mientras viva el hilo
+        from core.parallel_extraction import com_apartment
+        with com_apartment():
+            sap_model = self.model_factory()
+            if sap_model is None:
+                logger.error("No se pudo obtener el SapModel para vigilar el modelo.")
+                return
+            self._watch(sap_model)
+
+    def _poll(self, sap_model):
+        try:
+            return read_model_state(sap_model)
+        except Exception as e:
+            logger.debug(f"No se pudo leer el estado del modelo: {e}")
+            return None
+
+    def _watch(self, sap_model):
+        baseline = self._poll(sap_model)
+        pending = None
+        pending_since = None
+        while not self._stop.wait(self.interval):
+            state = self._poll(sap_model)
+            if state is None:
+                continue
+            if baseline is None:
+                baseline = state
+                continue
+            if state == baseline:
+                pending = None
+                continue
+            if state != pending:
+                # Cambio nuevo (o el archivo sigue escribiendose): esperar
+                pending, pending_since = state, time.monotonic()
+                continue
+            if time.monotonic() - pending_since >= self.debounce:
+                logger.info(f"El modelo cambio ({state[0]}); se actualizan las columnas.")
+                baseline, pending = state, None
+                try:
+                    self.on_change(state)
+                except Exception:
+                    logger.exception("Error al procesar el cambio del modelo.")
@@ -0,0 +1,202 @@
+import math
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+
+try:
+    import comtypes
+except ImportError:
+    comtypes = None
+
+from core import etabs
+from core.column_processing import build_cols_and_gridlines
+from core.log import get_logger
+from core.point_coordinates import PointCoordinateResolver
+from core.property_cache import ModelPropertyCache
+from core.stories import get_stories_with_elevations
+from core.units import model_units
+
+logger = get_logger(__name__)
+
+# Numero de hilos por defecto de la extraccion paralela
+DEFAULT_WORKERS = 4
+# Partes por hilo: mas partes permiten reportar avance mas seguido
+SHARDS_PER_WORKER = 4
+# Frames que se extraen primero en serie para medir la aceleracion
+CALIBRATION_FRAMES = 50
+# Por debajo de esta aceleracion se considera que ETABS atiende en serie
+MIN_USEFUL_SPEEDUP = 1.2
+
+
+@contextmanager
+def com_apartment():
+    """Inicializa COM en el hilo actual, si comtypes esta disponible."""
+    if comtypes is None:
+        yield
+        return
+    comtypes.CoInitialize()
+    try:
+        yield
+    finally:
+        comtypes.CoUninitialize()
+
+
+def split_shards(frames, n_shards):
+    """Divide la lista de frames en n_shards partes contiguas, en orden."""
+    if not frames:
+        return []
+    shard_size = math.ceil(len(frames) / max(1, n_shards))
+    return [frames[start:start + shard_size] for start in range(0, len(frames), shard_size)]
+
+
+class ParallelColumnExtractor:
+    """
+    Extrae los registros de columnas repartiendo los frames entre varios
+    hilos.
+
+    Un objeto COM solo puede usarse en el apartamento (hilo) donde se obtuvo,
+    por lo que cada hilo inicializa su propio apartamento COM y obtiene su
+    propia referencia al SapModel con model_factory (por defecto
+    etabs.obtener_sapmodel_etabs, que la obtiene de la instancia activa de
+    ETABS). Cada hilo usa su propio ModelPropertyCache.
+
+    Las coordenadas de los puntos se leen una sola vez en el hilo que llama
+    (PointObj.GetAllPoints) y se comparten entre los hilos; cada hilo consulta
+    los puntos que falten con su propio SapModel
+    (PointCoordinateResolver.share).
+
+    ETABS puede atender las llamadas de la API en serie; en ese caso varios
+    hilos no aceleran la extraccion. Por eso los primeros frames se extraen en
+    serie para medir el tiempo por frame y se reporta la aceleracion medida.
+
+    Args:
+        sap_model: SapModel del hilo que llama.
+        workers (int): Numero de hilos.
+        model_factory (callable, opcional): Devuelve un SapModel valido en el
+            hilo actual. Con un SapModel falso que se pueda usar desde varios
+            hilos se puede pasar lambda: sap_model.
+    """
+    def __init__(self, sap_model, workers=DEFAULT_WORKERS, model_factory=None):
+        self.sap_model = sap_model
+        self.workers = max(1, int(workers))
+        self.model_factory = model_factory if model_factory is not None else etabs.obtener_sapmodel_etabs
+        self.last_report = None
+        self._shared_points = None
+
+    def _get_points(self, sap_model):
+        # El resolver del hilo que llama esta ligado a su SapModel: los hilos
+        # solo leen sus puntos ya cargados
+        return self._shared_points.share(sap_model)
+
+    def _extract_shard(self, shard, stories):
+        with com_apartment():
+            sap_model = self.model_factory()
+            if sap_model is None:
+                raise RuntimeError("No se pudo obtener el SapModel en el hilo de extraccion.")
+            cache = ModelPropertyCache(sap_model)
+            return etabs.extract_column_records(
+                sap_model, shard, stories, cache, self._get_points(sap_model)
+            )
+
+    def extract(self, frames, stories, on_chunk=None):
+        """
+        Args:
+            frames (list[tuple]): (nombre, label, story) de cada frame.
+            stories (list[dict]): Niveles de get_stories_with_elevations.
+            on_chunk (callable, opcional): on_chunk(registros, procesados,
+                total), llamada desde el hilo que llama cada vez que termina
+                una parte.
+
+        Returns:
+            list[dict]: Registros crudos de columnas en el mismo orden que la
+            extraccion en serie.
+        """
+        total = len(frames)
+        self._shared_points = PointCoordinateResolver(self.sap_model)
+        self._shared_points.load_all_points()
+
+        # Calibracion: los primeros frames se extraen en serie
+        calibration = frames[:min(CALIBRATION_FRAMES, total)]
+        start = time.perf_counter()
+        records = etabs.extract_column_records(
+            self.sap_model, calibration, stories,
+            ModelPropertyCache(self.sap_model), self._shared_points,
+        )
+        serial_time = time.perf_counter() - start
+        processed = len(calibration)
+        if on_chunk is not None:
+            on_chunk(records, processed, total)
+
+        remaining = frames[len(calibration):]
+        shards = split_shards(remaining, self.workers * SHARDS_PER_WORKER)
+        shard_records = [None] * len(shards)
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="etabs") as pool:
+            futures = {
+                pool.submit(self._extract_shard, shard, stories): index
+                for index, shard in enumerate(shards)
+            }
+            for future in as_completed(futures):
+                index = futures[future]
+                shard_records[index] = future.result()
+                processed += len(shards[index])
+                if on_chunk is not None:
+                    on_chunk(shard_records[index], processed, total)
+        parallel_time = time.perf_counter() - start
+
+        # Union en el orden original de los frames
+        for shard_result in shard_records:
+            records.extend(shard_result)
+
+        self.last_report = self._report(len(calibration), serial_time, len(remaining), parallel_time)
+        return records
+
+    def _report(self, calibration_frames, serial_time, parallel_frames, parallel_time):
+        report = {
+            "workers": self.workers,
+            "calibration_frames": calibration_frames,
+            "serial_s_per_frame": serial_time / calibration_frames if calibration_frames else None,
+            "parallel_frames": parallel_frames,
+            "parallel_s": parallel_time,
+            "speedup": None,
+        }
+        if calibration_frames and parallel_frames and parallel_time > 0:
+            estimated_serial = report["serial_s_per_frame"] * parallel_frames
+            report["speedup"] = estimated_serial / parallel_time
+
+        if report["speedup"] is None:
+            logger.info(f"Extraccion paralela ({self.workers} hilos): muy pocos frames para medir la aceleracion.")
+        else:
+            logger.info(
+                f"Extraccion paralela ({self.workers} hilos): {parallel_frames} frames en "
+                f"{parallel_time:.2f} s, aceleracion medida x{report['speedup']:.2f} "
+                f"respecto a la extraccion en serie."
+            )
+            if report["speedup"] < MIN_USEFUL_SPEEDUP:
+                logger.warning(
+                    "ETABS parece atender las llamadas de la API en serie; "
+                    "la extraccion paralela no es mas rapida en este equipo."
+                )
+        return report
+
+
+def get_story_lable_col_name_parallel(sap_model, workers=DEFAULT_WORKERS, model_factory=None, on_chunk=None):
+    """
+    Version paralela de etabs.get_story_lable_col_name.
+
+    Returns:
+        tuple: (cols_data, gridlines_data) con el mismo formato que
+        etabs.get_story_lable_col_name.
+    """
+    if sap_model is None:
+        logger.error("El objeto SapModel proporcionado no es válido.")
+        return [], None
+
+    number_names, mynames, mylabels, mystories, ret = sap_model.FrameObj.GetLabelNameList()
+    stories = get_stories_with_elevations(sap_model)
+    frames = list(zip(mynames, mylabels, mystories))
+
+    extractor = ParallelColumnExtractor(sap_model, workers, model_factory)
+    column_data = extractor.extract(frames, stories, on_chunk)
+    return build_cols_and_gridlines(column_data, units=model_units(sap_model))
@@ -0,0 +1,240 @@
+import queue
+import threading
+import time
+
+import pandas as pd
+
+from core import etabs
+from core.column_processing import build_cols_and_gridlines
+from core.log import get_logger
+from core.point_coordinates import PointCoordinateResolver
+from core.property_cache import ModelPropertyCache
+from core.stories import StoryIndex, get_stories_with_elevations
+from core.units import model_units
+
+logger = get_logger(__name__)
+
+# Partes que pueden esperar entre dos etapas; si la etapa siguiente se
+# atrasa, la anterior se detiene en lugar de acumular datos en memoria
+DEFAULT_QUEUE_SIZE = 4
+# Marca de fin de datos entre etapas
+_DONE = object()
+
+
+class StageStats:
+    """
+    Tiempos de una etapa del pipeline: 'busy_s' es el tiempo trabajando y
+    'wait_s' el tiempo esperando datos de la etapa anterior o espacio en la
+    cola de la siguiente.
+    """
+    def __init__(self, name):
+        self.name = name
+        self.chunks = 0
+        self.items = 0
+        self.busy_s = 0.0
+        self.wait_s = 0.0
+
+    @property
+    def throughput(self):
+        """Elementos por segundo de trabajo de la etapa."""
+        return self.items / self.busy_s if self.busy_s > 0 else None
+
+    def as_dict(self):
+        return {
+            "stage": self.name,
+            "chunks": self.chunks,
+            "items": self.items,
+            "busy_s": self.busy_s,
+            "wait_s": self.wait_s,
+            "items_per_s": self.throughput,
+        }
+
+
+class ExtractionPipeline:
+    """
+    Extraccion de columnas en tres etapas que trabajan a la vez, unidas por
+    colas acotadas:
+
+    1. fetch: lee de ETABS los frames de cada parte (etabs.fetch_column_rows).
+       Corre en el hilo que llama, el unico donde el SapModel es valido.
+    2. normalize: clasifica los extremos por nivel y arma los registros
+       (etabs.normalize_column_rows), en un hilo propio.
+    3. assemble: convierte cada parte en DataFrame, llama a on_chunk y al
+       final asigna GridLine y detalles (build_cols_and_gridlines), en otro
+       hilo.
+
+    Asi el trabajo de pandas de una parte se hace mientras se espera a ETABS
+    por la siguiente. Al terminar, stats tiene los tiempos de cada etapa para
+    ajustar chunk_size y queue_size: la etapa con mas 'busy_s' es la que
+    limita la extraccion.
+
+    Args:
+        sap_model: El objeto SapModel activo de la API de ETABS.
+        chunk_size (int): Frames por parte.
+        queue_size (int): Partes que pueden esperar entre dos etapas.
+        cache (ModelPropertyCache, opcional): Cache de la extraccion.
+        points (PointCoordinateResolver, opcional): Resolver de coordenadas.
+    """
+    def __init__(self, sap_model, chunk_size=etabs.COLUMN_CHUNK_SIZE, queue_size=DEFAULT_QUEUE_SIZE,
+                 cache=None, points=None):
+        self.sap_model = sap_model
+        self.chunk_size = max(1, int(chunk_size))
+        self.queue_size = max(1, int(queue_size))
+        self.cache = cache if cache is not None else ModelPropertyCache(sap_model)
+        self.points = points if points is not None else PointCoordinateResolver(sap_model)
+        self.stats = {}
+
+    def run(self, frames, stories, on_chunk=None, build=True):
+        """
+        Args:
+            frames (list[tuple]): (nombre, label, story) de cada frame.
+            stories (list[dict]): Niveles de get_stories_with_elevations.
+            on_chunk (callable, opcional): on_chunk(registros, procesados,
+                total), llamada desde el hilo de la etapa assemble cada vez
+                que termina una parte.
+            build (bool): Si es False la etapa assemble solo llama a
+                on_chunk y no asigna GridLine ni detalles (por ejemplo si los
+                registros se combinan despues con otros).
+
+        Returns:
+            tuple: (cols_data, gridlines_data) con el mismo formato que
+            etabs.get_story_lable_col_name, o None si build es False.
+        """
+        self.stats = {name: StageStats(name) for name in ("fetch", "normalize", "assemble")}
+        raw_queue = queue.Queue(maxsize=self.queue_size)
+        record_queue = queue.Queue(maxsize=self.queue_size)
+        story_index = StoryIndex(stories)
+        # Se consulta en este hilo: la etapa assemble no usa el SapModel
+        units = model_units(self.sap_model) if build else None
+        total = len(frames)
+        result = {}
+        errors = []
+        received_done = set()
+
+        def normalize():
+            stats = self.stats["normalize"]
+            while True:
+                item = self._get(raw_queue, stats)
+                if item is _DONE:
+                    received_done.add("normalize")
+                    break
+                rows, processed = item
+                start = time.perf_counter()
+                records = etabs.normalize_column_rows(rows, story_index)
+                self._add(stats, start, len(records))
+                self._put(record_queue, (records, processed), stats)
+            self._put(record_queue, _DONE, stats)
+
+        def assemble():
+            stats = self.stats["assemble"]
+            parts = []
+            while True:
+                item = self._get(record_queue, stats)
+                if item is _DONE:
+                    received_done.add("assemble")
+                    break
+                records, processed = item
+                start = time.perf_counter()
+                if records and build:
+                    parts.append(pd.DataFrame(records))
+                if on_chunk is not None:
+                    on_chunk(records, processed, total)
+                self._add(stats, start, len(records))
+            if build:
+                start = time.perf_counter()
+                df_columns = pd.concat(parts, ignore_index=True) if parts else pd.DataFrame()
+                result["data"] = build_cols_and_gridlines(df_columns, units=units)
+                stats.busy_s += time.perf_counter() - start
+
+        def stage(target, source, output):
+            # Si una etapa falla, el error se guarda y la etapa sigue vaciando
+            # su cola de entrada hasta el fin de datos, para que la etapa
+            # anterior no quede bloqueada en una cola llena
+            def runner():
+                try:
+                    target()
+                except BaseException as e:
+                    errors.append(e)
+                    if target.__name__ not in received_done:
+                        while source.get() is not _DONE:
+                            pass
+                    if output is not None:
+                        output.put(_DONE)
+            return threading.Thread(target=runner, name=f"pipeline-{target.__name__}", daemon=True)
+
+        threads = [stage(normalize, raw_queue, record_queue), stage(assemble, record_queue, None)]
+        for thread in threads:
+            thread.start()
+        try:
+            stats = self.stats["fetch"]
+            for chunk_start in range(0, total, self.chunk_size):
+                if errors:
+                    break
+                chunk = frames[chunk_start:chunk_start + self.chunk_size]
+                start = time.perf_counter()
+                rows = etabs.fetch_column_rows(self.sap_model, chunk, self.cache, self.points)
+                self._add(stats, start, len(chunk))
+                self._put(raw_queue, (rows, chunk_start + len(chunk)), stats)
+        finally:
+            self._put(raw_queue, _DONE, self.stats["fetch"])
+            for thread in threads:
+                thread.join()
+        if errors:
+            raise errors[0]
+
+        self.report()
+        return result.get("data")
+
+    @staticmethod
+    def _add(stats, start, items):
+        stats.busy_s += time.perf_counter() - start
+        stats.chunks += 1
+        stats.items += items
+
+    @staticmethod
+    def _get(source, stats):
+        start = time.perf_counter()
+        item = source.get()
+        stats.wait_s += time.perf_counter() - start
+        return item
+
+    @staticmethod
+    def _put(target, item, stats):
+        start = time.perf_counter()
+        target.put(item)
+        stats.wait_s += time.perf_counter() - start
+
+    def report(self):
+        """
+        Returns:
+            list[dict]: StageStats.as_dict() de cada etapa, en orden.
+        """
+        report = [stats.as_dict() for stats in self.stats.values()]
+        for item in report:
+            rate = f"{item['items_per_s']:.0f}/s" if item["items_per_s"] else "-"
+            logger.info(
+                f"Pipeline {item['stage']:<10} {item['items']:>7} elementos, "
+                f"trabajando {item['busy_s']:.2f} s, esperando {item['wait_s']:.2f} s ({rate})"
+            )
+        return report
+
+
+def get_story_lable_col_name_pipeline(sap_model, cache=None, chunk_size=etabs.COLUMN_CHUNK_SIZE,
+                                      queue_size=DEFAULT_QUEUE_SIZE, on_chunk=None):
+    """
+    Version de etabs.get_story_lable_col_name con ExtractionPipeline.
+
+    Returns:
+        tuple: (cols_data, gridlines_data) con el mismo formato que
+        etabs.get_story_lable_col_name.
+    """
+    if sap_model is None:
+        logger.error("El objeto SapModel proporcionado no es válido.")
+        return [], None
+
+    number_names, mynames, mylabels, mystories, ret = sap_model.FrameObj.GetLabelNameList()
+    stories = get_stories_with_elevations(sap_model)
+    frames = list(zip(mynames, mylabels, mystories))
+
+    pipeline = ExtractionPipeline(sap_model, chunk_size, queue_size, cache)
+    return pipeline.run(frames, stories, on_chunk)
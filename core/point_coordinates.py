@@ -0,0 +1,158 @@
+import numpy as np
+
+from core.log import get_logger
+
+logger = get_logger(__name__)
+
+# Arreglo estructurado con una fila por punto: nombre y coordenadas globales
+POINT_DTYPE = np.dtype([
+    ("name", object),
+    ("x", "f8"),
+    ("y", "f8"),
+    ("z", "f8"),
+])
+
+
+class PointCoordinateResolver:
+    """
+    Resuelve las coordenadas de los puntos del modelo en lote.
+
+    En lugar de llamar PointObj.GetCoordCartesian cuatro veces por columna,
+    primero se reunen los nombres de todos los puntos y luego se piden sus
+    coordenadas con PointObj.GetAllPoints (una sola llamada COM). Si esa
+    funcion no esta disponible, cada punto distinto se consulta una sola vez
+    con GetCoordCartesian.
+
+    Las coordenadas se guardan en un arreglo estructurado de NumPy
+    (campos name, x, y, z) con un indice por nombre de punto.
+
+    Args:
+        sap_model: El objeto SapModel activo de la API de ETABS.
+    """
+    def __init__(self, sap_model):
+        self.sap_model = sap_model
+        self.points = np.empty(0, dtype=POINT_DTYPE)
+        self.index = {}
+        # Puntos que ETABS no encontro, para no volver a consultarlos
+        self.missing = set()
+        self.com_calls = 0
+        self._all_points_loaded = False
+        self._all_points_failed = False
+
+    def share(self, sap_model):
+        """
+        Resolver para otro hilo: usa los puntos ya cargados (el arreglo se
+        comparte, sin copiarlo ni modificarlo) y consulta los que falten con
+        sap_model, el SapModel de ese hilo.
+        """
+        resolver = PointCoordinateResolver(sap_model)
+        resolver.points = self.points
+        resolver.index = dict(self.index)
+        resolver.missing = set(self.missing)
+        resolver._all_points_loaded = self._all_points_loaded
+        resolver._all_points_failed = self._all_points_failed
+        return resolver
+
+    def _append(self, names, x, y, z):
+        new_points = np.empty(len(names), dtype=POINT_DTYPE)
+        new_points["name"] = names
+        new_points["x"] = x
+        new_points["y"] = y
+        new_points["z"] = z
+
+        offset = len(self.points)
+        self.points = np.concatenate([self.points, new_points])
+        for i, name in enumerate(names):
+            self.index[name] = offset + i
+
+    def load_all_points(self):
+        """
+        Carga todos los puntos del modelo con PointObj.GetAllPoints.
+
+        Returns:
+            bool: True si los puntos se cargaron, False si hay que consultar
+            punto por punto.
+        """
+        if self._all_points_loaded:
+            return True
+        if self._all_points_failed:
+            return False
+        try:
+            # GetAllPoints(NumberNames, MyName, X, Y, Z, CSys)
+            self.com_calls += 1
+            number_names, names, x, y, z, ret = self.sap_model.PointObj.GetAllPoints(
+                0, [], [], [], [], "Global"
+            )
+        except Exception as e:
+            logger.info(f"PointObj.GetAllPoints no disponible ({e}). Se consultara punto por punto.")
+            self._all_points_failed = True
+            return False
+        if ret != 0:
+            logger.error(f"Error al obtener los puntos del modelo. Código: {ret}")
+            self._all_points_failed = True
+            return False
+
+        self.points = np.empty(0, dtype=POINT_DTYPE)
+        self.index = {}
+        self._append(list(names), x, y, z)
+        self._all_points_loaded = True
+        return True
+
+    def resolve(self, point_names):
+        """
+        Obtiene las coordenadas de todos los puntos indicados. Los puntos ya
+        conocidos no se vuelven a consultar.
+
+        Args:
+            point_names (iterable[str]): Nombres de puntos, pueden repetirse.
+        """
+        missing = [
+            name for name in dict.fromkeys(point_names)
+            if name not in self.index and name not in self.missing
+        ]
+        if not missing:
+            return
+        if self.load_all_points():
+            missing = [name for name in missing if name not in self.index]
+            if not missing:
+                return
+
+        names, x, y, z = [], [], [], []
+        for name in missing:
+            self.com_calls += 1
+            point_x, point_y, point_z, ret = self.sap_model.PointObj.GetCoordCartesian(name)
+            if ret != 0:
+                logger.warning(f"Could not get coordinates for point '{name}'")
+                self.missing.add(name)
+                continue
+            names.append(name)
+            x.append(point_x)
+            y.append(point_y)
+            z.append(point_z)
+        if names:
+            self._append(names, x, y, z)
+
+    def get_xyz(self, point_name):
+        """
+        Devuelve (x, y, z) del punto, consultandolo a ETABS si aun no se conoce.
+
+        Returns:
+            tuple: (x, y, z), o None si el punto no existe.
+        """
+        if point_name not in self.index and point_name not in self.missing:
+            self.resolve([point_name])
+        row = self.index.get(point_name)
+        if row is None:
+            return None
+        point = self.points[row]
+        return float(point["x"]), float(point["y"]), float(point["z"])
+
+    def get_coordinates(self, point_names):
+        """
+        Devuelve las filas del arreglo estructurado para los puntos indicados,
+        en el mismo orden.
+        """
+        point_names = list(point_names)
+        self.resolve(point_names)
+        rows = [self.index[name] for name in point_names]
+        return self.points[rows]
@@ -0,0 +1,112 @@
+from core.log import get_logger
+
+logger = get_logger(__name__)
+
+
+class ModelPropertyCache:
+    """
+    Cache de propiedades de secciones, materiales y barras de refuerzo para
+    una sesion de extraccion.
+
+    Un modelo tiene pocas secciones y materiales distintos, pero la extraccion
+    los consulta una vez por columna. Cada definicion se pide a ETABS una sola
+    vez y las siguientes consultas se responden desde memoria. Los valores
+    devueltos son las mismas tuplas que devuelve la API, para que los
+    extractores puedan desempacarlas igual que antes.
+
+    Crear un objeto nuevo por extraccion: si el modelo cambia, el cache no se
+    invalida.
+
+    Args:
+        sap_model: El objeto SapModel activo de la API de ETABS.
+    """
+    def __init__(self, sap_model):
+        self.sap_model = sap_model
+        self.hits = 0
+        self.misses = 0
+        self._values = {}
+
+    def _get(self, key, fetch):
+        if key in self._values:
+            self.hits += 1
+            return self._values[key]
+
+        self.misses += 1
+        value = fetch()
+        self._values[key] = value
+        return value
+
+    # -- Secciones (PropFrame)
+    def get_section_type(self, section):
+        return self._get(("PropFrame.GetTypeOAPI", section),
+                         lambda: self.sap_model.PropFrame.GetTypeOAPI(section))
+
+    def get_section_material(self, section):
+        return self._get(("PropFrame.GetMaterial", section),
+                         lambda: self.sap_model.PropFrame.GetMaterial(section))
+
+    def get_rectangle(self, section):
+        return self._get(("PropFrame.GetRectangle", section),
+                         lambda: self.sap_model.PropFrame.GetRectangle(section))
+
+    def get_circle(self, section):
+        return self._get(("PropFrame.GetCircle", section),
+                         lambda: self.sap_model.PropFrame.GetCircle(section))
+
+    def get_rebar_column(self, section):
+        return self._get(("PropFrame.GetRebarColumn", section),
+                         lambda: self.sap_model.PropFrame.GetRebarColumn(section))
+
+    def get_rebar_column_1(self, section):
+        return self._get(("PropFrame.GetRebarColumn_1", section),
+                         lambda: self.sap_model.PropFrame.GetRebarColumn_1(section))
+
+    # -- Materiales (PropMaterial)
+    def get_material(self, material):
+        return self._get(("PropMaterial.GetMaterial", material),
+                         lambda: self.sap_model.PropMaterial.GetMaterial(material))
+
+    def get_concrete(self, material):
+        return self._get(("PropMaterial.GetOConcrete_1", material),
+                         lambda: self.sap_model.PropMaterial.GetOConcrete_1(material))
+
+    def get_steel(self, material):
+        return self._get(("PropMaterial.GetOSteel_1", material),
+                         lambda: self.sap_model.PropMaterial.GetOSteel_1(material))
+
+    # -- Barras de refuerzo (PropRebar)
+    def get_rebar_names(self):
+        return self._get(("PropRebar.GetNameList",),
+                         lambda: self.sap_model.PropRebar.GetNameList())
+
+    def get_rebar_props(self, rebar):
+        return self._get(("PropRebar.GetRebarProps", rebar),
+                         lambda: self.sap_model.PropRebar.GetRebarProps(rebar))
+
+    def get_all_rebars(self):
+        """
+        Devuelve las barras definidas con el mismo formato que
+        extractions.get_all_rebars: [{'rebar', 'diameter', 'area'}].
+        """
+        def fetch():
+            number_rebars, tuple_rebar, ret = self.get_rebar_names()
+            rebar_info = []
+            for rebar in tuple_rebar:
+                rebar_area, rebar_diameter, ret = self.get_rebar_props(rebar)
+                rebar_info.append({'rebar': rebar, 'diameter': rebar_diameter, 'area': rebar_area})
+            return rebar_info
+
+        return self._get(("PropRebar.AllRebars",), fetch)
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.0,
+        }
+
+    def print_stats(self):
+        stats = self.stats()
+        logger.info(f"Cache de propiedades: {stats['hits']} aciertos, {stats['misses']} consultas a ETABS "
+                    f"({stats['hit_rate']:.0%} de aciertos).")
@@ -0,0 +1,154 @@
+from core.column_table import ColumnTable
+from core.etabs import MAT_TYPE_CONCRETE, get_fc_concrete, get_fy_steel
+from core.log import get_logger
+from core.property_cache import ModelPropertyCache
+
+logger = get_logger(__name__)
+
+
+def get_column_section_names(sap_model):
+    """
+    Nombres de las secciones asignadas a frames con orientacion de columna.
+    Solo se usa si no se tienen los registros de columnas de la extraccion.
+    """
+    column_section_names = set()
+    num_frames, frame_names, ret = sap_model.FrameObj.GetNameList()
+    if ret != 0:
+        logger.error("Error al obtener la lista de elementos frame.")
+        return column_section_names
+
+    for frame_name in frame_names:
+        design_orientation, ret_orient = sap_model.FrameObj.GetDesignOrientation(frame_name)
+        if ret_orient == 0 and design_orientation == 1:
+            section_name, _, ret_sec = sap_model.FrameObj.GetSection(frame_name)
+            if ret_sec == 0 and section_name:
+                column_section_names.add(section_name)
+    return column_section_names
+
+
+def scan_sections(sap_model, cache=None):
+    """
+    Recorre una sola vez las secciones definidas del modelo
+    (PropFrame.GetNameList).
+
+    Args:
+        sap_model: El objeto SapModel activo de la API de ETABS.
+        cache (ModelPropertyCache, opcional): Cache de la sesion de extraccion.
+
+    Returns:
+        dict:
+            'rect_sections': secciones rectangulares de concreto, con el
+                formato de get_rect_concrete_sections (ColumnDataScreen).
+            'sections': nombres de 'rect_sections'.
+            'column_rebar_sections': secciones rectangulares con armado de
+                columna, con el formato de get_rectangular_concrete_sections.
+    """
+    cache = cache if cache is not None else ModelPropertyCache(sap_model)
+    catalog = {"rect_sections": [], "sections": [], "column_rebar_sections": []}
+
+    num_nombres, nombres_secciones, ret = sap_model.PropFrame.GetNameList()
+    if ret != 0 or num_nombres == 0:
+        logger.warning("No se encontraron secciones de marco definidas o hubo un error al obtenerlas.")
+        return catalog
+
+    logger.info(f"Se encontraron {num_nombres} secciones de marco. Analizando...")
+
+    for nombre_seccion in nombres_secciones:
+        try:
+            # GetRectangle(Name, FileName, MatProp, T3, T2, Color, Notes, GUID)
+            _, mat_prop, t3, t2, _, _, _, ret_rect = cache.get_rectangle(nombre_seccion)
+            if ret_rect != 0:
+                continue
+
+            tipo_mat_int, _, _, _, ret_mat_details = cache.get_material(mat_prop)
+            if ret_mat_details == 0 and tipo_mat_int == MAT_TYPE_CONCRETE:
+                catalog["rect_sections"].append({
+                    "Nombre": nombre_seccion,
+                    "Material": mat_prop,
+                    "Profundidad (T3)": t3,
+                    "Ancho (T2)": t2,
+                })
+                catalog["sections"].append(nombre_seccion)
+
+            # Las secciones sin armado de columna (vigas) devuelven ret != 0
+            mat_prop_rebar, _, _, _, cover, _, num_r3, num_r2, rebar_size, tie_size, _, num_2d_tie, num_3d_tie, _, ret_rebar = (
+                cache.get_rebar_column(nombre_seccion)
+            )
+            if ret_rebar != 0:
+                continue
+
+            catalog["column_rebar_sections"].append({
+                "section": nombre_seccion,
+                "b": t2,
+                "h": t3,
+                "fc": get_fc_concrete(sap_model, mat_prop, cache),
+                "fy": get_fy_steel(sap_model, mat_prop_rebar, cache),
+                "cover": cover,
+                "rebar_size": rebar_size,
+                "num_bars_2": num_r2,
+                "num_bars_3": num_r3,
+                "stirrup_size": tie_size,
+                "num_crossties_2": num_2d_tie,
+                "num_crossties_3": num_3d_tie,
+            })
+
+        except Exception as e:
+            logger.error(f"Excepcion al procesar la seccion: '{nombre_seccion}': {e}")
+            continue
+
+    catalog["column_rebar_sections"].sort(key=lambda section: section["section"])
+    return catalog
+
+
+def select_column_sections(catalog, column_data=None, sap_model=None):
+    """
+    Completa el catalogo de scan_sections con 'rectangular_sections': solo las
+    secciones usadas por columnas.
+
+    Las secciones usadas por columnas se toman de los registros de la
+    extraccion de columnas (column_data), por lo que la lista de frames no se
+    vuelve a recorrer. Si column_data es None se recorren los frames de
+    sap_model.
+    """
+    if column_data is None:
+        column_section_names = get_column_section_names(sap_model)
+    else:
+        sections = ColumnTable.from_records(column_data).get("section", [])
+        column_section_names = {section for section in sections if isinstance(section, str) and section}
+
+    catalog["rectangular_sections"] = [
+        section for section in catalog["column_rebar_sections"]
+        if section["section"] in column_section_names
+    ]
+
+    logger.info(
+        f"Catalogo de secciones: {len(catalog['rect_sections'])} rectangulares de concreto, "
+        f"{len(catalog['rectangular_sections'])} usadas por columnas."
+    )
+    return catalog
+
+
+def build_section_catalog(sap_model, column_data=None, cache=None):
+    """
+    Construye en una sola pasada sobre las secciones del modelo los datos que
+    antes generaban etabs.get_rect_concrete_sections y
+    etabs.get_rectangular_concrete_sections.
+
+    Args:
+        sap_model: El objeto SapModel activo de la API de ETABS.
+        column_data (list[dict], opcional): Registros de columnas con la clave
+            'section'. Si es None se recorren los frames del modelo.
+        cache (ModelPropertyCache, opcional): Cache de la sesion de extraccion.
+
+    Returns:
+        dict:
+            'rect_sections': secciones rectangulares de concreto, con el
+                formato de get_rect_concrete_sections (ColumnDataScreen).
+            'rectangular_sections': secciones rectangulares usadas por
+                columnas con su armado, con el formato de
+                get_rectangular_concrete_sections (SectionDesignerScreen y
+                ConfinementScreen).
+            'sections': nombres de 'rect_sections'.
+    """
+    catalog = scan_sections(sap_model, cache)
+    return select_column_sections(catalog, column_data, sap_model)
@@ -0,0 +1,183 @@
+import numpy as np
+
+from core.log import get_logger
+
+logger = get_logger(__name__)
+
+# Tolerancia para comparar elevaciones de puntos con las de los niveles
+ELEVATION_TOLERANCE = 1e-3
+
+
+def get_story_by_elevation(stories_data, elevation):
+    for story in stories_data:
+        if story["elevacion"] == elevation:
+            return story["nombre"]
+
+    return None
+
+
+def get_next_story(stories, story):
+    for item in range(0, len(stories)):
+        if stories[item]["nombre"] == story:
+            return stories[item + 1]["nombre"]
+    return None
+
+
+def get_stories_with_elevations(sap_model):
+    list_stories_elevations = []
+    try:
+        if sap_model is None:
+            logger.warning("No se pudo obtener el SapModel.")
+            return list_stories_elevations
+
+        num_stories, names_stories, ret = sap_model.Story.GetNameList()
+        if num_stories == 0:
+            logger.warning("No se encontraron stories en el modelo.")
+            return list_stories_elevations
+
+        logger.info(f"Se encontraron {num_stories} niveles en el modelo.")
+
+        for nombre_story in names_stories:
+            elevacion = sap_model.Story.GetElevation(nombre_story)
+
+            story_info = {"nombre": nombre_story, "elevacion": elevacion[0]}
+            list_stories_elevations.append(story_info)
+            # print(f" - Story: {nombre_story}, Elevacion: {elevacion[0]}")
+
+    except Exception as e:
+        logger.error(f"Ocurrio un error inesperado: {e}")
+
+    return list_stories_elevations
+
+def clasificar_punto_por_elevacion(lista_niveles, elevacion_punto):
+    # -- 1.Manejar la lista vacia
+    if not lista_niveles:
+        logger.warning('La lista de niveles esta vacia')
+        return None
+    
+    # -- 2.Ordenar los niveles por de forma ascendente --
+    # Esto es crucial para que la logica funcione correctamente
+    nivels_ordenados = sorted(lista_niveles, key=lambda item: item['elevacion'])
+    
+    # -- 3. Iterar de forma inversa (del nivel mas alto al nivel mas bajo)
+    for nivel_actual in reversed(nivels_ordenados):
+        # -- 4. Comprobar la condicion
+        # Si la elevacion del punto del punto es mayor o igual a la del nivel actual....
+        if elevacion_punto >= nivel_actual['elevacion']:
+            # ... hemos encontrado el nivel correcto.
+            # Como vamos de arriba hacia abajo, este es el primer (y por tanto, el correcto)
+            # nivel que cumple la condicion
+            return nivel_actual['nombre']
+        
+    # -- 5. Manejar caso en donde el punto esta por debajo de todos los niveles --
+    logger.debug(f"El punto con elevacion {elevacion_punto} esta por debajo del nivel mas bajo.")
+    return None
+
+
+class StoryIndex:
+    """
+    Indice de niveles ordenado por elevacion, construido una sola vez por
+    extraccion.
+
+    Reemplaza las busquedas lineales de get_story_by_elevation y
+    clasificar_punto_por_elevacion (que ordena la lista de niveles en cada
+    llamada): todas las elevaciones de un arreglo se clasifican en una sola
+    pasada de numpy.searchsorted, O(n log s).
+
+    Args:
+        stories (list[dict]): Niveles, por ejemplo el resultado de
+            get_stories_with_elevations.
+        name_key (str): Clave del nombre del nivel en cada diccionario.
+        elevation_key (str): Clave de la elevacion en cada diccionario.
+        tolerance (float): Diferencia maxima para considerar que una elevacion
+            coincide con la de un nivel.
+    """
+    def __init__(self, stories, name_key="nombre", elevation_key="elevacion",
+                 tolerance=ELEVATION_TOLERANCE):
+        self.tolerance = tolerance
+        names = [story[name_key] for story in stories]
+        elevations = np.array([story[elevation_key] for story in stories], dtype=float)
+
+        order = np.argsort(elevations, kind="stable")
+        self.elevations = elevations[order]
+        self.names = np.array(names, dtype=object)[order]
+        # Orden original de la lista (el mismo que usa get_next_story)
+        self._names_in_list_order = names
+        self._position = {name: i for i, name in enumerate(names)}
+
+    @classmethod
+    def from_sap_model(cls, sap_model):
+        return cls(get_stories_with_elevations(sap_model))
+
+    def __len__(self):
+        return len(self.names)
+
+    def classify(self, elevations):
+        """
+        Version vectorizada de clasificar_punto_por_elevacion: para cada
+        elevacion devuelve el nivel mas alto que esta en o por debajo de ella.
+
+        Args:
+            elevations (array-like): Elevaciones de los puntos.
+
+        Returns:
+            np.ndarray: Nombres de los niveles (dtype object), None para los
+            puntos que estan por debajo del nivel mas bajo.
+        """
+        elevations = np.asarray(elevations, dtype=float)
+        result = np.full(elevations.shape, None, dtype=object)
+        if not len(self):
+            logger.warning('La lista de niveles esta vacia')
+            return result
+
+        positions = np.searchsorted(self.elevations, elevations + self.tolerance, side="right") - 1
+        found = positions >= 0
+        result[found] = self.names[positions[found]]
+
+        below = np.count_nonzero(~found)
+        if below:
+            logger.info(f"{below} punto(s) estan por debajo del nivel mas bajo.")
+        return result
+
+    def match(self, elevations):
+        """
+        Version vectorizada de get_story_by_elevation: devuelve el nivel cuya
+        elevacion coincide, dentro de la tolerancia, con cada elevacion.
+
+        Returns:
+            np.ndarray: Nombres de los niveles (dtype object), None si ninguna
+            elevacion de nivel coincide.
+        """
+        elevations = np.asarray(elevations, dtype=float)
+        result = np.full(elevations.shape, None, dtype=object)
+        if not len(self):
+            return result
+
+        # El nivel mas cercano es el de la izquierda o el de la derecha del
+        # punto de insercion
+        right = np.clip(np.searchsorted(self.elevations, elevations), 0, len(self) - 1)
+        left = np.clip(right - 1, 0, len(self) - 1)
+        distance_right = np.abs(self.elevations[right] - elevations)
+        distance_left = np.abs(self.elevations[left] - elevations)
+        nearest = np.where(distance_left <= distance_right, left, right)
+        distance = np.minimum(distance_left, distance_right)
+
+        found = distance < self.tolerance
+        result[found] = self.names[nearest[found]]
+        return result
+
+    def classify_one(self, elevation):
+        return self.classify([elevation])[0]
+
+    def match_one(self, elevation):
+        return self.match([elevation])[0]
+
+    def next_story(self, story):
+        """
+        Igual que get_next_story: el nivel que sigue a story en la lista
+        original, o None.
+        """
+        position = self._position.get(story)
+        if position is None or position + 1 >= len(self._names_in_list_order):
+            return None
+        return self._names_in_list_order[position + 1]
@@ -0,0 +1,122 @@
+import numpy as np
+import pandas as pd
+
+# Factores a las unidades canonicas del SI: metro para longitudes, newton
+# para fuerzas y pascal para esfuerzos
+LENGTH_TO_M = {
+    "m": 1.0,
+    "cm": 0.01,
+    "mm": 0.001,
+    "in": 0.0254,
+    "ft": 0.3048,
+}
+FORCE_TO_N = {
+    "N": 1.0,
+    "kN": 1000.0,
+    "kgf": 9.80665,
+    "tonf": 9806.65,
+    "lb": 4.4482216152605,
+    "kip": 4448.2216152605,
+}
+# Esfuerzos con nombre propio; los demas se escriben "fuerza/longitud2"
+# (por ejemplo "kgf/cm2" o "kN/m2")
+STRESS_TO_PA = {
+    "Pa": 1.0,
+    "kPa": 1e3,
+    "MPa": 1e6,
+    "psi": FORCE_TO_N["lb"] / LENGTH_TO_M["in"] ** 2,
+    "ksi": FORCE_TO_N["kip"] / LENGTH_TO_M["in"] ** 2,
+}
+CANONICAL_UNITS = {"length": "m", "force": "N", "stress": "Pa"}
+
+# Codigos de eLength y eForce de la API de ETABS (ver UNITS_* en core.etabs)
+ETABS_LENGTH_UNITS = {1: "in", 2: "ft", 4: "mm", 5: "cm", 6: "m"}
+ETABS_FORCE_UNITS = {1: "lb", 2: "kip", 3: "N", 4: "kN", 5: "kgf", 6: "tonf"}
+
+# Unidades en que Worker.run extrae el modelo (kgf-cm) y en que se muestran
+# los datos en ColumnDataScreen
+MODEL_UNITS = {"length": "cm", "force": "kgf", "stress": "kgf/cm2"}
+
+# Magnitud de cada campo numerico de los registros de columnas, con los
+# nombres internos y con los encabezados de la tabla de ColumnDataScreen
+FIELD_QUANTITIES = {
+    "t3": "length", "t2": "length", "depth": "length", "width": "length",
+    "pos_x": "length", "pos_y": "length", "z_start": "length", "z_end": "length",
+    "cover": "length", "fc": "stress",
+    "Start Z": "length", "End Z": "length", "Cover": "length",
+}
+
+
+def _stress_factor(unit):
+    if unit in STRESS_TO_PA:
+        return STRESS_TO_PA[unit]
+    force, _, length = unit.partition("/")
+    if not length.endswith("2") or force not in FORCE_TO_N or length[:-1] not in LENGTH_TO_M:
+        raise ValueError(f"Unidad de esfuerzo desconocida: {unit}")
+    return FORCE_TO_N[force] / LENGTH_TO_M[length[:-1]] ** 2
+
+
+def to_si_factor(quantity, unit):
+    """Factor que lleva un valor en unit a la unidad canonica de quantity."""
+    if quantity == "length":
+        table = LENGTH_TO_M
+    elif quantity == "force":
+        table = FORCE_TO_N
+    elif quantity == "stress":
+        return _stress_factor(unit)
+    else:
+        raise ValueError(f"Magnitud desconocida: {quantity}")
+    if unit not in table:
+        raise ValueError(f"Unidad de {quantity} desconocida: {unit}")
+    return table[unit]
+
+
+def factor(quantity, from_unit, to_unit):
+    """Factor de conversion de from_unit a to_unit."""
+    if from_unit == to_unit:
+        return 1.0
+    return to_si_factor(quantity, from_unit) / to_si_factor(quantity, to_unit)
+
+
+def convert(values, quantity, from_unit, to_unit):
+    """
+    Convierte un valor o una columna completa de valores con una sola
+    multiplicacion de NumPy. Los textos numericos se leen como numeros y los
+    valores vacios o no numericos quedan en NaN.
+
+    Uso:
+        convert(df["depth"], "length", "cm", "mm")
+
+    Returns:
+        float o np.ndarray: Segun lo que se pase en values.
+    """
+    if np.ndim(values) == 0:
+        return float(values) * factor(quantity, from_unit, to_unit)
+    array = np.asarray(values)
+    if array.dtype.kind not in "biuf":
+        array = pd.to_numeric(pd.Series(array, dtype=object), errors="coerce").to_numpy(dtype=float)
+    return array.astype(float, copy=False) * factor(quantity, from_unit, to_unit)
+
+
+def units_from_etabs(force, length):
+    """
+    Unidades (como MODEL_UNITS) a partir de los codigos eForce y eLength de
+    SetPresentUnits_2 / GetPresentUnits_2.
+    """
+    force_unit = ETABS_FORCE_UNITS[force]
+    length_unit = ETABS_LENGTH_UNITS[length]
+    return {"length": length_unit, "force": force_unit, "stress": f"{force_unit}/{length_unit}2"}
+
+
+def model_units(sap_model):
+    """
+    Unidades actuales del modelo abierto, o None si ETABS no las entrega o
+    no son de las conocidas.
+    """
+    try:
+        force, length, _temperature, ret = sap_model.GetPresentUnits_2()
+        if ret != 0:
+            return None
+        return units_from_etabs(force, length)
+    except (AttributeError, KeyError, TypeError, ValueError):
+        return None
@@ -37,9 +37,12 @@ from PyQt5.QtWidgets import (
 from PyQt5.QtGui import QFont, QPixmap 
 from PyQt5.QtCore import Qt, QSize, QT_VERSION_STR, PYQT_VERSION_STR
 
+import numpy as np
 import pandas as pd
 
-from core import create_column_table, export_excel, etabs
+from core import create_column_table, export_excel, etabs, incremental
+from core.column_table import ColumnTable
+from core.units import MODEL_UNITS, convert
 
 from screens.identify_column import IdentificarColumnasScreen
 from screens.info_gridlines_2 import InfoGridLinesScreen # modificacion
@@ -78,6 +81,9 @@ class ColumnDataScreen(QWidget):
         
         self.identificar_columnas_screen = None
         self.data_columns_for_render = None
+        # Registro mostrado en cada fila, por col_id, para actualizar solo
+        # las filas que cambian cuando se vuelve a leer el modelo
+        self._registros_por_id = {}
         
         self.setWindowTitle("Detalle y Gestión de Columnas - ETABS")
         self.setGeometry(50, 50, 1300, 750) # Size based on complexity
@@ -95,10 +101,18 @@ class ColumnDataScreen(QWidget):
         self.btn_guardar_datos = QPushButton("Guardar Datos")
         self.btn_exportar_planos = QPushButton("Exportar DXF")
         self.btn_actualizar_modelo = QPushButton("Actualizar el Modelo")
+        # Columna de la tabla por la que se separa el cuadro de Excel en
+        # hojas (export_excel.generate_partitioned_excel)
+        self.combo_particion_excel = QComboBox()
+        self.combo_particion_excel.addItem("Cuadro unico", None)
+        for clave in ("Group", "Story", "Sección", "GridLine"):
+            self.combo_particion_excel.addItem(f"Una hoja por {clave}", clave)
+        self.combo_particion_excel.setToolTip("Separar el cuadro de columnas de Excel en hojas")
        
         
         # top_button_layout.addWidget(self.btn_modificar_columnas)
         top_button_layout.addWidget(self.btn_exportar_excel)
+        top_button_layout.addWidget(self.combo_particion_excel)
         top_button_layout.addWidget(self.btn_guardar_datos)
         top_button_layout.addWidget(self.btn_exportar_planos)
         top_button_layout.addWidget(self.btn_actualizar_modelo)
@@ -185,156 +199,14 @@ class ColumnDataScreen(QWidget):
         group_rectangular_layout = QVBoxLayout()
         lbl_rectangular_armado = QLabel("[Rectangular] Armado transversal")
         lbl_rectangular_resultados = QLabel("[Rectangular] Resultados")
-        self.table_rectangular_armado = QTableWidget(len(column_data), 27) # Filas, Columnas de ejemplo
+        self.table_rectangular_armado = QTableWidget(0, 27) # Filas, Columnas de ejemplo
         self.table_rectangular_armado.setHorizontalHeaderLabels(["Story","GridLine","Frame_id","Start Z", "End Z" ,"Label","Sección", "depth","width",
                                                                  "Material", "Long. R2 Bars", "Long. R3 Bars","Rebar",
                                                                  "Mat. Est.","Rebar. Est.","estribo_r2","estribo_r3","Cover","Detalle No.","bxh","As",
                                                                  "fc","Rebar Estribo", "nivel start", "nivel end","start_end_level","Group"])
         
-        print(column_data[0].keys())
-        print(column_data[0])
-        
-        
         # Configure QTable
-        for col_idx, col in enumerate(column_data):
-            
-            # Col 0: Piso
-            item_piso = QTableWidgetItem(col['story'])
-            self.table_rectangular_armado.setItem(col_idx, 0, item_piso)
-            
-            # Col 1: GridLine
-            item_gridline = QTableWidgetItem(str(col['GridLine']))
-            self.table_rectangular_armado.setItem(col_idx, 1, item_gridline)
-            
-            # Col 2: Frame id
-            item_frame_id = QTableWidgetItem(col['col_id'])
-            self.table_rectangular_armado.setItem(col_idx, 2, item_frame_id)
-            
-            # Col 3: z start
-            item_frame_id = QTableWidgetItem(str(col['z_start']))
-            self.table_rectangular_armado.setItem(col_idx, 3, item_frame_id)
-            
-            # Col 4: Frame id
-            item_frame_id = QTableWidgetItem(str(col['z_end']))
-            self.table_rectangular_armado.setItem(col_idx, 4, item_frame_id)
-            
-            # Col 5: Label
-            item_label = QTableWidgetItem(col['label'])
-            self.table_rectangular_armado.setItem(col_idx, 5, item_label)
-            
-            # Col 6: Section
-            combo_section = QComboBox()
-            combo_section.addItems(rect_sections)
-            
-            if col['section'] in rect_sections:
-                combo_section.setCurrentText(col['section'])
-            else:
-                print(f"Advertencia: El valor inicial '{col['section']}' para la fila {col_idx}")
-                print(f"No se encuentra en las opciones del ComboBox")
-                
-            # item_section = QTableWidgetItem(col['section'])
-            self.table_rectangular_armado.setCellWidget(col_idx, 6, combo_section)
-            
-            # Optional: Conectar signal para saber cuando cambia la seleccion
-            # Usamos lambda para pasar la fila y el combobox a la funcion
-            
-            
-            # Col 7: depthssss
-            item_depth = QTableWidgetItem(str(col['depth']))
-            self.table_rectangular_armado.setItem(col_idx, 7, item_depth)
-            
-            # Col 8: width
-            item_width = QTableWidgetItem(str(col['width']))
-            self.table_rectangular_armado.setItem(col_idx, 8, item_width)
-            
-            # Col 9: Material
-            item_material = QTableWidgetItem(col['material'])
-            self.table_rectangular_armado.setItem(col_idx, 9, item_material)
-            
-            # Col 10: Long. R2 Bars
-            item_r2_bars = QTableWidgetItem(str(col['r2_bars']))
-            self.table_rectangular_armado.setItem(col_idx, 10, item_r2_bars)
-            
-            # Col 11: Long. R3 Bars
-            item_r3_bars = QTableWidgetItem(str(col['r3_bars']))
-            self.table_rectangular_armado.setItem(col_idx, 11, item_r3_bars)
-            
-            # Col 12: Rebar #
-            combo_rebar = QComboBox()
-            combo_rebar.addItems(rebars)
-            if col['Rebar'] in rebars:
-            #     indice = rebars.index(col['Rebar'])
-                combo_rebar.setCurrentText(col['Rebar'])
-            else:
-                print(f"Advertencia: El valor inicial '{col['Rebar']}' para la fila {col_idx}")
-                print(f"No se encuentra en las opciones del ComboBox")
-            self.table_rectangular_armado.setCellWidget(col_idx, 12, combo_rebar)
-            # item_rebar = QTableWidgetItem(col['Rebar'])
-            # self.table_rectangular_armado.setItem(col_idx, 12, combo_rebar)
-            
-            # Col 13: Mat. Est
-            item_mat_est = QTableWidgetItem(col['Mat. Estribo'])
-            self.table_rectangular_armado.setItem(col_idx, 13, item_mat_est)
-            
-            # Col 14: Rebar Est.
-            combo_rebar_est = QComboBox()
-            combo_rebar_est.addItems(rebars)
-            if col['Est. Rebar'] in rebars:
-                combo_rebar_est.setCurrentText(col['Est. Rebar'])
-            else:
-                print(f"Advertencia: El valor inicial '{col['Est. Rebar']}' para la fila {col_idx}")
-                print(f"No se encuentra en las opciones del ComboBox")
-            self.table_rectangular_armado.setCellWidget(col_idx, 14, combo_rebar_est)
-            
-            # Col 15: estribo_r2
-            item_estribo_r2 = QTableWidgetItem(str(col.get('estribo_r2', '')))
-            self.table_rectangular_armado.setItem(col_idx, 15,item_estribo_r2)
-            
-            # col 16: estribo_r3
-            item_estribo_r3 = QTableWidgetItem(str(col.get('estribo_r3', '')))
-            self.table_rectangular_armado.setItem(col_idx, 16, item_estribo_r3)
-            
-            
-            # Col 17: Cover
-            item_cover = QTableWidgetItem(str(col['cover']))
-            self.table_rectangular_armado.setItem(col_idx, 17,item_cover)
-            
-            # Col 18: Detalle #
-            item_detalle = QTableWidgetItem(col['detail'])
-            self.table_rectangular_armado.setItem(col_idx, 18,item_detalle)
-            
-            # Col 19: Detalle #
-            item_detalle = QTableWidgetItem(col['bxh'])
-            self.table_rectangular_armado.setItem(col_idx, 19,item_detalle)
-            
-            # Col 20: Detalle #
-            item_detalle = QTableWidgetItem(col['As'])
-            self.table_rectangular_armado.setItem(col_idx, 20,item_detalle)
-            
-            # Col 21: Detalle #
-            item_detalle = QTableWidgetItem(str(col['fc']))
-            self.table_rectangular_armado.setItem(col_idx, 21,item_detalle)
-            
-            # Col 22: Estribo Barra #
-            item_est_rebar = QTableWidgetItem(col['Est. Rebar'])
-            self.table_rectangular_armado.setItem(col_idx, 22,item_est_rebar)
-            
-            # Col 23: Start Level
-            item_start_level = QTableWidgetItem(col['nivel_start'])
-            self.table_rectangular_armado.setItem(col_idx, 23, item_start_level)
-            
-            # Col 24
-            item_end_level = QTableWidgetItem(col['nivel_end'])
-            self.table_rectangular_armado.setItem(col_idx, 24, item_end_level)
-            
-             # Col 25: start end level
-            item_end_level = QTableWidgetItem(col['start_end_level'])
-            self.table_rectangular_armado.setItem(col_idx, 25,item_end_level)
-            
-            # Col 26: Column Group
-            item_col_group = QTableWidgetItem()
-            self.table_rectangular_armado.setItem(col_idx, 26, item_col_group)
-            
+        self.agregar_filas(column_data if column_data is not None else [])
             
         self.table_rectangular_armado.resizeColumnsToContents()
         # self.table_rectangular_armado.resizeRowToContents()
@@ -395,6 +267,205 @@ class ColumnDataScreen(QWidget):
 
         self.apply_styles() # Aplicar algunos estilos básicos
         
+    def _llenar_fila(self, col_idx, col):
+        """
+        Llena la fila col_idx de la tabla con los datos de una columna.
+        """
+        
+        # Col 0: Piso
+        item_piso = QTableWidgetItem(col['story'])
+        self.table_rectangular_armado.setItem(col_idx, 0, item_piso)
+        
+        # Col 1: GridLine
+        item_gridline = QTableWidgetItem(str(col.get('GridLine', '')))
+        self.table_rectangular_armado.setItem(col_idx, 1, item_gridline)
+        
+        # Col 2: Frame id
+        item_frame_id = QTableWidgetItem(col['col_id'])
+        self.table_rectangular_armado.setItem(col_idx, 2, item_frame_id)
+        
+        # Col 3: z start
+        item_frame_id = QTableWidgetItem(str(col['z_start']))
+        self.table_rectangular_armado.setItem(col_idx, 3, item_frame_id)
+        
+        # Col 4: Frame id
+        item_frame_id = QTableWidgetItem(str(col['z_end']))
+        self.table_rectangular_armado.setItem(col_idx, 4, item_frame_id)
+        
+        # Col 5: Label
+        item_label = QTableWidgetItem(col['label'])
+        self.table_rectangular_armado.setItem(col_idx, 5, item_label)
+        
+        # Col 6: Section
+        combo_section = QComboBox()
+        combo_section.addItems(self.rect_sections)
+        
+        if col['section'] in self.rect_sections:
+            combo_section.setCurrentText(col['section'])
+        else:
+            print(f"Advertencia: El valor inicial '{col['section']}' para la fila {col_idx}")
+            print(f"No se encuentra en las opciones del ComboBox")
+            
+        # item_section = QTableWidgetItem(col['section'])
+        self.table_rectangular_armado.setCellWidget(col_idx, 6, combo_section)
+        
+        # Optional: Conectar signal para saber cuando cambia la seleccion
+        # Usamos lambda para pasar la fila y el combobox a la funcion
+        
+        
+        # Col 7: depthssss
+        item_depth = QTableWidgetItem(str(col['depth']))
+        self.table_rectangular_armado.setItem(col_idx, 7, item_depth)
+        
+        # Col 8: width
+        item_width = QTableWidgetItem(str(col['width']))
+        self.table_rectangular_armado.setItem(col_idx, 8, item_width)
+        
+        # Col 9: Material
+        item_material = QTableWidgetItem(col['material'])
+        self.table_rectangular_armado.setItem(col_idx, 9, item_material)
+        
+        # Col 10: Long. R2 Bars
+        item_r2_bars = QTableWidgetItem(str(col['r2_bars']))
+        self.table_rectangular_armado.setItem(col_idx, 10, item_r2_bars)
+        
+        # Col 11: Long. R3 Bars
+        item_r3_bars = QTableWidgetItem(str(col['r3_bars']))
+        self.table_rectangular_armado.setItem(col_idx, 11, item_r3_bars)
+        
+        # Col 12: Rebar #
+        combo_rebar = QComboBox()
+        combo_rebar.addItems(self.rebars)
+        if col['Rebar'] in self.rebars:
+        #     indice = self.rebars.index(col['Rebar'])
+            combo_rebar.setCurrentText(col['Rebar'])
+        else:
+            print(f"Advertencia: El valor inicial '{col['Rebar']}' para la fila {col_idx}")
+            print(f"No se encuentra en las opciones del ComboBox")
+        self.table_rectangular_armado.setCellWidget(col_idx, 12, combo_rebar)
+        # item_rebar = QTableWidgetItem(col['Rebar'])
+        # self.table_rectangular_armado.setItem(col_idx, 12, combo_rebar)
+        
+        # Col 13: Mat. Est
+        item_mat_est = QTableWidgetItem(col['Mat. Estribo'])
+        self.table_rectangular_armado.setItem(col_idx, 13, item_mat_est)
+        
+        # Col 14: Rebar Est.
+        combo_rebar_est = QComboBox()
+        combo_rebar_est.addItems(self.rebars)
+        if col['Est. Rebar'] in self.rebars:
+            combo_rebar_est.setCurrentText(col['Est. Rebar'])
+        else:
+            print(f"Advertencia: El valor inicial '{col['Est. Rebar']}' para la fila {col_idx}")
+            print(f"No se encuentra en las opciones del ComboBox")
+        self.table_rectangular_armado.setCellWidget(col_idx, 14, combo_rebar_est)
+        
+        # Col 15: estribo_r2
+        item_estribo_r2 = QTableWidgetItem(str(col.get('estribo_r2', '')))
+        self.table_rectangular_armado.setItem(col_idx, 15,item_estribo_r2)
+        
+        # col 16: estribo_r3
+        item_estribo_r3 = QTableWidgetItem(str(col.get('estribo_r3', '')))
+        self.table_rectangular_armado.setItem(col_idx, 16, item_estribo_r3)
+        
+        
+        # Col 17: Cover
+        item_cover = QTableWidgetItem(str(col['cover']))
+        self.table_rectangular_armado.setItem(col_idx, 17,item_cover)
+        
+        # Col 18: Detalle #
+        item_detalle = QTableWidgetItem(col.get('detail') or '')
+        self.table_rectangular_armado.setItem(col_idx, 18,item_detalle)
+        
+        # Col 19: Detalle #
+        item_detalle = QTableWidgetItem(col['bxh'])
+        self.table_rectangular_armado.setItem(col_idx, 19,item_detalle)
+        
+        # Col 20: Detalle #
+        item_detalle = QTableWidgetItem(col['As'])
+        self.table_rectangular_armado.setItem(col_idx, 20,item_detalle)
+        
+        # Col 21: Detalle #
+        item_detalle = QTableWidgetItem(str(col['fc']))
+        self.table_rectangular_armado.setItem(col_idx, 21,item_detalle)
+        
+        # Col 22: Estribo Barra #
+        item_est_rebar = QTableWidgetItem(col['Est. Rebar'])
+        self.table_rectangular_armado.setItem(col_idx, 22,item_est_rebar)
+        
+        # Col 23: Start Level
+        item_start_level = QTableWidgetItem(col['nivel_start'])
+        self.table_rectangular_armado.setItem(col_idx, 23, item_start_level)
+        
+        # Col 24
+        item_end_level = QTableWidgetItem(col['nivel_end'])
+        self.table_rectangular_armado.setItem(col_idx, 24, item_end_level)
+        
+         # Col 25: start end level
+        item_end_level = QTableWidgetItem(col['start_end_level'])
+        self.table_rectangular_armado.setItem(col_idx, 25,item_end_level)
+        
+        # Col 26: Column Group
+        item_col_group = QTableWidgetItem()
+        self.table_rectangular_armado.setItem(col_idx, 26, item_col_group)
+
+    def agregar_filas(self, column_data):
+        """
+        Agrega filas al final de la tabla. Se usa para mostrar las columnas a
+        medida que llegan de la extraccion, sin esperar a que termine.
+        """
+        start_row = self.table_rectangular_armado.rowCount()
+        self.table_rectangular_armado.setRowCount(start_row + len(column_data))
+        for offset, col in enumerate(column_data):
+            self._llenar_fila(start_row + offset, col)
+            self._registros_por_id[col.get('col_id')] = col
+        # Aplicar los filtros activos a las filas nuevas
+        self.filter_table()
+
+    def tiene_filas(self):
+        """True si la tabla muestra las columnas de una extraccion anterior."""
+        return bool(self._registros_por_id)
+
+    def cargar_filas(self, column_data):
+        """
+        Reemplaza el contenido de la tabla con los datos finales de la
+        extraccion (con GridLine y Detalle asignados).
+        """
+        self.table_rectangular_armado.setRowCount(0)
+        self._registros_por_id = {}
+        self._raw_gridlines_data = self._extract_unique_gridlines(column_data)
+        self.agregar_filas(column_data)
+        self.table_rectangular_armado.resizeColumnsToContents()
+        self.table_rectangular_armado.setColumnWidth(26, 250)
+
+    def actualizar_filas(self, column_data):
+        """
+        Aplica una nueva extraccion del modelo cambiando solo las filas que
+        difieren de las mostradas (incremental.diff_column_records); las
+        demas filas conservan lo que el usuario haya editado.
+
+        Returns:
+            dict: Los cambios aplicados ('updated', 'added', 'removed').
+        """
+        cambios = incremental.diff_column_records(list(self._registros_por_id.values()), column_data)
+        tabla = self.table_rectangular_armado
+        filas = {}
+        for fila in range(tabla.rowCount()):
+            item = tabla.item(fila, 2)
+            if item is not None:
+                filas[item.text()] = fila
+
+        for col in cambios['updated']:
+            self._llenar_fila(filas[col['col_id']], col)
+            self._registros_por_id[col['col_id']] = col
+        for fila in sorted((filas[col_id] for col_id in cambios['removed'] if col_id in filas), reverse=True):
+            tabla.removeRow(fila)
+        for col_id in cambios['removed']:
+            del self._registros_por_id[col_id]
+        self._raw_gridlines_data = self._extract_unique_gridlines(column_data)
+        self.agregar_filas(cambios['added'])
+        return cambios
+
     def guardar_datos_action(self):
         """
         Extrae los datos de la tabla y las opciones de los QComboBox,
@@ -683,7 +754,16 @@ class ColumnDataScreen(QWidget):
         
         # Revisar que column records tenga todo lo necesario para exportar a excel
         # cols_records = column_list_dict
-        if folder_path:
+        particion = self.combo_particion_excel.currentData()
+        if folder_path and particion is not None:
+            archivos = export_excel.generate_partitioned_excel(
+                folder_path, stories_list_dict, gridlines_list_dict, column_list_dict, particion
+            )
+            if archivos:
+                QMessageBox.information(self, "Proceso Completado", f"Archivo {archivos[0]} creado de forma exitosa.")
+            else:
+                QMessageBox.warning(self, "Exportar a Excel", "No se pudo crear el cuadro de columnas.")
+        elif folder_path:
             export_excel.generate_excel_table(folder_path, stories_list_dict, gridlines_list_dict, column_list_dict)
             QMessageBox.information(self, "Proceso Completado",f"Archivo {full_filename} creado de forma exitosa.")
         else:
@@ -807,24 +887,32 @@ class ColumnDataScreen(QWidget):
         lista_detalles = df_columns.drop_duplicates(subset=['Detalle No.'])
         lista_detalles_dict = lista_detalles.to_dict(orient='records')
         
+        # Dimensiones (en cm enteros) y recubrimiento de la tabla a mm, una
+        # conversion por columna de la tabla
+        profundidades = np.trunc(pd.to_numeric(lista_detalles['depth']).to_numpy(dtype=float))
+        anchos = np.trunc(pd.to_numeric(lista_detalles['width']).to_numpy(dtype=float))
+        anchos_mm = convert(np.minimum(profundidades, anchos), 'length', MODEL_UNITS['length'], 'mm')
+        altos_mm = convert(np.maximum(profundidades, anchos), 'length', MODEL_UNITS['length'], 'mm')
+        recubrimientos_mm = convert(pd.to_numeric(lista_detalles['Cover']), 'length', MODEL_UNITS['length'], 'mm')
+        
         # Create list of columns
         detalles = []
         start_point = (100,100)
         width_detail = 4000
         height_detail = 4000
         counter = 0
-        for section in lista_detalles_dict:
+        for i, section in enumerate(lista_detalles_dict):
             detalle = section['Detalle No.']
             origin_point = (start_point[0], start_point[1] - (height_detail*counter))
-            width = min(int(float(section['depth'])), int(float(section['width']))) * 10 # Convert to mm
-            height = max(int(float(section['depth'])), int(float(section['width']))) * 10 # Convert to mm
+            width = int(round(anchos_mm[i]))
+            height = int(round(altos_mm[i]))
             fc = int(float(section['fc'])) # kg/cm2
             
             r3 = int(section['Long. R2 Bars'])
             r2 = int(section['Long. R3 Bars'])
             
             long_bars = 2*r2 + 2*(r3 - 2)
-            cover = float(section['Cover']) * 10 # Convert to mm
+            cover = float(recubrimientos_mm[i])
             rebar = section['Rebar']
             rebar_est = section['Rebar. Est.']
             actual_column = RectangularColumn(
@@ -900,7 +988,7 @@ class ColumnDataScreen(QWidget):
         if not column_data:
             return []
         
-        df = pd.DataFrame(column_data)
+        df = ColumnTable.from_records(column_data).to_frame()
         if 'GridLine' not in df.columns or 'pos_x' not in df.columns or 'pos_y' not in df.columns:
             return []
             
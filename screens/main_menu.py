@@ -1,5 +1,6 @@
 import sys
 import json
+import time
 from PyQt5.QtWidgets import (
     QApplication,
     QMainWindow,
@@ -16,13 +17,23 @@ from PyQt5.QtWidgets import (
     QScrollArea,
     QFrame,
     QProgressDialog,
-    QMessageBox
+    QMessageBox,
+    QCheckBox,
+    QSpinBox
 )
 import comtypes.client
 from PyQt5.QtGui import QFont, QPixmap
 from PyQt5.QtCore import Qt, QSize, QT_VERSION_STR, PYQT_VERSION_STR, QObject, pyqtSignal, QThread
 
-from core import create_column_table, etabs
+from core import create_column_table, etabs, etabs_tables, incremental, parallel_extraction
+from core.com_profiler import ComCallProfiler, unwrap
+from core.com_recorder import ComCallRecorder
+from core.disk_cache import ExtractionDiskCache
+from core.lazy_rebar import RebarLoader
+from core.log import get_logger
+from core.model_watcher import ModelWatcher
+from core.property_cache import ModelPropertyCache
+from core.section_catalog import scan_sections, select_column_sections
 from core.etabs import UNITS_LENGTH_CM, UNITS_FORCE_KGF, UNITS_TEMP_C
 
 # Import Screens
@@ -33,47 +44,114 @@ from screens.info_gridlines_2 import InfoGridLinesScreen
 from screens.section_designer_2 import SectionDesignerScreen
 from screens.confinamiento_screen import ConfinementScreen
 
+logger = get_logger(__name__)
+
 class Worker(QObject):
     # Signal cuando acabe el proceso
     finished = pyqtSignal()
+    # Mensaje si la extraccion fallo
+    error = pyqtSignal(str)
     progress = pyqtSignal(str)
     crear_ventana_signal = pyqtSignal(dict)
+    # Opciones de secciones y barras, antes de empezar a leer las columnas
+    inicio_signal = pyqtSignal(dict)
+    # Registros de columnas a medida que se extraen
+    columnas_parciales_signal = pyqtSignal(list)
     
-    def __init__(self):
+    def __init__(self, snapshot=None, disk_cache=None, perfilar_llamadas=False, grabar_llamadas=False,
+                 hilos_extraccion=1, armado_diferido=False, actualizacion=False):
         super().__init__()
+        # Si es True el modelo ya se extrajo y cambio: solo se re-leen los
+        # frames modificados (extract_incremental), sin tablas ni cache en disco
+        self.actualizacion = actualizacion
+        # Si es True la tabla de columnas se llena con la geometria y el
+        # armado se carga en segundo plano (RebarLoader)
+        self.armado_diferido = armado_diferido
+        # Con mas de un hilo las columnas se extraen en paralelo
+        # (ParallelColumnExtractor); con 1 se usa la extraccion incremental
+        self.hilos_extraccion = hilos_extraccion
+        # Si es True se miden las llamadas a la API de ETABS (ComCallProfiler)
+        self.perfilar_llamadas = perfilar_llamadas
+        # Si es True se graban las llamadas y sus resultados (ComCallRecorder)
+        # para reproducir la extraccion sin ETABS
+        self.grabar_llamadas = grabar_llamadas
+        # Resultado de la extraccion anterior, para re-extraer solo lo que cambio
+        self.snapshot = snapshot if snapshot is not None else incremental.ExtractionSnapshot()
+        # Resultados de sesiones anteriores para modelos sin cambios
+        self.disk_cache = disk_cache if disk_cache is not None else ExtractionDiskCache()
        
     
     def run(self):
+        # El apartamento COM de este hilo debe seguir abierto mientras se usa
+        # el SapModel obtenido en el
         comtypes.CoInitialize()
+        try:
+            self.procesar_modelo()
+        except Exception as e:
+            logger.exception("Error en la extraccion del modelo")
+            self.error.emit(f"Error al leer el modelo de ETABS: {e}")
+        finally:
+            comtypes.CoUninitialize()
+            # Siempre, para cerrar el hilo y el dialogo de progreso
+            self.finished.emit()
+        
+    def procesar_modelo(self):
          # Obtener Modelo
         self.sap_model = etabs.obtener_sapmodel_etabs()
         
-        comtypes.CoUninitialize()
+        profiler = None
+        if self.perfilar_llamadas and self.sap_model:
+            profiler = ComCallProfiler()
+            self.sap_model = profiler.wrap(self.sap_model)
         
-         # Set units to kg-cm
-        etabs.establecer_units_etabs(
-            self.sap_model, UNITS_FORCE_KGF, UNITS_LENGTH_CM, UNITS_TEMP_C
-        )
+        recorder = None
+        if self.grabar_llamadas and self.sap_model:
+            recorder = ComCallRecorder()
+            self.sap_model = recorder.wrap(self.sap_model)
         
-        data_cols_labels_story, gridlines_data = etabs.get_story_lable_col_name(self.sap_model)
-        # Get stories with elevation
-        stories_with_elevations = etabs.get_stories_with_elevations(self.sap_model)
-        # Get defined rebars
-        defined_rebars = etabs.get_defined_rebars(self.sap_model)
-        # Get concrete sections
-        rect_sections = etabs.get_rect_concrete_sections(self.sap_model)
-        rectangular_sections = etabs.get_rectangular_concrete_sections(self.sap_model)
-        sections = []
+         # Set units to kg-cm (core.units.MODEL_UNITS)
+        units = (UNITS_FORCE_KGF, UNITS_LENGTH_CM, UNITS_TEMP_C)
+        etabs.establecer_units_etabs(self.sap_model, *units)
+        
+        if self.actualizacion:
+            self.actualizar_modelo()
+            return
+        
+        # Al reabrir un modelo sin cambios los datos se leen del cache en disco
+        # (al grabar se consulta a ETABS para que la grabacion este completa)
+        cache_key = self.disk_cache.get_key(self.sap_model, units)
+        extraccion = self.disk_cache.load(cache_key) if recorder is None else None
+        if extraccion is None:
+            extraccion = self.extraer_modelo()
+            self.disk_cache.store(cache_key, extraccion)
+        elif 'snapshot_fingerprints' in extraccion:
+            # La siguiente extraccion solo re-lee lo que cambie desde la
+            # extraccion guardada
+            incremental.seed_snapshot(
+                self.sap_model, self.snapshot, extraccion['data_cols_labels_story'],
+                fingerprints=incremental.fingerprints_from_records(extraccion['snapshot_fingerprints']),
+            )
+        
+        data_cols_labels_story = extraccion['data_cols_labels_story']
+        gridlines_data = extraccion['gridlines_data']
+        stories_with_elevations = extraccion['stories_with_elevations']
+        defined_rebars = extraccion['defined_rebars']
+        rect_sections = extraccion['rect_sections']
+        rectangular_sections = extraccion['rectangular_sections']
+        sections = [item["Nombre"] for item in rect_sections]
         rebars = []
         print("*****Rectangular Sections*****")
         print(rectangular_sections)
-        for item in rectangular_sections:
-            print(item['section'])
-        for item in rect_sections:
-            print(item["Nombre"])
-            sections.append(item["Nombre"])
         for item in defined_rebars:
             rebars.append(item["Nombre"])
+        
+        if recorder is not None:
+            recorder.save(f"grabacion_etabs_{time.strftime('%Y%m%d_%H%M%S')}.json.gz")
+        if profiler is not None:
+            profiler.print_report()
+            profiler.dump_json(f"perfil_etabs_{time.strftime('%Y%m%d_%H%M%S')}.json")
+        # Las pantallas usan el SapModel original, sin medir ni grabar sus llamadas
+        self.sap_model = unwrap(self.sap_model)
             
         # Emitir signal con info
         self.crear_ventana_signal.emit({
@@ -88,7 +166,128 @@ class Worker(QObject):
             'gridlines_data': gridlines_data
         })
         
-        self.finished.emit()
+    def actualizar_modelo(self):
+        """
+            Re-extrae solo los frames que cambiaron desde el snapshot y
+            emite las columnas para ColumnDataScreen.actualizar_filas.
+        """
+        self.progress.emit("Actualizando columnas...")
+        data_cols_labels_story, gridlines_data = incremental.extract_incremental(self.sap_model, self.snapshot)
+        self.crear_ventana_signal.emit({
+            'data_cols_labels_story': data_cols_labels_story,
+            'gridlines_data': gridlines_data,
+            'sap_model': self.sap_model,
+        })
+        
+    def extraer_modelo(self):
+        """
+            Lee de ETABS todos los datos que necesitan las pantallas.
+        """
+        # Un solo cache de propiedades para toda la extraccion
+        cache = ModelPropertyCache(self.sap_model)
+        
+        # Get defined rebars and concrete sections. Se leen primero para que
+        # la tabla de columnas pueda mostrarse mientras se extraen.
+        self.progress.emit("Leyendo secciones y barras de refuerzo...")
+        defined_rebars = etabs.get_defined_rebars(self.sap_model, cache)
+        catalogo = scan_sections(self.sap_model, cache)
+        self.inicio_signal.emit({
+            'sections': catalogo['sections'],
+            'rebars': [item["Nombre"] for item in defined_rebars],
+            'sap_model': self.sap_model,
+        })
+        
+        # Con un snapshot del mismo modelo solo se re-leen los frames que
+        # cambiaron desde la ultima extraccion, sea cual sea el modo con que
+        # se hizo. Al grabar se consulta todo para que la grabacion este
+        # completa.
+        self.progress.emit("Leyendo columnas...")
+        self.inicio_columnas = time.time()
+        if self.snapshot.can_update(self.sap_model.GetModelFilename()) and not self.grabar_llamadas:
+            data_cols_labels_story, gridlines_data = incremental.extract_incremental(
+                self.sap_model, self.snapshot, cache, on_chunk=self.reportar_avance
+            )
+        else:
+            data_cols_labels_story, gridlines_data = self.extraer_columnas(cache)
+        # Get stories with elevation
+        stories_with_elevations = etabs.get_stories_with_elevations(self.sap_model)
+        # Las secciones de columna salen de los registros ya extraidos, sin
+        # recorrer de nuevo los frames
+        catalogo = select_column_sections(catalogo, data_cols_labels_story)
+        rect_sections = catalogo['rect_sections']
+        rectangular_sections = catalogo['rectangular_sections']
+        
+        return {
+            'data_cols_labels_story': data_cols_labels_story,
+            'gridlines_data': gridlines_data,
+            'stories_with_elevations': stories_with_elevations,
+            'defined_rebars': defined_rebars,
+            'rect_sections': rect_sections,
+            'rectangular_sections': rectangular_sections,
+            'snapshot_fingerprints': incremental.fingerprints_to_records(self.snapshot.fingerprints),
+        }
+        
+    def extraer_columnas(self, cache):
+        """
+            Extraccion completa de las columnas: masiva por tablas y, si la
+            version de ETABS no expone las tablas necesarias, frame por frame
+            (diferida, paralela o incremental). El snapshot queda con el
+            resultado para que la siguiente extraccion sea incremental.
+        """
+        data_cols_labels_story, gridlines_data = etabs_tables.get_story_lable_col_name_from_tables(self.sap_model)
+        if data_cols_labels_story is not None:
+            self.reportar_registros(data_cols_labels_story)
+            incremental.seed_snapshot(self.sap_model, self.snapshot, data_cols_labels_story, cache=cache)
+            return data_cols_labels_story, gridlines_data
+        
+        # Los hilos de la extraccion paralela obtienen su propio SapModel,
+        # por lo que sus llamadas no se pueden perfilar ni grabar
+        if self.armado_diferido and not (self.perfilar_llamadas or self.grabar_llamadas):
+            rebar_loader = RebarLoader(self.sap_model, model_factory=etabs.obtener_sapmodel_etabs)
+            try:
+                data_cols_labels_story, gridlines_data = etabs.get_story_lable_col_name_lazy(
+                    self.sap_model, rebar_loader, cache, on_chunk=self.reportar_avance
+                )
+            finally:
+                rebar_loader.shutdown()
+        elif self.hilos_extraccion > 1 and not (self.perfilar_llamadas or self.grabar_llamadas):
+            data_cols_labels_story, gridlines_data = parallel_extraction.get_story_lable_col_name_parallel(
+                self.sap_model, self.hilos_extraccion, on_chunk=self.reportar_avance
+            )
+        else:
+            # Llena el snapshot mientras extrae
+            self.snapshot.fingerprints = {}
+            return incremental.extract_incremental(
+                self.sap_model, self.snapshot, cache, on_chunk=self.reportar_avance
+            )
+        incremental.seed_snapshot(self.sap_model, self.snapshot, data_cols_labels_story, cache=cache)
+        return data_cols_labels_story, gridlines_data
+
+    def reportar_registros(self, registros):
+        """
+            Entrega a la tabla de columnas los registros de una extraccion
+            que no avisa de su avance (por tablas), en grupos de
+            etabs.COLUMN_CHUNK_SIZE.
+        """
+        registros = list(registros)
+        total = len(registros)
+        for inicio in range(0, total, etabs.COLUMN_CHUNK_SIZE):
+            grupo = registros[inicio:inicio + etabs.COLUMN_CHUNK_SIZE]
+            self.reportar_avance(grupo, inicio + len(grupo), total)
+
+    def reportar_avance(self, registros, procesados, total):
+        """
+            Emite el avance de la extraccion (frames procesados, tiempo
+            restante estimado) y las columnas leidas en este grupo.
+        """
+        transcurrido = time.time() - self.inicio_columnas
+        restante = transcurrido / procesados * (total - procesados) if procesados else 0
+        self.progress.emit(
+            f"Leyendo columnas: {procesados}/{total} frames ({procesados / total:.0%}). "
+            f"Tiempo restante estimado: {restante:.0f} s"
+        )
+        if registros:
+            self.columnas_parciales_signal.emit(registros)
         
 class FileLoaderWorker(QObject):
     """
@@ -142,6 +341,9 @@ class FileLoaderWorker(QObject):
 
 
 class MainMenuScreen(QMainWindow):
+    # Emitida desde el hilo de ModelWatcher cuando el modelo de ETABS cambia
+    modelo_modificado = pyqtSignal(object)
+
     def __init__(self):
         super().__init__()
 
@@ -154,6 +356,14 @@ class MainMenuScreen(QMainWindow):
         self.info_gridlines_screen = None # Window with GridLines Data
         self.section_designer_screen = None # Window with Section Data
         self.confinement_screen = None
+        self.extraction_snapshot = incremental.ExtractionSnapshot() # Ultima extraccion de columnas
+        self.extraction_disk_cache = ExtractionDiskCache() # Extracciones de sesiones anteriores
+        self.model_watcher = None # Vigila el modelo para re-extraer al guardarlo
+        self.extraccion_en_curso = False
+        self.actualizacion_pendiente = False
+        # La extraccion en curso vuelve a leer un modelo ya mostrado
+        self.reextraccion = False
+        self.error_extraccion = None # Mensaje del Worker si la extraccion fallo
 
         # --- Central Widget and Layout ---
         self.central_widget = QWidget(self)
@@ -177,6 +387,19 @@ class MainMenuScreen(QMainWindow):
         self.btn_identify_columns = QPushButton("Conectar a Archivo ETABS")
         # Boton para cargar datos
         self.btn_load_data_from_file = QPushButton("Cargar Datos desde Archivo")
+        # Opcion para medir las llamadas a la API de ETABS durante la extraccion
+        self.chk_perfilar_llamadas = QCheckBox("Perfilar llamadas a la API de ETABS")
+        # Opcion para grabar las llamadas y reproducirlas sin ETABS (benchmarks)
+        self.chk_grabar_llamadas = QCheckBox("Grabar llamadas a ETABS")
+        # Opcion para mostrar la tabla antes de leer el armado de las secciones
+        self.chk_armado_diferido = QCheckBox("Cargar armado en segundo plano")
+        # Opcion para actualizar la tabla cada vez que se guarda el modelo
+        self.chk_vigilar_modelo = QCheckBox("Actualizar columnas al guardar el modelo en ETABS")
+        # Numero de hilos para extraer las columnas (1 = en serie)
+        self.lbl_hilos_extraccion = QLabel("Hilos de extraccion:")
+        self.spin_hilos_extraccion = QSpinBox()
+        self.spin_hilos_extraccion.setRange(1, 16)
+        self.spin_hilos_extraccion.setValue(1)
         
         self.btn_exit = QPushButton("Salir del Programa")
 
@@ -197,6 +420,16 @@ class MainMenuScreen(QMainWindow):
         button_layout.setSpacing(15)
         button_layout.addWidget(self.btn_identify_columns)
         button_layout.addWidget(self.btn_load_data_from_file)
+        button_layout.addWidget(self.chk_perfilar_llamadas, 0, Qt.AlignHCenter)
+        button_layout.addWidget(self.chk_grabar_llamadas, 0, Qt.AlignHCenter)
+        button_layout.addWidget(self.chk_armado_diferido, 0, Qt.AlignHCenter)
+        button_layout.addWidget(self.chk_vigilar_modelo, 0, Qt.AlignHCenter)
+        hilos_layout = QHBoxLayout()
+        hilos_layout.addStretch()
+        hilos_layout.addWidget(self.lbl_hilos_extraccion)
+        hilos_layout.addWidget(self.spin_hilos_extraccion)
+        hilos_layout.addStretch()
+        button_layout.addLayout(hilos_layout)
         
         # button_layout.addWidget(self.btn_start_game)
         # button_layout.addWidget(self.btn_connect_etabs)
@@ -213,6 +446,8 @@ class MainMenuScreen(QMainWindow):
         self.btn_identify_columns.clicked.connect(self.identificar_columnas)
         self.btn_load_data_from_file.clicked.connect(self.cargar_datos_desde_archivo)
         self.btn_exit.clicked.connect(self.exit_application)
+        self.chk_vigilar_modelo.toggled.connect(self.cambiar_vigilancia_modelo)
+        self.modelo_modificado.connect(self.actualizar_desde_modelo)
 
         # --- Apply Stylesheet ---
         self.apply_styles()
@@ -456,7 +691,10 @@ class MainMenuScreen(QMainWindow):
             self.show_message(message)
 
             # Get model Column data
-            model_data = create_column_table.get_open_model_data(sap_model)
+            profiler = ComCallProfiler() if self.chk_perfilar_llamadas.isChecked() else None
+            model_data = create_column_table.get_open_model_data(sap_model, profiler)
+            if profiler is not None:
+                profiler.dump_json(f"perfil_etabs_{time.strftime('%Y%m%d_%H%M%S')}.json")
             column_data = model_data["cols_data"]
             rect_sections = model_data["rect_sections"]
             rebars = model_data["rebars_defined"]
@@ -494,20 +732,47 @@ class MainMenuScreen(QMainWindow):
 
     def identificar_columnas(self):
         print("Action: Identificar Columnas")
+        self.iniciar_extraccion()
+
+    def iniciar_extraccion(self, actualizacion=False):
+        """
+            Lee el modelo de ETABS en un hilo aparte.
+
+            Args:
+                actualizacion (bool): Si es True el modelo ya se extrajo y
+                    cambio: se re-extraen solo los frames modificados
+                    (extraccion incremental) y en ColumnDataScreen solo se
+                    actualizan las filas que cambiaron, sin dialogo de
+                    progreso.
+        """
+        self.extraccion_en_curso = True
         # Deshabilitamos el botón para no iniciar el proceso dos veces
         self.btn_identify_columns.setEnabled(False)
         
         # --- Configuración del Diálogo de Progreso ---
-        self.progress_dialog = QProgressDialog("Procesando, por favor espere...", None, 0, 0, self)
-        self.progress_dialog.setWindowTitle("Proceso en Curso")
-        self.progress_dialog.setWindowModality(Qt.WindowModal)
-        self.progress_dialog.show()
+        self.progress_dialog = None
+        if not actualizacion:
+            self.progress_dialog = QProgressDialog("Procesando, por favor espere...", None, 0, 0, self)
+            self.progress_dialog.setWindowTitle("Proceso en Curso")
+            self.progress_dialog.setWindowModality(Qt.WindowModal)
+            self.progress_dialog.show()
         
        
         
         # --- Configuración del Hilo y el Trabajador ---
         self.thread = QThread()
-        self.trabajador = Worker()
+        if actualizacion:
+            # La extraccion incremental es la que solo re-lee lo que cambio
+            self.trabajador = Worker(self.extraction_snapshot, actualizacion=True)
+        else:
+            self.trabajador = Worker(
+                self.extraction_snapshot,
+                self.extraction_disk_cache,
+                perfilar_llamadas=self.chk_perfilar_llamadas.isChecked(),
+                grabar_llamadas=self.chk_grabar_llamadas.isChecked(),
+                hilos_extraccion=self.spin_hilos_extraccion.value(),
+                armado_diferido=self.chk_armado_diferido.isChecked(),
+            )
         
         # Mover el trabajador al hilo
         self.trabajador.moveToThread(self.thread)
@@ -518,7 +783,8 @@ class MainMenuScreen(QMainWindow):
         
         # 2. Cuando el trabajador termine, cierra el diálogo y el hilo.
         self.trabajador.finished.connect(self.thread.quit)
-        self.trabajador.finished.connect(self.progress_dialog.close)
+        if self.progress_dialog is not None:
+            self.trabajador.finished.connect(self.progress_dialog.close)
         
         # 3. Limpiar los objetos después de que el hilo haya terminado.
         self.trabajador.finished.connect(self.trabajador.deleteLater)
@@ -527,25 +793,125 @@ class MainMenuScreen(QMainWindow):
         # 4. Volver a habilitar el botón cuando el hilo termine.
         self.thread.finished.connect(lambda: self.btn_identify_columns.setEnabled(True))
         
+        self.error_extraccion = None
+        self.trabajador.error.connect(self.on_worker_error)
         self.thread.finished.connect(self.on_worker_finished)
         # self.thread.finished.connect(lambda: self.etiqueta.setText("¡Proceso completado!"))
         
-        # Opcional: Actualizar el texto del diálogo con el progreso
-        self.trabajador.progress.connect(self.progress_dialog.setLabelText)
-        
-        self.trabajador.crear_ventana_signal.connect(self.pasar_info_para_ventanas)
+        if actualizacion:
+            self.trabajador.crear_ventana_signal.connect(self.aplicar_actualizacion)
+        else:
+            # Opcional: Actualizar el texto del diálogo con el progreso
+            self.trabajador.progress.connect(self.progress_dialog.setLabelText)
+            
+            self.trabajador.crear_ventana_signal.connect(self.pasar_info_para_ventanas)
+            self.trabajador.inicio_signal.connect(self.mostrar_pantalla_columnas)
+            self.trabajador.columnas_parciales_signal.connect(self.agregar_columnas_parciales)
         
         # --- Iniciar el Hilo ---
         self.thread.start()
         
     #  -- Nuevo: Slot para manejar el final del worker --
+    def on_worker_error(self, message):
+        self.error_extraccion = message
+
     def on_worker_finished(self):
+        self.extraccion_en_curso = False
         if not hasattr(self.trabajador, 'sap_model') or not self.trabajador.sap_model:
             QMessageBox.critical(self, "Error de Conexion", 
-                                 "No se pudo conectar a una instancia de ETABS con un modelo abierto.\n",
+                                 "No se pudo conectar a una instancia de ETABS con un modelo abierto.\n"
                                  "Por favor, asegurese de que ETABS este en ejecucion y tenga un modelo cargado.")
+            return
+        if self.error_extraccion is not None:
+            QMessageBox.critical(self, "Error en la Extraccion", self.error_extraccion)
+        # El modelo cambio mientras se extraia: volver a leer lo que cambio
+        if self.actualizacion_pendiente:
+            self.actualizacion_pendiente = False
+            self.iniciar_extraccion(actualizacion=True)
+        elif self.chk_vigilar_modelo.isChecked():
+            self.iniciar_vigilancia_modelo()
+
+    def cambiar_vigilancia_modelo(self, activada):
+        if activada:
+            # Se empieza a vigilar despues de la primera extraccion
+            if self.column_data_screen is not None and not self.extraccion_en_curso:
+                self.iniciar_vigilancia_modelo()
+        else:
+            self.detener_vigilancia_modelo()
+
+    def iniciar_vigilancia_modelo(self):
+        """
+            Vigila el modelo abierto en ETABS (ModelWatcher) para actualizar
+            la tabla de columnas cada vez que se guarda.
+        """
+        if self.model_watcher is None:
+            self.model_watcher = ModelWatcher(
+                self.modelo_modificado.emit, model_factory=etabs.obtener_sapmodel_etabs
+            )
+        self.model_watcher.start()
+
+    def detener_vigilancia_modelo(self):
+        if self.model_watcher is not None:
+            self.model_watcher.stop()
+            self.model_watcher = None
+
+    def actualizar_desde_modelo(self, estado):
+        """
+            Slot de ModelWatcher: el modelo cambio en ETABS.
+        """
+        if self.column_data_screen is None:
+            return
+        if self.extraccion_en_curso:
+            self.actualizacion_pendiente = True
+            return
+        self.iniciar_extraccion(actualizacion=True)
+
+    def aplicar_actualizacion(self, datos):
+        """
+            Aplica en ColumnDataScreen solo las filas que cambiaron en el
+            modelo.
+        """
+        if self.column_data_screen is None:
+            return
+        self.column_data_screen.sap_model = datos['sap_model']
+        cambios = self.column_data_screen.actualizar_filas(datos['data_cols_labels_story'])
+        logger.info(
+            f"Modelo actualizado: {len(cambios['updated'])} columnas modificadas, "
+            f"{len(cambios['added'])} nuevas, {len(cambios['removed'])} eliminadas."
+        )
             
         
+    def mostrar_pantalla_columnas(self, datos):
+        """
+            Muestra la tabla de columnas vacia al empezar la extraccion, para
+            ir agregando las filas a medida que llegan.
+        """
+        if not self.column_data_screen:
+            self.column_data_screen = ColumnDataScreen(
+                main_menu_ref=self,
+                stories_window_ref=self.info_stories_screen,
+                gridlines_window_ref=None,
+                section_designer_window_ref=self.section_designer_screen,
+                confinement_screen_ref=self.confinement_screen,
+                sap_model_object=datos['sap_model'],
+                column_data=[],
+                rect_sections=datos['sections'],
+                rebars=datos['rebars'],
+            )
+        else:
+            self.column_data_screen.rect_sections = datos['sections']
+            self.column_data_screen.rebars = datos['rebars']
+        # Al volver a extraer se mantienen las filas mostradas y al terminar
+        # solo se cambian las que difieren (ColumnDataScreen.actualizar_filas)
+        self.reextraccion = self.column_data_screen.tiene_filas()
+        self.column_data_screen.show()
+
+    def agregar_columnas_parciales(self, registros):
+        # En una re-extraccion los grupos traen solo los frames modificados,
+        # aun sin GridLine: se aplican al terminar
+        if self.column_data_screen and not self.reextraccion:
+            self.column_data_screen.agregar_filas(registros)
+        
     def pasar_info_para_ventanas(self, datos):
         sap_model = datos['sap_model']
         data_cols_labels_story = datos['data_cols_labels_story']
@@ -590,7 +956,20 @@ class MainMenuScreen(QMainWindow):
             
             # self.info_gridlines_screen.hide()
         # Crear y mostrar ColumnDataScreen
-        if not self.column_data_screen:
+        if self.column_data_screen:
+            # Creada al inicio de la extraccion: reemplazar las filas parciales
+            # por los datos finales y completar las referencias a las ventanas
+            self.column_data_screen.stories_window_ref = self.info_stories_screen
+            self.column_data_screen.section_designer_window_ref = self.section_designer_screen
+            self.column_data_screen.confinement_screen_ref = self.confinement_screen
+            self.column_data_screen.rect_sections = sections
+            self.column_data_screen.rebars = rebars
+            self.column_data_screen.sap_model = sap_model
+            if self.reextraccion:
+                self.column_data_screen.actualizar_filas(data_cols_labels_story)
+            else:
+                self.column_data_screen.cargar_filas(data_cols_labels_story)
+        else:
             self.column_data_screen = ColumnDataScreen(
                 main_menu_ref=self,
                 stories_window_ref= self.info_stories_screen,
@@ -603,17 +982,13 @@ class MainMenuScreen(QMainWindow):
                 rebars=rebars,
             )
             # self.info_gridlines_screen.datos_para_renombrar.connect(self.column_data_screen.realizar_renombrado)
-        else:
-            # Si ya existe, actualiza la referencia al sap_model por si acaso
-            self.column_data_screen.sap_model = self.sap_model_connected
-            # Aquí podrías llamar a una función en column_data_screen para refrescar datos si es necesario
-            # self.column_data_screen.refresh_display_with_new_model()
 
         self.column_data_screen.show()
         self.hide()  # Ocultar el menú principal
 
     def exit_application(self):
         print("Action: Salir del Programa clicked!")
+        self.detener_vigilancia_modelo()
         # Before quitting, ensure child windows are also closed if necessary
         if self.new_game_window and self.new_game_window.isVisible():
             self.new_game_window.close()
@@ -654,6 +1029,7 @@ class MainMenuScreen(QMainWindow):
 
     # Sobrescribir closeEvent para cerrar también ColumnDataScreen si está abierta
     def closeEvent(self, event):
+        self.detener_vigilancia_modelo()
         if self.new_game_window:
             self.new_game_window.close()
         if self.column_data_screen:  # Añadido
@@ -6,9 +6,48 @@ from PyQt5.QtWidgets import (
     
 )
 from PyQt5.QtGui import QFont, QPixmap 
-from PyQt5.QtCore import Qt, QSize, QT_VERSION_STR, PYQT_VERSION_STR
+from PyQt5.QtCore import Qt, QSize, QT_VERSION_STR, PYQT_VERSION_STR, QObject, pyqtSignal, QThread
 
-from core import create_column_table
+import os
+
+from core import batch_extraction, create_column_table
+
+
+class BatchWorker(QObject):
+    """
+        Extrae todos los modelos de una carpeta (batch_extraction.run_batch)
+        fuera del hilo de la interfaz.
+    """
+    progress = pyqtSignal(str)
+    # Mensaje si el lote no se pudo ejecutar
+    error = pyqtSignal(str)
+    finished = pyqtSignal(list)
+
+    def __init__(self, folder, output_dir, processes=batch_extraction.DEFAULT_PROCESSES):
+        super().__init__()
+        self.folder = folder
+        self.output_dir = output_dir
+        self.processes = processes
+
+    def run(self):
+        results = []
+        try:
+            results = batch_extraction.run_batch(
+                self.folder, self.output_dir, self.processes, on_result=self.reportar_resultado
+            )
+        except Exception as e:
+            # Por ejemplo si no se puede crear la carpeta de salida
+            self.error.emit(f"No se pudo procesar la carpeta: {e}")
+        finally:
+            # La ventana vuelve a habilitar los botones al terminar
+            self.finished.emit(results)
+
+    def reportar_resultado(self, result, terminados, total):
+        estado = "OK" if result["ok"] else f"Error: {result.get('error', '')}"
+        self.progress.emit(
+            f"Modelos procesados: {terminados}/{total}. "
+            f"{os.path.basename(result['model'])}: {estado}"
+        )
 
 class OpenFileWindow(QWidget):
     """
@@ -20,6 +59,7 @@ class OpenFileWindow(QWidget):
         super().__init__(parent)
         self.main_menu_ref = main_menu_ref # Store reference to main menu
         self.selected_file_path = None # To store the path of the selected .edb file
+        self.batch_failed = False # El ultimo lote termino con un error
 
         self.setWindowTitle("Extraccion de Datos ETABS")
         self.setMinimumSize(450, 250) # Adjusted minimum size
@@ -71,6 +111,10 @@ class OpenFileWindow(QWidget):
         self.btn_process_file.clicked.connect(self.process_selected_file)
         self.btn_process_file.setEnabled(False) # Initially disabled
 
+        # Extraccion por lotes de todos los .EDB de una carpeta
+        self.btn_process_folder = QPushButton("Procesar Carpeta (.edb)", self)
+        self.btn_process_folder.clicked.connect(self.process_folder)
+
         self.btn_back_to_menu = QPushButton("Volver al Menu Principal", self)
         self.btn_back_to_menu.clicked.connect(self.go_back_to_main_menu)
 
@@ -122,6 +166,7 @@ class OpenFileWindow(QWidget):
             }}
         """
         self.btn_process_file.setStyleSheet(button_style_sheet_process)
+        self.btn_process_folder.setStyleSheet(button_style_sheet_process)
         self.btn_back_to_menu.setStyleSheet(button_style_sheet_back)
 
         # Layout for the bottom buttons
@@ -129,6 +174,7 @@ class OpenFileWindow(QWidget):
         bottom_button_layout.addSpacerItem(QSpacerItem(40, 20, QSizePolicy.Expanding, QSizePolicy.Minimum))
         bottom_button_layout.addWidget(self.btn_back_to_menu)
         bottom_button_layout.addWidget(self.btn_process_file)
+        bottom_button_layout.addWidget(self.btn_process_folder)
         bottom_button_layout.addSpacerItem(QSpacerItem(40, 20, QSizePolicy.Expanding, QSizePolicy.Minimum))
 
 
@@ -186,6 +232,49 @@ class OpenFileWindow(QWidget):
             print("No file selected to process.")
             self.info_label.setText("No file selected. Please select an .edb file first.")
 
+    def process_folder(self):
+        """
+        Extrae todos los modelos .edb de una carpeta, cada uno en una
+        instancia de ETABS en otro proceso. Los resultados se guardan en la
+        subcarpeta 'cuadros_columnas'.
+        """
+        folder = QFileDialog.getExistingDirectory(self, "Seleccionar Carpeta con Archivos EDB")
+        if not folder:
+            print("Folder selection cancelled.")
+            return
+
+        output_dir = os.path.join(folder, "cuadros_columnas")
+        self.info_label.setText(f"Procesando modelos de: {folder}...")
+        self.btn_process_file.setEnabled(False)
+        self.btn_process_folder.setEnabled(False)
+
+        self.batch_thread = QThread()
+        self.batch_worker = BatchWorker(folder, output_dir)
+        self.batch_worker.moveToThread(self.batch_thread)
+        self.batch_thread.started.connect(self.batch_worker.run)
+        self.batch_worker.progress.connect(self.info_label.setText)
+        self.batch_worker.error.connect(self.batch_error)
+        self.batch_worker.finished.connect(self.batch_finished)
+        self.batch_worker.finished.connect(self.batch_thread.quit)
+        self.batch_worker.finished.connect(self.batch_worker.deleteLater)
+        self.batch_thread.finished.connect(self.batch_thread.deleteLater)
+        self.batch_thread.start()
+
+    def batch_error(self, message):
+        self.batch_failed = True
+        self.info_label.setText(message)
+
+    def batch_finished(self, results):
+        # Si el lote fallo se deja el mensaje de error
+        if not self.batch_failed:
+            correctos = sum(1 for result in results if result["ok"])
+            self.info_label.setText(
+                f"Lote terminado: {correctos} de {len(results)} modelos procesados correctamente."
+            )
+        self.batch_failed = False
+        self.btn_process_file.setEnabled(self.selected_file_path is not None)
+        self.btn_process_folder.setEnabled(True)
+
     def go_back_to_main_menu(self):
         """Hides this window and shows the main menu."""
         self.hide()
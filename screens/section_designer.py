@@ -15,6 +15,8 @@ from OpenGL.GL import (glBegin, glBlendFunc, glClear, glClearColor, glColor3f, g
                        GL_PROJECTION, GL_QUADS, GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
 from OpenGL.GLU import gluOrtho2D
 
+from core.units import factor as unit_factor
+
 # --- Constantes y Datos de Referencia ---
 
 # Diámetros de barras de refuerzo estándar de EE. UU. en pulgadas.
@@ -27,9 +29,9 @@ BAR_DIAMETERS_IN = {
 
 # Factores de conversión a pulgadas
 CONVERSION_FACTORS = {
-    'pulgadas': 1.0,
-    'cm': 1 / 2.54,
-    'mm': 1 / 25.4,
+    'pulgadas': unit_factor('length', 'in', 'in'),
+    'cm': unit_factor('length', 'cm', 'in'),
+    'mm': unit_factor('length', 'mm', 'in'),
 }
 
 
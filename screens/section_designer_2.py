@@ -17,6 +17,8 @@ from OpenGL.GL import (glBegin, glBlendFunc, glClear, glClearColor, glColor3f, g
                        GL_VIEWPORT)
 from OpenGL.GLU import gluOrtho2D, gluUnProject
 
+from core.units import factor as unit_factor
+
 # --- Constantes y Datos de Referencia ---
 
 BAR_DIAMETERS_IN = {
@@ -26,9 +28,9 @@ BAR_DIAMETERS_IN = {
 }
 
 CONVERSION_FACTORS = {
-    'pulgadas': 1.0,
-    'cm': 1 / 2.54,
-    'mm': 1 / 25.4,
+    'pulgadas': unit_factor('length', 'in', 'in'),
+    'cm': unit_factor('length', 'cm', 'in'),
+    'mm': unit_factor('length', 'mm', 'in'),
 }
 
 
@@ -0,0 +1,39 @@
+"""Extraccion por lotes con instancias de ETABS falsas (FakeEtabsHelper)."""
+import json
+import os
+
+from openpyxl import load_workbook
+
+from core import batch_extraction
+from core.fake_sap_model import FakeEtabsHelper
+
+
+def test_run_batch_with_fake_etabs(tmp_path):
+    # Cada "modelo" es un JSON con los argumentos de build_synthetic_model
+    (tmp_path / "modelo_a.EDB").write_text(json.dumps({"n_stories": 3, "n_grid_x": 2, "n_grid_y": 2}))
+    (tmp_path / "modelo_b.EDB").write_text(json.dumps({"n_stories": 2, "n_grid_x": 3, "n_grid_y": 2}))
+    (tmp_path / "danado.EDB").write_text("no es un modelo")
+    output_dir = tmp_path / "cuadros_columnas"
+    reported = []
+
+    results = batch_extraction.run_batch(
+        str(tmp_path), str(output_dir), processes=2, helper_factory=FakeEtabsHelper,
+        on_result=lambda result, finished, total: reported.append((finished, total)),
+    )
+
+    assert [os.path.basename(result["model"]) for result in results] == ["danado.EDB", "modelo_a.EDB", "modelo_b.EDB"]
+    assert [result["ok"] for result in results] == [False, True, True]
+    assert "No se pudo abrir el modelo" in results[0]["error"]
+    assert [result["columns"] for result in results[1:]] == [3 * 2 * 2, 2 * 3 * 2]
+    for result in results[1:]:
+        assert all(os.path.isfile(path) for path in result["files"].values())
+        # Hoja por detalle DC-n: cada columna queda en un detalle
+        details = list(load_workbook(result["files"]["excel"])["Detalles"].iter_rows(min_row=2, values_only=True))
+        assert [row[0] for row in details] == [f"DC-{i + 1}" for i in range(len(details))]
+        assert sum(row[-1] for row in details) == result["columns"]
+    assert sorted(reported) == [(1, 3), (2, 3), (3, 3)]
+    assert (output_dir / batch_extraction.SUMMARY_FILE).is_file()
+
+
+def test_run_batch_without_models(tmp_path):
+    assert batch_extraction.run_batch(str(tmp_path), str(tmp_path / "salida")) == []
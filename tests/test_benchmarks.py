@@ -0,0 +1,52 @@
+"""
+Mediciones de la extraccion con pytest-benchmark, sobre modelos sinteticos
+grabados y reproducidos con ReplaySapModel (sin ETABS).
+
+    python -m pytest tests/test_benchmarks.py --benchmark-only
+
+Se omiten si pytest-benchmark no esta instalado.
+"""
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from benchmarks.bench_extraction import TARGETS, record_targets  # noqa: E402
+from core import etabs  # noqa: E402
+from core.com_recorder import ReplaySapModel  # noqa: E402
+from core.fake_sap_model import build_synthetic_model  # noqa: E402
+from core.log import configure_logging  # noqa: E402
+
+MODEL_SIZES = [(5, 4), (10, 8)]
+COLUMN_TARGETS = [
+    "get_story_lable_col_name",
+    "get_story_lable_col_name_parallel",
+    "get_story_lable_col_name_pipeline",
+]
+
+
+@pytest.fixture(scope="module", params=MODEL_SIZES, ids=lambda size: f"{size[0]}niveles-{size[1]}x{size[1]}")
+def replay_case(request):
+    # Los mensajes de avance no se miden
+    configure_logging("WARNING")
+    n_stories, n_grid = request.param
+    model = build_synthetic_model(n_stories, n_grid, n_grid)
+    expected, _ = etabs.get_story_lable_col_name(model)
+    return record_targets(model, COLUMN_TARGETS), expected.to_records()
+
+
+@pytest.mark.parametrize("target", COLUMN_TARGETS)
+def test_extraction_benchmark(benchmark, replay_case, target):
+    recording, expected = replay_case
+
+    def new_model():
+        # Un ReplaySapModel nuevo por ronda para contar solo sus llamadas
+        return (ReplaySapModel(recording),), {}
+
+    cols_data, _ = benchmark.pedantic(TARGETS[target], setup=new_model, rounds=5)
+    assert cols_data.to_records() == expected
+
+
+@pytest.mark.parametrize("n_stories, n_grid", MODEL_SIZES)
+def test_build_synthetic_model_benchmark(benchmark, n_stories, n_grid):
+    model = benchmark(build_synthetic_model, n_stories, n_grid, n_grid)
+    assert model.FrameObj.GetLabelNameList()[0] > 0
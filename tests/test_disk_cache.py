@@ -0,0 +1,46 @@
+"""Ida y vuelta de una extraccion por el cache en disco."""
+import pytest
+
+from core import etabs, incremental
+from core.com_profiler import ComCallProfiler
+from core.disk_cache import ExtractionDiskCache
+from core.fake_sap_model import build_synthetic_model
+
+pytest.importorskip("pyarrow")
+
+
+def _store_and_load(tmp_path, data):
+    ExtractionDiskCache(str(tmp_path)).store("modelo", data)
+    # Otra sesion: la entrada aun no se leyo
+    return ExtractionDiskCache(str(tmp_path)).load("modelo")
+
+
+def test_nullable_integers_round_trip(tmp_path):
+    records = [{"col_id": "C1", "num_bars": 4, "fc": 280.0}, {"col_id": "C2", "num_bars": None, "fc": None}]
+    loaded = _store_and_load(tmp_path, {"records": records})
+    assert loaded["records"] == records
+    assert isinstance(loaded["records"][0]["num_bars"], int)
+
+
+def test_cache_hit_seeds_the_snapshot(tmp_path):
+    model = build_synthetic_model(n_stories=3, n_grid_x=2, n_grid_y=3)
+    snapshot = incremental.ExtractionSnapshot()
+    cols_data, gridlines_data = incremental.extract_incremental(model, snapshot)
+    loaded = _store_and_load(tmp_path, {
+        "data_cols_labels_story": cols_data,
+        "gridlines_data": gridlines_data,
+        "snapshot_fingerprints": incremental.fingerprints_to_records(snapshot.fingerprints),
+    })
+    assert loaded["data_cols_labels_story"].to_records() == cols_data.to_records()
+
+    seeded = incremental.ExtractionSnapshot()
+    incremental.seed_snapshot(
+        model, seeded, loaded["data_cols_labels_story"],
+        fingerprints=incremental.fingerprints_from_records(loaded["snapshot_fingerprints"]),
+    )
+    assert seeded.fingerprints == snapshot.fingerprints
+
+    profiler = ComCallProfiler()
+    reextracted, _ = incremental.extract_incremental(profiler.wrap(model), seeded)
+    assert "FrameObj.GetDesignOrientation" not in profiler.latencies
+    assert reextracted.to_records() == etabs.get_story_lable_col_name(model)[0].to_records()
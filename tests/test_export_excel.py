@@ -0,0 +1,76 @@
+"""Cuadro de columnas en Excel con cuadros sinteticos (benchmarks.bench_excel)."""
+from concurrent.futures import Future
+
+from openpyxl import load_workbook
+
+from benchmarks.bench_excel import build_synthetic_table, sheet_contents
+from core import export_excel
+
+
+def test_excel_engines_write_the_same_sheet(tmp_path):
+    table = build_synthetic_table(n_grids=12, n_stories=6)
+    contents = []
+    for engine in export_excel.EXCEL_ENGINES:
+        folder = tmp_path / engine
+        folder.mkdir()
+        export_excel.generate_excel_table(str(folder), *table, engine=engine)
+        contents.append(sheet_contents(str(folder / "cuadro_columnas.xlsx")))
+    assert contents[0] == contents[1]
+
+
+def test_records_are_prepared_once(tmp_path, monkeypatch):
+    table = build_synthetic_table(n_grids=8, n_stories=4)
+    calls = []
+    preparar = export_excel._preparar_registros
+
+    def counting_preparar(*args, **kwargs):
+        calls.append(1)
+        return preparar(*args, **kwargs)
+
+    monkeypatch.setattr(export_excel, "_preparar_registros", counting_preparar)
+    export_excel.generate_excel_table(str(tmp_path), *table, engine="streaming")
+    assert len(calls) == 1
+
+    # build_cuadro_layout sigue aceptando los registros sin preparar
+    stories_data, grid_lines_data, column_records = table
+    assert export_excel.build_cuadro_layout(stories_data, grid_lines_data, column_records) == (
+        export_excel._layout_registros_preparados(stories_data, grid_lines_data, preparar(column_records))
+    )
+
+
+def test_small_partitioned_export_runs_in_this_process(tmp_path, monkeypatch):
+    table = build_synthetic_table(n_grids=12, n_stories=5, n_towers=3)
+
+    def no_pool(*args, **kwargs):
+        raise AssertionError("No se debe abrir el pool para pocos registros")
+
+    monkeypatch.setattr(export_excel, "ProcessPoolExecutor", no_pool)
+    # Sin processes, los cuadros pequenos no abren el pool
+    files = export_excel.generate_partitioned_excel(str(tmp_path), *table, "Tower")
+    assert files == [str(tmp_path / "cuadro_columnas.xlsx")]
+    assert load_workbook(files[0]).sheetnames == ["T1", "T2", "T3"]
+
+
+def test_explicit_processes_are_honoured(tmp_path, monkeypatch):
+    table = build_synthetic_table(n_grids=12, n_stories=5, n_towers=3)
+    pools = []
+
+    class InlinePool:
+        # Ejecuta en este proceso, registrando los procesos pedidos
+        def __init__(self, max_workers):
+            pools.append(max_workers)
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+        def submit(self, work, *args):
+            future = Future()
+            future.set_result(work(*args))
+            return future
+
+    monkeypatch.setattr(export_excel, "ProcessPoolExecutor", InlinePool)
+    export_excel.generate_partitioned_excel(str(tmp_path), *table, "Tower", processes=2)
+    assert pools == [2]
@@ -0,0 +1,56 @@
+"""
+Las distintas extracciones de columnas entregan los mismos registros sobre
+el mismo modelo sintetico (core.fake_sap_model), sin ETABS.
+"""
+import pytest
+
+from core import etabs, etabs_tables, incremental, pipeline
+from core.fake_sap_model import build_synthetic_model, populate_database_tables
+from core.lazy_rebar import RebarLoader
+
+MODEL_SIZE = dict(n_stories=6, n_grid_x=3, n_grid_y=4)
+
+
+@pytest.fixture
+def reference():
+    cols_data, gridlines_data = etabs.get_story_lable_col_name(build_synthetic_model(**MODEL_SIZE))
+    assert len(cols_data) == 6 * 3 * 4
+    return cols_data.to_records(), gridlines_data
+
+
+def test_tables_match_frame_by_frame(reference):
+    model = populate_database_tables(build_synthetic_model(**MODEL_SIZE))
+    cols_data, gridlines_data = etabs_tables.get_story_lable_col_name_from_tables(model)
+    assert (cols_data.to_records(), gridlines_data) == reference
+
+
+def test_tables_unavailable_returns_none():
+    # Sin tablas en la base de datos se usa la extraccion frame por frame
+    model = build_synthetic_model(**MODEL_SIZE)
+    assert etabs_tables.get_story_lable_col_name_from_tables(model) == (None, None)
+
+
+def test_lazy_matches_eager(reference):
+    model = build_synthetic_model(**MODEL_SIZE)
+    chunks = []
+    cols_data, gridlines_data = etabs.get_story_lable_col_name_lazy(
+        model, RebarLoader(model), on_chunk=lambda records, processed, total: chunks.append(records)
+    )
+    assert (cols_data.to_records(), gridlines_data) == reference
+    assert sum(len(records) for records in chunks) == len(reference[0])
+
+
+def test_pipeline_matches_eager(reference):
+    cols_data, gridlines_data = pipeline.get_story_lable_col_name_pipeline(build_synthetic_model(**MODEL_SIZE))
+    assert (cols_data.to_records(), gridlines_data) == reference
+
+
+def test_incremental_matches_eager(reference):
+    model = build_synthetic_model(**MODEL_SIZE)
+    snapshot = incremental.ExtractionSnapshot()
+    cols_data, gridlines_data = incremental.extract_incremental(model, snapshot)
+    assert (cols_data.to_records(), gridlines_data) == reference
+
+    # La segunda ejecucion, sin cambios en el modelo, entrega lo mismo
+    cols_data, gridlines_data = incremental.extract_incremental(model, snapshot)
+    assert (cols_data.to_records(), gridlines_data) == reference
@@ -0,0 +1,35 @@
+"""GridLine por posicion con una tolerancia fija en mm."""
+import numpy as np
+
+from core import create_column_table, etabs
+from core.fake_sap_model import build_synthetic_model
+from core.gridlines import assign_gridlines, gridline_tolerance
+
+METRES = {"length": "m", "force": "kN", "stress": "kN/m2"}
+
+
+def test_tolerance_is_converted_to_the_coordinate_units():
+    assert gridline_tolerance() == 0.5
+    assert gridline_tolerance(METRES) == 0.005
+
+
+def test_close_columns_in_metres_keep_their_own_gridline():
+    ids, _ = assign_gridlines([0.0, 0.4, 0.8, 1.2, 6.0], np.zeros(5), METRES)
+    assert list(ids) == [1, 2, 3, 4, 5]
+    # Diferencias de redondeo dentro de 5 mm
+    ids, _ = assign_gridlines([0.0, 0.003, 6.0, 6.002], np.zeros(4), METRES)
+    assert list(ids) == [1, 1, 2, 2]
+
+
+def test_values_do_not_chain_into_one_gridline():
+    # Cada valor esta a 0.4 cm del anterior, pero el grupo no pasa de 0.5 cm
+    ids, _ = assign_gridlines([0.0, 0.4, 0.8, 1.2, 1.6], np.zeros(5))
+    assert list(ids) == [1, 1, 2, 2, 3]
+
+
+def test_open_model_data_in_metres():
+    # Ejes a 0.4 m en las unidades kN-m del modelo abierto
+    model = build_synthetic_model(n_stories=2, n_grid_x=4, n_grid_y=2, story_height=3.0, spacing=0.4)
+    model.units = (etabs.UNITS_FORCE_KN, etabs.UNITS_LENGTH_M, etabs.UNITS_TEMP_C)
+    model_data = create_column_table.get_open_model_data(model)
+    assert len(model_data["grid_lines"]) == 4 * 2
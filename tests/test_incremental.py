@@ -0,0 +1,48 @@
+"""Re-extraccion incremental a partir de un snapshot lleno por otra extraccion."""
+from core import etabs, etabs_tables, incremental
+from core.com_profiler import ComCallProfiler
+from core.fake_sap_model import build_synthetic_model, populate_database_tables
+
+MODEL_SIZE = dict(n_stories=4, n_grid_x=3, n_grid_y=3)
+
+
+def _reextracted_frames(model, snapshot):
+    # GetDesignOrientation solo se llama para los frames que se re-extraen
+    profiler = ComCallProfiler()
+    cols_data, gridlines_data = incremental.extract_incremental(profiler.wrap(model), snapshot)
+    return len(profiler.latencies.get("FrameObj.GetDesignOrientation", [])), cols_data, gridlines_data
+
+
+def test_snapshot_seeded_from_tables_only_rereads_changed_frames():
+    model = populate_database_tables(build_synthetic_model(**MODEL_SIZE))
+    cols_data, gridlines_data = etabs_tables.get_story_lable_col_name_from_tables(model)
+    snapshot = incremental.ExtractionSnapshot()
+    incremental.seed_snapshot(model, snapshot, cols_data)
+    assert snapshot.can_update(model.GetModelFilename())
+
+    reextracted, cols_unchanged, _ = _reextracted_frames(model, snapshot)
+    assert reextracted == 0
+    assert cols_unchanged.to_records() == cols_data.to_records()
+
+    model.FrameObj.frames["C1"]["section"] = "C50x50"
+    reextracted, cols_changed, _ = _reextracted_frames(model, snapshot)
+    assert reextracted == 1
+    assert cols_changed.to_records() == etabs.get_story_lable_col_name(model)[0].to_records()
+
+
+def test_snapshot_of_another_model_cannot_update():
+    model = build_synthetic_model(**MODEL_SIZE)
+    snapshot = incremental.ExtractionSnapshot()
+    assert not snapshot.can_update(model.GetModelFilename())
+    incremental.extract_incremental(model, snapshot)
+    assert snapshot.can_update(model.GetModelFilename())
+    assert not snapshot.can_update("otro_modelo.EDB")
+
+
+def test_diff_column_records():
+    previous = [{"col_id": "C1", "fc": 280}, {"col_id": "C2", "fc": float("nan")}, {"col_id": "C3", "fc": 280}]
+    current = [{"col_id": "C1", "fc": 350}, {"col_id": "C2", "fc": float("nan")}, {"col_id": "C4", "fc": 280}]
+    changes = incremental.diff_column_records(previous, current)
+    assert [record["col_id"] for record in changes["updated"]] == ["C1"]
+    assert [record["col_id"] for record in changes["added"]] == ["C4"]
+    assert changes["removed"] == ["C3"]
@@ -0,0 +1,37 @@
+"""RebarLoader cuando el hilo de armado no obtiene su SapModel."""
+import pytest
+
+from core import etabs
+from core.fake_sap_model import build_synthetic_model
+from core.lazy_rebar import RebarLoader
+
+MODEL_SIZE = dict(n_stories=3, n_grid_x=3, n_grid_y=2)
+
+
+def _failing_factory():
+    raise OSError("ETABS no esta abierto")
+
+
+@pytest.mark.parametrize("model_factory", [lambda: None, _failing_factory], ids=["none", "raises"])
+def test_loader_falls_back_to_the_calling_thread(model_factory):
+    model = build_synthetic_model(**MODEL_SIZE)
+    expected, _ = etabs.get_story_lable_col_name(model)
+
+    loader = RebarLoader(model, model_factory=model_factory)
+    try:
+        cols_data, _ = etabs.get_story_lable_col_name_lazy(model, loader)
+    finally:
+        # No debe lanzar BrokenThreadPool
+        loader.shutdown()
+    assert cols_data.to_records() == expected.to_records()
+
+
+def test_background_loader_matches_eager():
+    model = build_synthetic_model(**MODEL_SIZE)
+    expected, _ = etabs.get_story_lable_col_name(model)
+    loader = RebarLoader(model, model_factory=lambda: model)
+    try:
+        cols_data, _ = etabs.get_story_lable_col_name_lazy(model, loader)
+    finally:
+        loader.shutdown()
+    assert cols_data.to_records() == expected.to_records()
@@ -0,0 +1,48 @@
+"""Extraccion paralela: cada hilo solo usa el SapModel obtenido en el."""
+import threading
+
+from core import etabs, parallel_extraction
+from core.fake_sap_model import build_synthetic_model
+
+
+class ThreadBoundModel:
+    """
+    Envuelve un SapModel falso para que, como un objeto COM, solo se pueda
+    usar desde el hilo donde se obtuvo.
+    """
+    def __init__(self, model, thread_id=None):
+        self._model = model
+        self._thread_id = thread_id if thread_id is not None else threading.get_ident()
+
+    def __getattr__(self, name):
+        if threading.get_ident() != self._thread_id:
+            raise RuntimeError(f"{name} usado desde otro hilo")
+        attribute = getattr(self._model, name)
+        if callable(attribute):
+            return attribute
+        return ThreadBoundModel(attribute, self._thread_id)
+
+
+def _model_with_partial_get_all_points():
+    model = build_synthetic_model(n_stories=6, n_grid_x=4, n_grid_y=4)
+    points = model.PointObj.points
+    listed = dict(list(points.items())[::2])
+
+    def get_all_points(*args):
+        names = tuple(listed)
+        return (len(names), names, *(tuple(listed[name][axis] for name in names) for axis in range(3)), 0)
+
+    # La mitad de los puntos se consulta con GetCoordCartesian desde los hilos
+    model.PointObj.GetAllPoints = get_all_points
+    return model
+
+
+def test_threads_never_use_the_caller_model(monkeypatch):
+    monkeypatch.setattr(parallel_extraction, "CALIBRATION_FRAMES", 5)
+    model = _model_with_partial_get_all_points()
+    expected, _ = etabs.get_story_lable_col_name(model)
+
+    cols_data, _ = parallel_extraction.get_story_lable_col_name_parallel(
+        ThreadBoundModel(model), workers=4, model_factory=lambda: ThreadBoundModel(model)
+    )
+    assert cols_data.to_records() == expected.to_records()
@@ -0,0 +1,34 @@
+"""Columnas con puntos sin coordenadas: se omiten con una advertencia."""
+from core import create_column_table, etabs
+from core.fake_sap_model import build_synthetic_model
+from core.point_coordinates import PointCoordinateResolver
+
+
+def _model_without_point():
+    model = build_synthetic_model(n_stories=3, n_grid_x=2, n_grid_y=2, with_beams=False)
+    # Punto superior de C1 e inferior de C5 (la misma linea de columnas)
+    missing_point = model.FrameObj.frames["C1"]["points"][1]
+    del model.PointObj.points[missing_point]
+    return model, missing_point
+
+
+def test_resolver_returns_none_and_queries_missing_point_once():
+    model, missing_point = _model_without_point()
+    points = PointCoordinateResolver(model)
+    assert points.get_xyz(missing_point) is None
+    com_calls = points.com_calls
+    assert points.get_xyz(missing_point) is None
+    assert points.com_calls == com_calls
+
+
+def test_extraction_skips_columns_with_unresolved_points():
+    model, _ = _model_without_point()
+    cols_data, _ = etabs.get_story_lable_col_name(model)
+    assert len(cols_data) == 3 * 4 - 2
+    assert {"C1", "C5"}.isdisjoint(cols_data["col_id"])
+
+
+def test_open_model_data_skips_columns_with_unresolved_points():
+    model, _ = _model_without_point()
+    model_data = create_column_table.get_open_model_data(model)
+    assert len(model_data["cols_data"]) == 3 * 4 - 2